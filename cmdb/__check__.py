@@ -120,6 +120,8 @@ def __check_database_collection_valid(self) -> bool:
                     created_collection = self.setup_database_manager.create_collection(collection.COLLECTION)
                     self.setup_database_manager.create_indexes(collection.COLLECTION, collection.get_index_keys())
                     LOGGER.info("CKECK: Created missing Collection => %s", created_collection)
+                else:
+                    self.__ensure_indexes(collection)
 
                 collection_test = detected_database.validate_collection(collection.COLLECTION, scandata=True)['valid']
 
@@ -161,6 +163,19 @@ def __check_database_collection_valid(self) -> bool:
         return collection_test
 
 
+    def __ensure_indexes(self, collection) -> None:
+        """
+        Creates the indexes of a collection which were added after the collection was created
+
+        Args:
+            collection: CmdbDAO class of the collection
+        """
+        try:
+            self.setup_database_manager.create_indexes(collection.COLLECTION, collection.get_index_keys())
+        except OperationFailure as err:
+            LOGGER.warning('CHECK: Could not create indexes for "%s", error: %s', collection.COLLECTION, err)
+
+
     def init_user_management(self):
         """Creates intital groups and admin user"""
         LOGGER.info("SETUP ROUTINE: CREATE USER MANAGEMENT")
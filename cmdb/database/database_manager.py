@@ -19,9 +19,11 @@
 
 from pymongo.database import Database
 from pymongo.errors import CollectionInvalid
-from pymongo import IndexModel
+from pymongo import IndexModel, ReturnDocument
 from pymongo.collection import Collection
+from pymongo.results import UpdateResult, BulkWriteResult, InsertManyResult
 
+from cmdb.database.counter import PublicIDCounter
 from cmdb.database.mongo_connector import MongoConnector
 from cmdb.errors.database import DatabaseAlreadyExists, DatabaseNotExists, CollectionAlreadyExists
 # -------------------------------------------------------------------------------------------------------------------- #
@@ -126,6 +128,139 @@ def create_indexes(self, collection: str, indexes: List[IndexModel]) -> List[str
         return self.get_collection(collection).create_indexes(indexes)
 
 
+    def estimated_count(self, collection: str) -> int:
+        """
+        Returns the number of documents of a collection based on the collection metadata
+        (no collection scan, but not exact during concurrent writes or after an unclean shutdown)
+
+        Args:
+            collection (str): name of the collection
+
+        Returns:
+            int: estimated number of documents
+        """
+        return self.get_collection(collection).estimated_document_count()
+
+
+    def drop_index(self, collection: str, name: str) -> None:
+        """
+        Deletes an index of a collection
+
+        Args:
+            collection (str): name of the collection
+            name (str): name of the index
+        """
+        self.get_collection(collection).drop_index(name)
+
+
+    def update_with_pipeline(self, collection: str, criteria: dict, pipeline: list[dict]) -> UpdateResult:
+        """
+        Updates all documents matching the criteria with an aggregation pipeline,
+        so new values can be calculated from the existing values of each document inside the database
+
+        Args:
+            collection (str): name of the collection
+            criteria (dict): filter of the documents to update
+            pipeline (list[dict]): update pipeline (`$set`, `$unset`, `$replaceWith`, ...)
+
+        Returns:
+            UpdateResult: Acknowledgment of the database
+        """
+        return self.get_collection(collection).update_many(criteria, pipeline)
+
+
+    def update_many_with_array_filters(self, collection: str, criteria: dict, update: dict,
+                                       array_filters: list[dict] = None) -> UpdateResult:
+        """
+        Updates all documents matching the criteria with update operators, array elements are
+        selected by the filtered positional operator `$[<identifier>]`
+
+        Args:
+            collection (str): name of the collection
+            criteria (dict): filter of the documents to update
+            update (dict): update operators (e.g. `{'$set': {'fields.$[ref].value': ''}}`)
+            array_filters (list[dict], optional): conditions of the array identifiers
+
+        Returns:
+            UpdateResult: Acknowledgment of the database
+        """
+        return self.get_collection(collection).update_many(criteria, update, array_filters=array_filters)
+
+
+    def bulk_write(self, collection: str, requests: list, ordered: bool = False) -> BulkWriteResult:
+        """
+        Sends several write operations to the database in a single batch
+
+        Args:
+            collection (str): name of the collection
+            requests (list): write operations (`UpdateOne`, `DeleteMany`, ...)
+            ordered (bool): If False the remaining operations are executed after a failed operation
+
+        Raises:
+            BulkWriteError: If at least one operation failed, the details contain the failed operations
+
+        Returns:
+            BulkWriteResult: Acknowledgment of the database
+        """
+        return self.get_collection(collection).bulk_write(requests, ordered=ordered)
+
+
+    def insert_many(self, collection: str, documents: list[dict], ordered: bool = False) -> InsertManyResult:
+        """
+        Inserts several documents with a single database call
+
+        Args:
+            collection (str): name of the collection
+            documents (list[dict]): documents to insert
+            ordered (bool): If False the remaining documents are inserted after a failed insert
+
+        Returns:
+            InsertManyResult: Acknowledgment of the database
+        """
+        return self.get_collection(collection).insert_many(documents, ordered=ordered)
+
+
+    def reserve_public_ids(self, collection: str, amount: int) -> int:
+        """
+        Reserves a continuous range of public_ids with a single atomic counter increment
+
+        Args:
+            collection (str): name of database collection
+            amount (int): number of reserved public_ids
+
+        Returns:
+            int: First public_id of the reserved range
+        """
+        counters = self.get_collection(PublicIDCounter.COLLECTION)
+
+        if not counters.find_one({'_id': collection}):
+            self._init_public_id_counter(collection)
+
+        counter_doc = counters.find_one_and_update({'_id': collection},
+                                                   {'$inc': {'counter': amount}},
+                                                   return_document=ReturnDocument.AFTER)
+
+        return counter_doc['counter'] - amount + 1
+
+
+    def find_one_and_update(self, collection: str, criteria: dict, update: dict, sort: list = None) -> dict:
+        """
+        Atomically updates the first document matching the criteria, used to claim a document
+        when several processes compete for it
+
+        Args:
+            collection (str): name of the collection
+            criteria (dict): filter of the document to update
+            update (dict): update operators
+            sort (list, optional): order in which the matching documents are considered
+
+        Returns:
+            dict: The updated document or None if no document matched the criteria
+        """
+        return self.get_collection(collection).find_one_and_update(criteria, update, sort=sort,
+                                                                   return_document=ReturnDocument.AFTER)
+
+
     def get_index_info(self, collection: str):
         """get the max index value"""
         return self.get_collection(collection).index_information()
@@ -402,7 +402,8 @@ def get_root_location_data(self) -> dict:
             "type_id":0,
             "type_label":"Root",
             "type_icon":"fas fa-globe",
-            "type_selectable":True
+            "type_selectable":True,
+            "path":[]
         }
 
 
@@ -0,0 +1,160 @@
+# DATAGERRY - OpenSource Enterprise CMDB
+# Copyright (C) 2024 becon GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+Local event dispatching
+
+Events which are sent by the managers of a process are normally only forwarded to the message broker.
+This module delivers them additionally to listeners inside the sending process (e.g. caches which must be
+invalidated when the underlying data changes).
+"""
+import logging
+import threading
+from typing import Callable
+
+from cmdb.event_management.event import Event
+# -------------------------------------------------------------------------------------------------------------------- #
+
+LOGGER = logging.getLogger(__name__)
+
+
+class LocalEventDispatcher:
+    """
+    Delivers events to callbacks registered inside the current process
+
+    The event types of the subscriptions follow the AMQP topic syntax:
+    '*' matches exactly one word and '#' matches zero or more words (e.g. 'cmdb.core.object.#')
+    """
+
+    def __init__(self):
+        self.__listeners: list[tuple[str, Callable[[Event], None]]] = []
+        self.__lock = threading.Lock()
+
+
+    def subscribe(self, event_type: str, callback: Callable[[Event], None]) -> None:
+        """
+        Registers a callback for all events matching the given event type
+
+        Args:
+            event_type (str): Event type or topic pattern (e.g. 'cmdb.core.object.#')
+            callback (Callable): Function which is called with the matching event
+        """
+        with self.__lock:
+            self.__listeners.append((event_type, callback))
+
+
+    def unsubscribe(self, callback: Callable[[Event], None]) -> None:
+        """
+        Removes all subscriptions of the given callback
+
+        Args:
+            callback (Callable): The callback which should not receive events anymore
+        """
+        with self.__lock:
+            self.__listeners = [listener for listener in self.__listeners if listener[1] != callback]
+
+
+    def dispatch(self, event: Event) -> None:
+        """
+        Delivers an event to all matching listeners. Errors of a listener are logged and do not
+        interrupt the delivery to the other listeners
+
+        Args:
+            event (Event): The event which should be delivered
+        """
+        with self.__lock:
+            listeners = list(self.__listeners)
+
+        event_type = event.get_type()
+
+        for pattern, callback in listeners:
+            if not self.matches(pattern, event_type):
+                continue
+            try:
+                callback(event)
+            except Exception as err:
+                LOGGER.error("Local event listener for '%s' failed: %s", pattern, err)
+
+
+    @staticmethod
+    def matches(pattern: str, event_type: str) -> bool:
+        """
+        Checks if an event type matches a topic pattern
+
+        Args:
+            pattern (str): Topic pattern
+            event_type (str): Type of the event
+
+        Returns:
+            bool: True if the event type matches the pattern
+        """
+        return LocalEventDispatcher.__match_words(pattern.split('.'), event_type.split('.'))
+
+
+    @staticmethod
+    def __match_words(pattern_words: list[str], type_words: list[str]) -> bool:
+        """Recursive word matching of the AMQP topic syntax"""
+        if not pattern_words:
+            return not type_words
+
+        head = pattern_words[0]
+
+        if head == '#':
+            for i in range(len(type_words) + 1):
+                if LocalEventDispatcher.__match_words(pattern_words[1:], type_words[i:]):
+                    return True
+            return False
+
+        if not type_words:
+            return False
+
+        if head in ('*', type_words[0]):
+            return LocalEventDispatcher.__match_words(pattern_words[1:], type_words[1:])
+
+        return False
+
+
+class DispatchingEventQueue:
+    """
+    Wrapper for the queue of events to send
+
+    Every event put into this queue is delivered to the local listeners and afterwards
+    forwarded to the wrapped send queue (if there is one)
+    """
+
+    def __init__(self, send_queue=None, dispatcher: LocalEventDispatcher = None):
+        """
+        Args:
+            send_queue (Queue, optional): Queue of the EventManager for sending events to the broker
+            dispatcher (LocalEventDispatcher, optional): Dispatcher for the local listeners
+        """
+        self.send_queue = send_queue
+        self.dispatcher: LocalEventDispatcher = dispatcher or local_event_dispatcher
+
+
+    def put(self, event: Event, *args, **kwargs) -> None:
+        """
+        Delivers the event locally and forwards it to the send queue
+
+        Args:
+            event (Event): The event which should be sent
+        """
+        self.dispatcher.dispatch(event)
+
+        if self.send_queue is not None:
+            self.send_queue.put(event, *args, **kwargs)
+
+
+local_event_dispatcher = LocalEventDispatcher()
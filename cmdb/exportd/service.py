@@ -81,7 +81,8 @@ def handler(self, event: Event):
         # Remove duplicate entries in the Queue of upcoming events
         for q in scheduler.queue:
             arg = q.argument[0]
-            if "cmdb.core.object" in event_type and event_param_id == arg.get_param("id"):
+            if "cmdb.core.object" in event_type and event_param_id is not None \
+                and event_param_id == arg.get_param("id"):
                 scheduler.cancel(q)
 
             elif "cmdb.exportd" in event_type and event_param_id == arg.get_param("id"):
@@ -124,8 +125,11 @@ def __init__(self, event: Event, state: bool = False):
 
         super().__init__()
         self.job = None
-        self.job_id = int(event.get_param("id"))
-        self.type_id = int(event.get_param("type_id")) if event.get_param("type_id") else None
+        self.job_id = int(event.get_param("id")) if event.get_param("id") else None
+        self.type_ids = [int(type_id) for type_id in event.get_param("type_ids") or []]
+
+        if event.get_param("type_id"):
+            self.type_ids.append(int(event.get_param("type_id")))
         self.user_id = int(event.get_param("user_id"))
         self.event = event
         self.is_active = state
@@ -140,9 +144,9 @@ def __init__(self, event: Event, state: bool = False):
     def run(self):
         """TODO: document"""
         try:
-            if self.type_id:
+            if self.type_ids:
                 for obj in self.exportd_job_manager.get_job_by_event_based(True):
-                    if next((item for item in obj.get_sources() if item["type_id"] == self.type_id), None):
+                    if next((item for item in obj.get_sources() if item["type_id"] in self.type_ids), None):
                         if obj.get_active() and obj.scheduling["event"]["active"]:
                             self.job = obj
                             self.worker()
@@ -30,6 +30,7 @@
 from cmdb.framework.models import TypeModel
 from cmdb.framework.models import CategoryModel
 from cmdb.framework.models import ObjectLinkModel
+from cmdb.framework.models.type_migration import TypeMigrationModel
 from cmdb.framework.models.log import CmdbLog, CmdbObjectLog, CmdbMetaLog
 # -------------------------------------------------------------------------------------------------------------------- #
 
@@ -43,5 +44,6 @@
     CmdbMetaLog,
     ObjectLinkModel,
     CmdbLocation,
-    CmdbSectionTemplate
+    CmdbSectionTemplate,
+    TypeMigrationModel
 ]
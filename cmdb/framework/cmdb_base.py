@@ -18,6 +18,7 @@
 from typing import List
 
 from cmdb.database.database_manager_mongo import DatabaseManagerMongo
+from cmdb.manager.count_strategy import count_cache
 # -------------------------------------------------------------------------------------------------------------------- #
 
 LOGGER = logging.getLogger(__name__)
@@ -153,7 +154,10 @@ def _insert(self, collection: str, data: dict) -> int:
             int: new public_id of inserted document
             None: if anything goes wrong
         """
-        return self.dbm.insert(collection=collection, data=data)
+        public_id = self.dbm.insert(collection=collection, data=data)
+        count_cache.invalidate(collection)
+
+        return public_id
 
 
     def _update(self, collection: str, public_id: int, data: dict) -> object:
@@ -167,7 +171,10 @@ def _update(self, collection: str, public_id: int, data: dict) -> object:
         Returns:
             acknowledgment of database
         """
-        return self.dbm.update(collection=collection, filter={'public_id': public_id}, data=data)
+        result = self.dbm.update(collection=collection, filter={'public_id': public_id}, data=data)
+        count_cache.invalidate(collection)
+
+        return result
 
 
     def _update_for_object(self, collection: str, object_id: int, data: dict) -> object:
@@ -181,11 +188,14 @@ def _update_for_object(self, collection: str, object_id: int, data: dict) -> obj
         Returns:
             acknowledgment of database
         """
-        return self.dbm.update(
+        result = self.dbm.update(
             collection=collection,
             filter={'object_id': object_id},
             data=data
         )
+        count_cache.invalidate(collection)
+
+        return result
 
 
     def _unset_update_many(self, collection: str, data: str) -> object:
@@ -199,11 +209,14 @@ def _unset_update_many(self, collection: str, data: str) -> object:
         Returns:
             acknowledgment of database
         """
-        return self.dbm.unset_update_many(
+        result = self.dbm.unset_update_many(
             collection=collection,
             filter={},
             data=data
         )
+        count_cache.invalidate(collection)
+
+        return result
 
 
     def _update_many(self, collection: str, query: dict, update: dict):
@@ -217,11 +230,14 @@ def _update_many(self, collection: str, query: dict, update: dict):
         Returns:
             acknowledgment of database
         """
-        return self.dbm.update_many(
+        result = self.dbm.update_many(
             collection=collection,
             query=query,
             update=update
         )
+        count_cache.invalidate(collection)
+
+        return result
 
 
     def _delete(self, collection: str, public_id: int):
@@ -234,10 +250,13 @@ def _delete(self, collection: str, public_id: int):
         Returns:
             acknowledgment of database
         """
-        return self.dbm.delete(
+        acknowledged = self.dbm.delete(
             collection=collection,
             filter={'public_id': public_id}
         ).acknowledged
+        count_cache.invalidate(collection)
+
+        return acknowledged
 
 
     def delete_many(self, collection: str, filter_query: dict):
@@ -250,4 +269,7 @@ def delete_many(self, collection: str, filter_query: dict):
         Returns:
             acknowledgment of database
         """
-        return self.dbm.delete_many(collection=collection, **filter_query)
+        result = self.dbm.delete_many(collection=collection, **filter_query)
+        count_cache.invalidate(collection)
+
+        return result
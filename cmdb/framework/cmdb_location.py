@@ -46,6 +46,12 @@ class CmdbLocation(CmdbDAO):
     DEFAULT_VERSION: str = '1.0.0'
     REQUIRED_INIT_KEYS = ['name', 'parent', 'object_id', 'type_id', 'type_label']
 
+    INDEX_KEYS = [
+        {'keys': [('path', CmdbDAO.DAO_ASCENDING)], 'name': 'path', 'unique': False},
+        {'keys': [('object_id', CmdbDAO.DAO_ASCENDING)], 'name': 'object_id', 'unique': False},
+        {'keys': [('type_id', CmdbDAO.DAO_ASCENDING)], 'name': 'type_id', 'unique': False}
+    ]
+
     SCHEMA: dict = {
         'public_id': {
             'type': 'integer'
@@ -75,6 +81,13 @@ class CmdbLocation(CmdbDAO):
             'type': 'boolean',
             'default': True
         },
+        'path': {
+            'type': 'list',
+            'schema': {
+                'type': 'integer'
+            },
+            'default': []
+        },
     }
 
 # ---------------------------------------------------- CONSTRUCTOR --------------------------------------------------- #
@@ -86,6 +99,7 @@ def __init__(self, name: str,
                  type_label: str,
                  type_icon: str = "fas fa-cube",
                  type_selectable = True,
+                 path: list[int] = None,
                  **kwargs):
         """
         Initialisation of location
@@ -98,6 +112,7 @@ def __init__(self, name: str,
             type_label (str): label of type for which this location is set
             type_icon (str): icon of type for which this location is set, default is 'fas fa-cube'
             type_selectable (bool): sets if this type is selectable as a parent for other locations, default is yes
+            path (list[int]): public_ids of all ancestor locations, starting with the root location
         """
         self.name: str = name
         self.parent: int = parent
@@ -106,6 +121,7 @@ def __init__(self, name: str,
         self.type_label: str = type_label
         self.type_icon: str = type_icon
         self.type_selectable: bool = type_selectable
+        self.path: list[int] = path or []
         super().__init__(**kwargs)
 
 # -------------------------------------------------- CLASS FUNCTIONS ------------------------------------------------- #
@@ -130,6 +146,7 @@ def from_data(cls, data: dict, *args, **kwargs) -> "CmdbLocation":
             type_label = data.get('type_label'),
             type_icon = data.get('type_icon', 'fas fa-cube'),
             type_selectable = data.get('type_selectable', True),
+            path = data.get('path', []),
         )
 
 
@@ -153,6 +170,7 @@ def to_json(cls, instance: "CmdbLocation") -> dict:
             'type_label': instance.type_label,
             'type_icon': instance.type_icon,
             'type_selectable': instance.type_selectable,
+            'path': instance.path,
         }
 
 
@@ -170,6 +188,7 @@ def to_data(cls, instance: "CmdbLocation") -> dict:
             'type_label': instance['type_label'],
             'type_icon': instance['type_icon'],
             'type_selectable': instance['type_selectable'],
+            'path': instance.get('path', []),
         }
 
 
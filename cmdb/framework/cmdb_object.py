@@ -23,6 +23,7 @@
 
 from cmdb.framework.cmdb_dao import CmdbDAO
 from cmdb.framework.cmdb_errors import FieldNotFoundError
+from cmdb.framework.field_diff import diff_fields
 from cmdb.framework.utils import Collection, Model
 
 from cmdb.utils.error import CMDBError
@@ -98,6 +99,12 @@ class CmdbObject(CmdbDAO):
         }
     }
 
+    INDEX_KEYS = [
+        {'keys': [('type_id', CmdbDAO.DAO_ASCENDING)], 'name': 'type_id', 'unique': False},
+        {'keys': [('active', CmdbDAO.DAO_ASCENDING)], 'name': 'active', 'unique': False},
+        {'keys': [('mds_refs', CmdbDAO.DAO_ASCENDING)], 'name': 'mds_refs', 'unique': False}
+    ]
+
 
     def __init__(self,
                  type_id,
@@ -140,8 +147,7 @@ def __init__(self,
     def __truediv__(self, other):
         if not isinstance(other, self.__class__):
             raise TypeError("Not the same class")
-        return {**{'old': [i for i in self.fields if i not in other.fields]},
-                **{'new': [j for j in other.fields if j not in self.fields]}}
+        return diff_fields(self.fields, other.fields).to_log_changes()
 
 
     @classmethod
@@ -36,6 +36,8 @@
 from cmdb.framework.cmdb_errors import ObjectInsertError, ObjectDeleteError, ObjectManagerGetError, \
     ObjectManagerInsertError, ObjectManagerInitError, FieldNotFoundError, FieldInitError
 from cmdb.framework.cmdb_object import CmdbObject
+from cmdb.framework.sort_keys import SORT_KEYS, build_sort_keys
+from cmdb.framework.mds_references import MDS_REFS, build_mds_refs, get_mds_ref_fields
 from cmdb.framework.models.type import TypeModel
 from cmdb.search.query import Pipeline
 from cmdb.security.acl.control import AccessControlList
@@ -280,10 +282,21 @@ def insert_object(self, data: Union[CmdbObject, dict], user: UserModel = None,
 
         verify_access(type_, user, permission)
 
+        object_data = new_object.__dict__
+
+        if type_.sortable_fields:
+            object_data = {**object_data, SORT_KEYS: build_sort_keys(new_object.fields, type_.sortable_fields)}
+
+        mds_ref_fields = get_mds_ref_fields(type_)
+
+        if mds_ref_fields:
+            object_data = {**object_data,
+                           MDS_REFS: build_mds_refs(new_object.multi_data_sections, mds_ref_fields)}
+
         try:
             ack = self.dbm.insert(
                 collection=CmdbObject.COLLECTION,
-                data=new_object.__dict__
+                data=object_data
             )
             if self._event_queue:
                 event = Event("cmdb.core.object.added", {"id": new_object.get_public_id(),
@@ -0,0 +1,171 @@
+# DATAGERRY - OpenSource Enterprise CMDB
+# Copyright (C) 2024 becon GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+Diffing of field lists
+
+Fields (object values, type field definitions, section template fields) are indexed by their name, so
+comparing two lists is linear in the number of fields. The result is a `FieldChangeSet` with the added,
+removed and changed fields in the order of the compared lists.
+"""
+import logging
+from typing import Iterable
+# -------------------------------------------------------------------------------------------------------------------- #
+
+LOGGER = logging.getLogger(__name__)
+
+
+def index_fields(fields: Iterable[dict], key: str = 'name') -> dict:
+    """
+    Indexes fields by a key
+
+    Args:
+        fields (Iterable[dict]): Fields to index
+        key (str): Key identifying a field
+
+    Returns:
+        dict: Fields by their key, later fields overwrite earlier fields with the same key
+    """
+    return {field.get(key): field for field in fields or []}
+
+
+class FieldChange:
+    """A field which exists in both lists with different content"""
+
+    __slots__ = ('name', 'old', 'new')
+
+    def __init__(self, name: str, old: dict, new: dict):
+        """
+        Args:
+            name (str): Name of the field
+            old (dict): Field of the old list
+            new (dict): Field of the new list
+        """
+        self.name = name
+        self.old = old
+        self.new = new
+
+
+    @property
+    def old_value(self):
+        """Value of the old field"""
+        return self.old.get('value')
+
+
+    @property
+    def new_value(self):
+        """Value of the new field"""
+        return self.new.get('value')
+
+
+    def to_json(self) -> dict:
+        """Json representation of the change"""
+        return {'name': self.name, 'old': self.old, 'new': self.new}
+
+
+class FieldChangeSet:
+    """Added, removed and changed fields between two field lists"""
+
+    __slots__ = ('added', 'removed', 'changed')
+
+    def __init__(self, added: list[dict] = None, removed: list[dict] = None, changed: list[FieldChange] = None):
+        """
+        Args:
+            added (list[dict]): Fields which only exist in the new list
+            removed (list[dict]): Fields which only exist in the old list
+            changed (list[FieldChange]): Fields which exist in both lists with a different content
+        """
+        self.added: list[dict] = added or []
+        self.removed: list[dict] = removed or []
+        self.changed: list[FieldChange] = changed or []
+
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+
+    def __len__(self):
+        return len(self.added) + len(self.removed) + len(self.changed)
+
+
+    def to_json(self) -> dict:
+        """Json representation of the change set"""
+        return {
+            'added': self.added,
+            'removed': self.removed,
+            'changed': [change.to_json() for change in self.changed]
+        }
+
+
+    def to_log_changes(self) -> dict:
+        """
+        Converts the change set into the `changes` of an object log
+
+        Returns:
+            dict: 'old' holds the removed and the previous version of the changed fields,
+                  'new' holds the added and the current version of the changed fields
+        """
+        return {
+            'old': self.removed + [change.old for change in self.changed],
+            'new': [change.new for change in self.changed] + self.added
+        }
+
+
+def diff_fields(old_fields: Iterable[dict], new_fields: Iterable[dict], key: str = 'name') -> FieldChangeSet:
+    """
+    Compares two field lists in linear time
+
+    Args:
+        old_fields (Iterable[dict]): Previous fields
+        new_fields (Iterable[dict]): Current fields
+        key (str): Key identifying a field
+
+    Returns:
+        FieldChangeSet: Differences between the lists
+    """
+    old_index = index_fields(old_fields, key)
+    new_index = index_fields(new_fields, key)
+    change_set = FieldChangeSet()
+
+    for name, old_field in old_index.items():
+        if name not in new_index:
+            change_set.removed.append(old_field)
+
+    for name, new_field in new_index.items():
+        if name not in old_index:
+            change_set.added.append(new_field)
+        elif old_index[name] != new_field:
+            change_set.changed.append(FieldChange(name, old_index[name], new_field))
+
+    return change_set
+
+
+def diff_names(old_names: Iterable[str], new_names: Iterable[str]) -> tuple[list[str], list[str]]:
+    """
+    Compares two lists of field names in linear time
+
+    Args:
+        old_names (Iterable[str]): Previous field names
+        new_names (Iterable[str]): Current field names
+
+    Returns:
+        tuple[list[str], list[str]]: Added and removed names in the order of the lists
+    """
+    old_names = list(old_names or [])
+    new_names = list(new_names or [])
+    old_set = set(old_names)
+    new_set = set(new_names)
+
+    return [name for name in new_names if name not in old_set], [name for name in old_names if name not in new_set]
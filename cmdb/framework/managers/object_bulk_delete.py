@@ -0,0 +1,126 @@
+# DATAGERRY - OpenSource Enterprise CMDB
+# Copyright (C) 2024 becon GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+Bulk delete of objects
+
+The objects, their locations, their object links and the references pointing to them are removed with one
+operation per collection, the logs of the objects are marked as deleted with one update. The delete logs are
+inserted with one call.
+"""
+import logging
+
+from cmdb.framework import CmdbObject
+from cmdb.framework.models.log import LogAction, CmdbObjectLog
+from cmdb.framework.object_states import object_state
+from cmdb.framework.managers.object_manager import ObjectManager
+from cmdb.manager.locations_manager import LocationsManager
+from cmdb.manager.logs_manager import LogsManager
+from cmdb.manager.object_links_manager import ObjectLinksManager
+from cmdb.security.acl.permission import AccessControlPermission
+from cmdb.user_management import UserModel
+
+from cmdb.errors.manager import ManagerInsertError, ManagerUpdateError
+# -------------------------------------------------------------------------------------------------------------------- #
+
+LOGGER = logging.getLogger(__name__)
+
+
+class ObjectBulkDelete:
+    """Deletes several objects together with everything depending on them"""
+
+    def __init__(self, object_manager: ObjectManager, logs_manager: LogsManager,
+                 locations_manager: LocationsManager, object_links_manager: ObjectLinksManager):
+        """
+        Args:
+            object_manager (ObjectManager): Manager used to load and delete the objects
+            logs_manager (LogsManager): Manager used to write the delete logs
+            locations_manager (LocationsManager): Manager used to delete the locations of the objects
+            object_links_manager (ObjectLinksManager): Manager used to delete the links of the objects
+        """
+        self.object_manager = object_manager
+        self.logs_manager = logs_manager
+        self.locations_manager = locations_manager
+        self.object_links_manager = object_links_manager
+
+
+    def has_child_locations(self, public_ids: list[int]) -> bool:
+        """
+        Checks if a location of the objects is an ancestor of a location which is not deleted with them
+
+        Args:
+            public_ids (list[int]): public_ids of the objects
+
+        Returns:
+            bool: True if the objects can not be deleted because of their child locations
+        """
+        location_ids = [location.public_id for location in
+                        self.locations_manager.get_locations_by(object_id={'$in': public_ids})]
+
+        if not location_ids:
+            return False
+
+        return bool(self.locations_manager.get_one_by({'path': {'$in': location_ids},
+                                                       'public_id': {'$nin': location_ids}}))
+
+
+    def execute(self, public_ids: list[int], user: UserModel) -> list[int]:
+        """
+        Deletes the objects, their locations, their object links and all references to them
+
+        Args:
+            public_ids (list[int]): public_ids of the objects
+            user (UserModel): Request user
+
+        Raises:
+            AccessDeniedError: If the user is not allowed to delete one of the objects
+
+        Returns:
+            list[int]: public_ids of the deleted objects
+        """
+        objects: list[CmdbObject] = self.object_manager.find({'public_id': {'$in': public_ids}}).results
+
+        if not objects:
+            return []
+
+        deleted_ids = [object_.public_id for object_ in objects]
+
+        self.object_manager.delete_many(deleted_ids, user, AccessControlPermission.DELETE)
+
+        self.object_links_manager.delete_links_of_objects(deleted_ids)
+        self.locations_manager.delete_many({'object_id': {'$in': deleted_ids}})
+        self.object_manager.delete_object_references(deleted_ids, user)
+
+        try:
+            self.logs_manager.set_objects_exist(deleted_ids, False)
+        except ManagerUpdateError as err:
+            LOGGER.error("ManagerUpdateError: %s", err)
+
+        logs = [{
+            'object_id': object_.public_id,
+            'version': object_.version,
+            'user_id': user.get_public_id(),
+            'user_name': user.get_display_name(),
+            'comment': 'Object was deleted',
+            'object_state': object_state(object_)
+        } for object_ in objects]
+
+        try:
+            self.logs_manager.insert_logs(LogAction.DELETE, CmdbObjectLog.__name__, logs)
+        except ManagerInsertError as err:
+            LOGGER.error("ManagerInsertError: %s", err)
+
+        return deleted_ids
+
@@ -0,0 +1,219 @@
+# DATAGERRY - OpenSource Enterprise CMDB
+# Copyright (C) 2024 becon GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+Bulk update of objects
+
+All objects of a bulk edit are loaded with one query, their changes are calculated in memory and written
+with one unordered bulk write. The change logs are inserted with one call and one batched event is sent.
+"""
+import copy
+import json
+import logging
+from datetime import datetime, timezone
+
+from bson import json_util
+from dateutil.parser import parse
+
+from cmdb.database.utils import object_hook, default
+from cmdb.framework import CmdbObject, TypeModel
+from cmdb.framework.models.log import LogAction, CmdbObjectLog
+from cmdb.framework.models.type_model import TypeFieldSection, TypeReferenceSection
+from cmdb.framework.models.type_model.type_multi_data_section import TypeMultiDataSection
+from cmdb.framework.object_states import object_state
+from cmdb.framework.managers.object_manager import ObjectManager
+from cmdb.manager.logs_manager import LogsManager
+from cmdb.security.acl.permission import AccessControlPermission
+from cmdb.user_management import UserModel
+
+from cmdb.errors.manager import ManagerInsertError
+# -------------------------------------------------------------------------------------------------------------------- #
+
+LOGGER = logging.getLogger(__name__)
+
+
+class ObjectBulkUpdate:
+    """Applies the same changes to several objects"""
+
+    def __init__(self, object_manager: ObjectManager, logs_manager: LogsManager):
+        """
+        Args:
+            object_manager (ObjectManager): Manager used to load and write the objects
+            logs_manager (LogsManager): Manager used to write the change logs
+        """
+        self.object_manager = object_manager
+        self.logs_manager = logs_manager
+
+
+    def execute(self, public_ids: list[int], data: dict, user: UserModel) -> tuple[list[dict], list[dict]]:
+        """
+        Updates the objects with the data of the request
+
+        Args:
+            public_ids (list[int]): public_ids of the objects
+            data (dict): Data of the request (fields, active state, comment)
+            user (UserModel): Request user
+
+        Raises:
+            AccessDeniedError: If the user is not allowed to update one of the objects
+
+        Returns:
+            tuple[list[dict], list[dict]]: The updated object data and the failures of the objects which
+                                           could not be updated (keyword arguments of `ResponseFailedMessage`)
+        """
+        current_objects = {
+            object_.public_id: object_ for object_ in
+            self.object_manager.find({'public_id': {'$in': public_ids}}).results
+        }
+        type_ids = list({object_.type_id for object_ in current_objects.values()})
+        types = {type_.public_id: type_ for type_ in
+                 self.object_manager.type_manager.find({'public_id': {'$in': type_ids}}).results}
+
+        results: dict = {}
+        logs: dict = {}
+        failed: list[dict] = []
+
+        for public_id in public_ids:
+            current_object = current_objects.get(public_id)
+
+            if not current_object:
+                failed.append(self.__failure(f'Object with ID: {public_id} not found!', 404, public_id, data))
+                continue
+
+            type_ = types.get(current_object.type_id)
+
+            if not type_:
+                failed.append(self.__failure(f'Type with ID: {current_object.type_id} not found!', 404,
+                                             public_id, data))
+                continue
+
+            new_data, update_comment = self.__build_update(current_object, type_, data, user)
+
+            try:
+                update_object_instance = CmdbObject(**json.loads(json.dumps(new_data, default=json_util.default),
+                                                                 object_hook=object_hook))
+            except TypeError as err:
+                LOGGER.error('Error: %s Object: %s', str(err.args), json.dumps(new_data, default=default))
+                failed.append(self.__failure(str(err.args), 400, public_id, new_data))
+                continue
+
+            changes = current_object / update_object_instance
+            new_data['version'] = self.__next_version(update_object_instance, changes)
+
+            results[public_id] = new_data
+            logs[public_id] = {
+                'object_id': public_id,
+                'version': update_object_instance.get_version(),
+                'user_id': user.get_public_id(),
+                'user_name': user.get_display_name(),
+                'comment': update_comment,
+                'changes': changes,
+                'object_state': object_state(update_object_instance)
+            }
+
+        write_errors = self.object_manager.bulk_update(list(results.values()), user,
+                                                       AccessControlPermission.UPDATE)
+
+        for public_id, error_message in write_errors.items():
+            failed.append(self.__failure(error_message, 500, public_id, results.pop(public_id)))
+            logs.pop(public_id)
+
+        try:
+            self.logs_manager.insert_logs(LogAction.EDIT, CmdbObjectLog.__name__, list(logs.values()))
+        except ManagerInsertError as err:
+            LOGGER.error("ManagerInsertError: %s", err)
+
+        return list(results.values()), failed
+
+
+    def __build_update(self, current_object: CmdbObject, type_: TypeModel, data: dict,
+                       user: UserModel) -> tuple[dict, str]:
+        """Merges the data of the request into the current data of an object"""
+        new_data = copy.deepcopy(data)
+        active_state = data.get('active', None)
+
+        new_data['public_id'] = current_object.public_id
+        new_data['creation_time'] = current_object.creation_time
+        new_data['author_id'] = current_object.author_id
+        new_data['active'] = active_state if active_state in [True, False] else current_object.active
+
+        if 'version' not in data:
+            new_data['version'] = current_object.version
+
+        new_values = {field.get('name'): field.get('value') for field in data.get('fields', [])}
+        new_data['fields'] = [
+            {'name': field['name'], 'value': new_values.get(field['name'], field['value'])}
+            for field in self.__current_fields(type_, current_object)
+        ]
+
+        update_comment = new_data.pop('comment', '')
+
+        new_data['last_edit_time'] = datetime.now(timezone.utc)
+        new_data['editor_id'] = user.public_id
+
+        return new_data, update_comment
+
+
+    @staticmethod
+    def __current_fields(type_: TypeModel, object_: CmdbObject) -> list[dict]:
+        """
+        Returns the fields of an object in the order of the type sections, like the fields of a render result
+        but without resolving the references
+        """
+        values = {field.get('name'): field.get('value') for field in object_.fields}
+        type_fields = {field.get('name'): field for field in type_.fields}
+        fields = []
+
+        for section in type_.render_meta.sections:
+            if isinstance(section, (TypeFieldSection, TypeMultiDataSection)):
+                names = section.fields
+            elif isinstance(section, TypeReferenceSection):
+                names = [f'{section.name}-field']
+            else:
+                continue
+
+            for name in names:
+                if name not in type_fields:
+                    continue
+
+                value = values.get(name)
+
+                if type_fields[name].get('type') == 'date' and isinstance(value, str) and value:
+                    value = parse(value, fuzzy=True)
+
+                fields.append({'name': name, 'value': value})
+
+        return fields
+
+
+    @staticmethod
+    def __next_version(update_object_instance: CmdbObject, changes: dict) -> str:
+        """Calculates the version of an object from the number of changed fields"""
+        if len(changes['new']) == 1:
+            return update_object_instance.update_version(update_object_instance.VERSIONING_PATCH)
+
+        if len(changes['new']) == len(update_object_instance.fields):
+            return update_object_instance.update_version(update_object_instance.VERSIONING_MAJOR)
+
+        if len(changes['new']) > (len(update_object_instance.fields) / 2):
+            return update_object_instance.update_version(update_object_instance.VERSIONING_MINOR)
+
+        return update_object_instance.update_version(update_object_instance.VERSIONING_PATCH)
+
+
+    @staticmethod
+    def __failure(error_message: str, status: int, public_id: int, obj: dict) -> dict:
+        """Keyword arguments of a `ResponseFailedMessage`"""
+        return {'error_message': error_message, 'status': status, 'public_id': public_id, 'obj': obj}
@@ -20,23 +20,32 @@
 import logging
 
 from queue import Queue
-from typing import Union, List
-from bson import Regex, json_util
+from typing import Union, List, Optional
+from bson import json_util
+from pymongo import UpdateOne, UpdateMany
+from pymongo.errors import BulkWriteError
 
 from cmdb.database.utils import object_hook
 from cmdb.event_management.event import Event
 from cmdb.database.database_manager_mongo import DatabaseManagerMongo
-from cmdb.framework import CmdbObject
-from cmdb.framework.cmdb_object_manager import verify_access
+from cmdb.framework import CmdbObject, TypeModel
+from cmdb.framework.cmdb_object_manager import verify_access, has_access_control
 from cmdb.security.acl.errors import AccessDeniedError
 from cmdb.manager.managers import ManagerQueryBuilder, ManagerBase
+from cmdb.manager.count_strategy import CountStrategy, CountResult
+from cmdb.manager.tree_cache import tree_cache
 from cmdb.framework.managers.type_manager import TypeManager
+from cmdb.framework.managers.type_migration_manager import TypeMigrationManager
 from cmdb.framework.results import IterationResult
+from cmdb.framework.results.list import ListResult
 from cmdb.framework.utils import PublicID
+from cmdb.framework.sort_keys import SORT_KEYS, build_sort_keys, single_type_id, sort_field_name, sort_key_path
+from cmdb.framework.mds_references import MDS_REFS, build_mds_refs, get_mds_ref_fields
 from cmdb.manager import ManagerGetError, ManagerIterationError, ManagerUpdateError
 from cmdb.search import Query, Pipeline
 from cmdb.manager.query_builder.builder import Builder
 from cmdb.security.acl.builder import AccessControlQueryBuilder
+from cmdb.security.acl.control import AccessControlList
 from cmdb.security.acl.permission import AccessControlPermission
 from cmdb.user_management import UserModel
 # -------------------------------------------------------------------------------------------------------------------- #
@@ -121,6 +130,56 @@ def build(self, filter: Union[List[dict], dict], limit: int, skip: int, sort: st
         return self.query
 
 
+    def build_indexed_sort(self, filter: Union[List[dict], dict], limit: int, skip: int, sort_key: str, order: int,
+                           restriction: dict = None) -> Pipeline:
+        """
+        Converts the parameters from the call to a mongodb aggregation pipeline which sorts on a materialised
+        sort key. The sort, skip and limit are applied before the dependencies are loaded, so the sort
+        is done by walking the sort key index of the type instead of sorting all objects in memory
+
+        Args:
+            filter: dict or list of `$match` stages without fields of the loaded dependencies
+            limit: max number of documents to return
+            skip: number of documents to skip first
+            sort_key: path of the materialised sort key (e.g. 'sort_keys.hostname')
+            order: sort order
+            restriction: additional filter for the access control
+
+        Returns:
+            The query pipeline with the parameter contents
+        """
+        self.clear()
+        self.query = Pipeline([])
+
+        if isinstance(filter, dict):
+            self.query.append(self.match_(filter))
+        elif isinstance(filter, list):
+            for pipe in filter:
+                self.query.append(pipe)
+
+        if restriction:
+            self.query.append(self.match_(restriction))
+
+        self.query.append({'$sort': {sort_key: order, 'public_id': order}})
+
+        if limit == 0:
+            self.query.append(self.skip_(0))
+        else:
+            self.query += [self.skip_(skip), self.limit_(limit)]
+
+        self.query += [
+            self.lookup_(_from='framework.types', _local='type_id', _foreign='public_id', _as='type'),
+            self.unwind_({'path': '$type'}),
+            self.match_({'type': {'$ne': None}}),
+            self.lookup_(_from='management.users', _local='author_id', _foreign='public_id', _as='author'),
+            self.unwind_({'path': '$author', 'preserveNullAndEmptyArrays': True}),
+            self.lookup_(_from='management.users', _local='editor_id', _foreign='public_id', _as='editor'),
+            self.unwind_({'path': '$editor', 'preserveNullAndEmptyArrays': True}),
+        ]
+
+        return self.query
+
+
     def count(self, filter: Union[List[dict], dict], user: UserModel = None,
               permission: AccessControlPermission = None) -> Union[Query, Pipeline]:
         """
@@ -155,6 +214,9 @@ def count(self, filter: Union[List[dict], dict], user: UserModel = None,
 class ObjectManager(ManagerBase):
     """TODO: document"""
 
+    # Fields which are only available after the dependencies of the objects are loaded
+    LOOKUP_FIELDS = ('type', 'author', 'editor')
+
     def __init__(self, database_manager: DatabaseManagerMongo, event_queue: Union[Queue, Event] = None):
         """
         Set the database connection and the queue for sending events.
@@ -192,26 +254,181 @@ def get(self, public_id: Union[PublicID, int], user: UserModel = None,
         raise ManagerGetError(f'Object with ID: {public_id} not found!')
 
 
+    def find(self, filter: dict, *args, **kwargs) -> ListResult[CmdbObject]:
+        """
+        Get a list of objects by a filter query with a single database call
+
+        Args:
+            filter: Filter for matched querys (e.g. `{'public_id': {'$in': [...]}}`)
+
+        Returns:
+            ListResult
+        """
+        results = self._get(self.collection, filter=filter)
+        return ListResult([CmdbObject.from_data(result) for result in results])
+
+
+    def count_unstructured_objects(self, type_: TypeModel, user: UserModel = None,
+                                   permission: AccessControlPermission = None) -> int:
+        """
+        Counts the objects of a type whose field names differ from the field names of the type
+
+        Args:
+            type_ (TypeModel): The type of the objects
+            user: Request user
+            permission: ACL permission
+
+        Raises:
+            AccessDeniedError: If the user has no access to the type
+
+        Returns:
+            int: Number of unstructured objects
+        """
+        verify_access(type_, user, permission)
+
+        return self._count_documents(self.collection, TypeMigrationManager.unstructured_filter(type_))
+
+
+    def get_unstructured_objects(self, type_: TypeModel, user: UserModel = None,
+                                 permission: AccessControlPermission = None, limit: int = 0,
+                                 skip: int = 0) -> IterationResult[CmdbObject]:
+        """
+        Detects the objects of a type whose field names differ from the field names of the type.
+        The total is counted by the database and the objects are read with a cursor ordered by public_id,
+        so no single result document has to hold all matches
+
+        Args:
+            type_ (TypeModel): The type of the objects
+            user: Request user
+            permission: ACL permission
+            limit (int, optional): Max number of returned objects, 0 returns all
+            skip (int, optional): Number of objects to skip first
+
+        Raises:
+            AccessDeniedError: If the user has no access to the type
+
+        Returns:
+            IterationResult[CmdbObject]: The requested page of unstructured objects and their total number
+        """
+        total = self.count_unstructured_objects(type_, user, permission)
+
+        if not total:
+            return IterationResult([], total)
+
+        results = self._get(self.collection, filter=TypeMigrationManager.unstructured_filter(type_),
+                            sort=[('public_id', 1)], skip=skip, limit=limit)
+        iteration_result: IterationResult[CmdbObject] = IterationResult(list(results), total)
+        iteration_result.convert_to(CmdbObject)
+
+        return iteration_result
+
+
     def iterate(self, filter: Union[List[dict], dict], limit: int, skip: int, sort: str, order: int,
                 user: UserModel = None, permission: AccessControlPermission = None, *args, **kwargs) \
             -> IterationResult[CmdbObject]:
         """TODO: document"""
         try:
-            query: Pipeline = self.object_builder.build(filter=filter, limit=limit, skip=skip, sort=sort, order=order,
-                                                        user=user, permission=permission)
+            query: Pipeline = self.__build_indexed_sort_query(filter, limit, skip, sort, order, user, permission)
+
+            if not query:
+                query = self.object_builder.build(filter=filter, limit=limit, skip=skip, sort=sort, order=order,
+                                                  user=user, permission=permission)
             count_query: Pipeline = self.object_builder.count(filter=filter, user=user, permission=permission)
             aggregation_result = list(self._aggregate(self.collection, query))
-            total_cursor = self._aggregate(self.collection, count_query)
-            total = 0
-            while total_cursor.alive:
-                total = next(total_cursor)['total']
+            count_result = self.count_total(filter, count_query, user, permission)
         except ManagerGetError as err:
             raise ManagerIterationError(err) from err
-        iteration_result: IterationResult[CmdbObject] = IterationResult(aggregation_result, total)
+        iteration_result: IterationResult[CmdbObject] = IterationResult(aggregation_result,
+                                                                        count_result.total,
+                                                                        count_result.exact)
         iteration_result.convert_to(CmdbObject)
         return iteration_result
 
 
+    def count_total(self, filter: Union[List[dict], dict], count_query: Pipeline, user: UserModel = None,
+                    permission: AccessControlPermission = None, exact: bool = False, *args, **kwargs) -> CountResult:
+        """
+        Counts the total number of objects of a list request with the cheapest strategy
+
+        The access control is resolved to the list of accessible type ids, so requests of users with
+        restricted types can still be counted with an indexed `count_documents`. If the user may access
+        every type no restriction is added, so an unfiltered list is counted with the collection metadata
+
+        Args:
+            filter: dict or list of dict query/queries which the objects have to match
+            count_query: Count pipeline which is used if the filter requires lookups
+            user: Request user
+            permission: ACL permission
+            exact: Count without using the count cache
+
+        Returns:
+            CountResult: Total of the request and whether it is exact
+        """
+        restriction = None
+
+        if user and permission:
+            type_acls = tree_cache.get(TypeModel.COLLECTION, 'acl', self.__load_type_acls)
+            accessible = [type_id for type_id, acl in type_acls.items()
+                          if acl is None or acl.verify_access(user.group_id, permission)]
+
+            if len(accessible) < len(type_acls):
+                restriction = {'type_id': {'$in': accessible}}
+
+        try:
+            return CountStrategy(self._database_manager, self.collection, lookup_fields=self.LOOKUP_FIELDS)\
+                .count(filter, restriction=restriction, pipeline=count_query, use_cache=not exact)
+        except Exception as err:
+            raise ManagerIterationError(err) from err
+
+
+    def __load_type_acls(self) -> dict:
+        """Returns the activated access control list of each type, None if the acl of a type is not activated"""
+        type_acls = {}
+
+        for type_ in self._get(TypeModel.COLLECTION, filter={}, projection={'_id': 0, 'public_id': 1, 'acl': 1}):
+            acl = AccessControlList.from_data(type_.get('acl') or {})
+            type_acls[type_['public_id']] = acl if acl.activated else None
+
+        return type_acls
+
+
+    def __build_indexed_sort_query(self, filter: Union[List[dict], dict], limit: int, skip: int, sort: str,
+                                   order: int, user: UserModel = None,
+                                   permission: AccessControlPermission = None) -> Optional[Pipeline]:
+        """
+        Builds the pipeline for sorting the objects of a single type on a materialised sort key
+
+        Returns:
+            Optional[Pipeline]: The pipeline or None if the sort field is not a sortable field of the
+                                filtered type or the filter requires the loaded dependencies
+        """
+        field_name = sort_field_name(sort)
+        type_id = single_type_id(filter) if field_name else None
+
+        if type_id is None:
+            return None
+
+        try:
+            type_ = self.type_manager.get(type_id)
+        except ManagerGetError:
+            return None
+
+        if field_name not in type_.sortable_fields:
+            return None
+
+        if CountStrategy(self._database_manager, self.collection, self.LOOKUP_FIELDS).to_filter(filter) is None:
+            return None
+
+        restriction = None
+
+        if user and permission and not has_access_control(type_, user, permission):
+            restriction = {'type_id': {'$in': []}}
+
+        return self.object_builder.build_indexed_sort(filter=filter, limit=limit, skip=skip,
+                                                      sort_key=sort_key_path(field_name), order=order,
+                                                      restriction=restriction)
+
+
     def update(self, public_id: Union[PublicID, int], data: Union[CmdbObject, dict], user: UserModel = None,
                permission: AccessControlPermission = None):
         """
@@ -238,6 +455,8 @@ def update(self, public_id: Union[PublicID, int], data: Union[CmdbObject, dict],
             raise AccessDeniedError(f'Objects cannot be updated because type `{type_.name}` is deactivated.')
         verify_access(type_, user, permission)
 
+        self.__materialise(instance, type_)
+
         update_result = self._update(self.collection, filter={'public_id': public_id}, resource=instance)
 
         if update_result.matched_count != 1:
@@ -251,6 +470,80 @@ def update(self, public_id: Union[PublicID, int], data: Union[CmdbObject, dict],
         return update_result
 
 
+    def bulk_update(self, instances: list[dict], user: UserModel = None,
+                    permission: AccessControlPermission = None) -> dict:
+        """
+        Updates several objects with one unordered bulk write and sends one batched event
+
+        Args:
+            instances (list[dict]): Complete data of each object, identified by its public_id
+            user: Request user
+            permission: ACL permission
+
+        Raises:
+            AccessDeniedError: If the type of an object is deactivated or the user has no access,
+                               nothing is written in this case
+
+        Returns:
+            dict: Error messages of the objects which could not be updated by their public_id
+        """
+        instances = [json.loads(json.dumps(instance, default=json_util.default), object_hook=object_hook)
+                     for instance in instances]
+        type_ids = list({instance.get('type_id') for instance in instances})
+        types = {type_.public_id: type_ for type_ in
+                 self.type_manager.find({'public_id': {'$in': type_ids}}).results}
+        requests = []
+
+        for instance in instances:
+            type_ = types.get(instance.get('type_id'))
+
+            if not type_:
+                raise ManagerUpdateError(f'Type with ID: {instance.get("type_id")} not found!')
+
+            if not type_.active:
+                raise AccessDeniedError(f'Objects cannot be updated because type `{type_.name}` is deactivated.')
+            verify_access(type_, user, permission)
+
+            self.__materialise(instance, type_)
+            requests.append(UpdateOne({'public_id': instance['public_id']}, {'$set': instance}))
+
+        failed = {}
+
+        if not requests:
+            return failed
+
+        try:
+            self._bulk_write(self.collection, requests)
+        except BulkWriteError as err:
+            for write_error in err.details.get('writeErrors', []):
+                failed[instances[write_error['index']]['public_id']] = write_error.get('errmsg')
+
+        updated = [instance for instance in instances if instance['public_id'] not in failed]
+
+        if self.event_queue and user and updated:
+            event = Event("cmdb.core.objects.updated", {
+                "ids": [instance['public_id'] for instance in updated],
+                "type_ids": sorted({instance['type_id'] for instance in updated}),
+                "user_id": user.get_public_id(),
+                "event": 'update'
+            })
+            self.event_queue.put(event)
+
+        return failed
+
+
+    @staticmethod
+    def __materialise(instance: dict, type_: TypeModel) -> None:
+        """Sets the materialised sort keys and multi data section references of an object"""
+        if type_.sortable_fields:
+            instance[SORT_KEYS] = build_sort_keys(instance.get('fields'), type_.sortable_fields)
+
+        mds_ref_fields = get_mds_ref_fields(type_)
+
+        if mds_ref_fields:
+            instance[MDS_REFS] = build_mds_refs(instance.get('multi_data_sections'), mds_ref_fields)
+
+
     def update_many(self, query: dict, update: dict, add_to_set: bool = False):
         """
         update all documents that match the filter from a collection.
@@ -272,7 +565,24 @@ def update_many(self, query: dict, update: dict, add_to_set: bool = False):
     def references(self, object_: CmdbObject, filter: dict, limit: int, skip: int, sort: str, order: int,
                    user: UserModel = None, permission: AccessControlPermission = None, *args, **kwargs) \
             -> IterationResult[CmdbObject]:
-        """TODO: document"""
+        """
+        Retrieves the objects which reference the given object by a reference field, a reference section
+        or a reference field inside a multi data section. Sort, skip and limit are applied by the database
+        and the total is counted exactly
+
+        Args:
+            object_ (CmdbObject): The referenced object
+            filter: dict or list of dict stages which the referencing objects have to match
+            limit: max number of objects to return
+            skip: number of objects to skip first
+            sort: sort field
+            order: sort order
+            user: request user
+            permission: ACL permission
+
+        Returns:
+            IterationResult[CmdbObject]: The referencing objects of the requested page
+        """
         query = []
 
         if isinstance(filter, dict):
@@ -280,180 +590,88 @@ def references(self, object_: CmdbObject, filter: dict, limit: int, skip: int, s
         elif isinstance(filter, list):
             query += filter
 
-        query.append(Builder.lookup_(_from='framework.types', _local='type_id', _foreign='public_id', _as='type'))
-
-        query.append(Builder.unwind_({'path': '$type'}))
-
-        field_ref_query = {
-                'type.fields.type': 'ref',
-                '$or': [
-                    {'type.fields.ref_types': Regex(f'.*{object_.type_id}.*', 'i')},
-                    {'type.fields.ref_types': object_.type_id}
-                ]
-        }
-
-        section_ref_query = {
-                'type.render_meta.sections.type': 'ref-section',
-                'type.render_meta.sections.reference.type_id': object_.type_id
-        }
-
-        query.append(Builder.match_(Builder.or_([field_ref_query, section_ref_query])))
-        query.append(Builder.match_({'fields.value': object_.public_id}))
-
-        # limit and skip will be handled when merged with the MDS results in '__merge_mds_references()'
-        result = self.iterate(filter=query,
-                              limit=0,
-                              skip=0,
-                              sort=sort,
-                              order=order,
-                              user=user,
-                              permission=permission)
-        mds_result = self.get_mds_references_for_object(object_, filter)
+        references_filter = self.get_references_filter(object_)
 
-        merge_result = self.__merge_mds_references(mds_result, result, limit, skip, sort, order)
+        if not references_filter:
+            return IterationResult([], 0)
 
-        return merge_result
+        query.append(Builder.match_(references_filter))
 
-
-    def __merge_mds_references(self,
-                             mds_result: list,
-                             obj_result: IterationResult,
-                             limit: int,
-                             skip: int,
-                             sort: str,
-                             order: int):
-        """TODO: document"""
         try:
-            referenced_ids = []
-
-            # get public_id's of all currently referenced objects
-            for obj in obj_result.results:
-                referenced_ids.append(obj.public_id)
-
-
-            # add mds objects to normal references if they are not already inside
-            for ref_object in mds_result:
-                tmp_object = CmdbObject.from_data(ref_object)
-
-                if tmp_object.public_id not in referenced_ids:
-                    obj_result.results.append(tmp_object)
-
-            obj_result.total = len(obj_result.results)
-
-            # sort all findings according to sort and order
-            descending_order = order == -1
-            try:
-                obj_result.results.sort(key=lambda x: getattr(x, sort), reverse=descending_order)
-            except Exception as err:
-                LOGGER.debug(f"References sorting error: {err}")
+            aggregation_query: Pipeline = self.object_builder.build(filter=query, limit=limit, skip=skip, sort=sort,
+                                                                    order=order, user=user, permission=permission)
+            count_query: Pipeline = self.object_builder.count(filter=query, user=user, permission=permission)
+            aggregation_result = list(self._aggregate(self.collection, aggregation_query))
+            count_result = self.count_total(query, count_query, user, permission, exact=True)
+        except ManagerGetError as err:
+            raise ManagerIterationError(err) from err
 
-            # just keep the given limit of objects if limit > 0
-            if limit > 0:
-                list_length = limit + skip
+        iteration_result: IterationResult[CmdbObject] = IterationResult(aggregation_result,
+                                                                        count_result.total,
+                                                                        count_result.exact)
+        iteration_result.convert_to(CmdbObject)
 
-                # if the list_length is longer than the object_list then just set it to len(object_list)
-                if list_length > len(obj_result.results):
-                    list_length = len(obj_result.results)
+        return iteration_result
 
-                try:
-                    obj_result.results = obj_result.results[skip:list_length]
-                except Exception as err:
-                    LOGGER.debug(f"References list slice error: {err}")
 
-            # obj_result.total = len(obj_result.results)
-        except Exception as err:
-            LOGGER.info(f"__merge_mds_references err: {err}")
+    def get_references_filter(self, referenced_object: CmdbObject) -> Optional[dict]:
+        """
+        Generates the filter for all objects which reference the given object
 
-        return obj_result
+        The referencing types are detected once from the type definitions: types with a reference field or a
+        reference section on the type of the object, and types with reference fields inside their multi data
+        sections (matched by the indexed `mds_refs` of the objects)
 
+        Args:
+            referenced_object (CmdbObject): The referenced object
 
-    def get_mds_references_for_object(self, referenced_object: CmdbObject, query_filter: dict):
-        """TODO: document"""
+        Returns:
+            Optional[dict]: The filter or None if no type can reference the object
+        """
         object_type_id = referenced_object.type_id
+        field_ref_type_ids = []
+        mds_ref_type_ids = []
+        conditions = []
 
-        query = []
-
-        if isinstance(query_filter, dict):
-            query.append(query_filter)
-        elif isinstance(query_filter, list):
-            for a_filter in query_filter:
-                if "$match" in a_filter and len(a_filter["$match"]) > 0:
-                    if "type_id" in a_filter["$match"]:
-                        filter_type_id = a_filter["$match"]["type_id"]
-                        del a_filter["$match"]["type_id"]
-                        a_filter["$match"]["public_id"] = filter_type_id
-
-            query += query_filter
+        for type_ in self.type_manager.find({}).results:
+            ref_fields = [field for field in type_.fields if field.get('type') == 'ref']
+            references_type = any(self.__references_type(field.get('ref_types'), object_type_id)
+                                  for field in ref_fields)
 
-        # Get all types which reference this type
-        query.append({'$match': {"$and": [
-                                    {"fields.type": "ref"},
-                                    {"fields.ref_types": object_type_id}
-                                ]}
-                    })
+            references_type = references_type or any(
+                section.type == 'ref-section'
+                and getattr(getattr(section, 'reference', None), 'type_id', None) == object_type_id
+                for section in type_.render_meta.sections
+            )
 
-        # Filter the public_id's of these types
-        query.append({'$project': {"public_id": 1, "_id": 0}})
+            if references_type:
+                field_ref_type_ids.append(type_.public_id)
 
-        # Get all objects of these types
-        query.append(Builder.lookup_(_from='framework.objects',
-                                     _local='public_id',
-                                     _foreign='type_id',
-                                     _as='type_objects'))
+            mds_ref_fields = get_mds_ref_fields(type_)
 
-        # Filter out types which don't have any objects
-        query.append({'$match': {"type_objects.0": {"$exists": True}}})
+            if any(self.__references_type(field.get('ref_types'), object_type_id)
+                   for field in ref_fields if field.get('name') in mds_ref_fields):
+                mds_ref_type_ids.append(type_.public_id)
 
-        # Spread out the arrays
-        query.append(Builder.unwind_({'path': '$type_objects'}))
+        if field_ref_type_ids:
+            conditions.append({'type_id': {'$in': field_ref_type_ids}, 'fields.value': referenced_object.public_id})
 
-        # Filter the objects which actually have any multi section data
-        query.append({'$match': {"type_objects.multi_data_sections.0": {"$exists": True}}})
+        if mds_ref_type_ids:
+            conditions.append({'type_id': {'$in': mds_ref_type_ids}, MDS_REFS: referenced_object.public_id})
 
-        # Remove the public_id field
-        query.append({'$project': {"type_objects": 1}})
+        if not conditions:
+            return None
 
-        # Spread out as a list
-        query.append({'$replaceRoot': {"newRoot": '$type_objects'}})
+        return conditions[0] if len(conditions) == 1 else {'$or': conditions}
 
-        query.append({'$project': {"_id": 0}})
 
-        # query.append({'$sort': {sort: order}})
+    @staticmethod
+    def __references_type(ref_types, type_id: int) -> bool:
+        """Checks if the `ref_types` of a reference field contain the type"""
+        if isinstance(ref_types, list):
+            return type_id in ref_types
 
-        try:
-            results = list(self._aggregate(self.type_manager.collection, query))
-        except ManagerIterationError as err:
-            LOGGER.debug(f"get_mds_references_for_object aggregation err:{err}")
-
-        matching_results = []
-
-        # Check if the mds data references the current object
-        for result in results:
-            try:
-                for mds_entry in result["multi_data_sections"]:
-                    for value in mds_entry["values"]:
-                        data_set: dict
-                        for data_set in value["data"]:
-                            if self.__is_ref_field(data_set["name"], result) and \
-                            "value" in data_set.keys() and \
-                            data_set["value"] == referenced_object.public_id:
-                                matching_results.append(result)
-                                # this result is a match => go back to outer loop
-                                raise StopIteration()
-            except StopIteration:
-                pass
-
-        return matching_results
-
-
-    def __is_ref_field(self, field_name: str, ref_object: dict) -> bool:
-        """TODO: document"""
-        ref_type = self.type_manager.get(ref_object["type_id"])
-        for field in ref_type.fields:
-            if field["name"] == field_name and field["type"] == "ref":
-                return True
-
-        return False
+        return ref_types == type_id
 
 
     def count_objects(self, type_id: int):
@@ -482,27 +700,138 @@ def delete_all_object_references(self, public_id: int):
         Args:
             public_id (int): public_id of targeted object
         """
-        object_instance: CmdbObject = self.get(public_id)
-        # Get all objects which reference the targeted object
-        iteration_result: IterationResult = self.references(
-                                                    object_=object_instance,
-                                                    filter={'$match': {'active': {'$eq': True}}},
-                                                    limit=0,
-                                                    skip=0,
-                                                    sort='public_id',
-                                                    order=1
-                                            )
-
-        referenced_objects: List[dict] =  [object_.__dict__ for object_ in iteration_result.results]
-
-        # Delete the reference in each object and update them
-        for refed_object in referenced_objects:
-            for field in refed_object['fields']:
-                field_value: int = field['value']
-                field_name: str = field['name']
-
-                if field_name.startswith('ref-') and field_value == public_id:
-                    field['value'] = ""
-
-            refed_object_id = refed_object['public_id']
-            self.update(refed_object_id, refed_object)
+        self.delete_object_references([public_id])
+
+
+    def delete_object_references(self, public_ids: list[int], user: UserModel = None) -> list[int]:
+        """
+        Clears all references to the given objects with one bulk write containing an update per referencing
+        type and storage place of references (reference fields and multi data sections) instead of updating
+        each referencing object. Only the ref fields of the object's own type are cleared
+
+        Args:
+            public_ids (list[int]): public_ids of the referenced objects
+            user (UserModel, optional): User which triggered the change, used for the batched event
+
+        Returns:
+            list[int]: public_ids of the objects whose references were cleared
+        """
+        if not public_ids:
+            return []
+
+        ref_fields_per_type = {}
+        sortable_ref_fields_per_type = {}
+
+        for type_ in self.type_manager.find({}).results:
+            ref_field_names = sorted({field.get('name') for field in type_.fields if field.get('type') == 'ref'})
+
+            if ref_field_names:
+                ref_fields_per_type[type_.public_id] = ref_field_names
+                sortable_ref_fields_per_type[type_.public_id] = [name for name in ref_field_names
+                                                                 if name in type_.sortable_fields]
+
+        if not ref_fields_per_type:
+            return []
+
+        # a field only holds a reference if it is a ref field of the object's own type, fields with the
+        # same name in other types are plain values and must not be cleared
+        field_clauses = {
+            type_id: {
+                'type_id': type_id,
+                'fields': {'$elemMatch': {'name': {'$in': ref_field_names}, 'value': {'$in': public_ids}}}
+            }
+            for type_id, ref_field_names in ref_fields_per_type.items()
+        }
+        mds_clauses = {type_id: {'type_id': type_id, MDS_REFS: {'$in': public_ids}} for type_id in ref_fields_per_type}
+
+        criteria = {
+            'public_id': {'$nin': public_ids},
+            '$or': list(field_clauses.values()) + list(mds_clauses.values())
+        }
+
+        referencing = {}
+
+        for object_ in self._get(self.collection, filter=criteria, projection={'public_id': 1, 'type_id': 1}):
+            referencing[object_['public_id']] = object_['type_id']
+
+        if not referencing:
+            return []
+
+        requests = []
+
+        for type_id in sorted(set(referencing.values())):
+            array_filters = [{'ref.name': {'$in': ref_fields_per_type[type_id]}, 'ref.value': {'$in': public_ids}}]
+
+            requests.append(UpdateMany({'public_id': {'$nin': public_ids}, **field_clauses[type_id]},
+                                       {'$set': {'fields.$[ref].value': ''}},
+                                       array_filters=array_filters))
+            requests.append(UpdateMany({'public_id': {'$nin': public_ids}, **mds_clauses[type_id]},
+                                       {
+                                           '$set': {'multi_data_sections.$[].values.$[].data.$[ref].value': ''},
+                                           '$pullAll': {MDS_REFS: public_ids}
+                                       },
+                                       array_filters=array_filters))
+
+            # the materialised sort keys are copies of the field values and are cleared as well
+            for field_name in sortable_ref_fields_per_type[type_id]:
+                requests.append(UpdateMany({'type_id': type_id, 'public_id': {'$nin': public_ids},
+                                            sort_key_path(field_name): {'$in': public_ids}},
+                                           {'$set': {sort_key_path(field_name): ''}}))
+
+        try:
+            self._database_manager.bulk_write(self.collection, requests)
+        except Exception as err:
+            raise ManagerUpdateError(err) from err
+
+        if self.event_queue and user:
+            event = Event("cmdb.core.objects.updated", {
+                "ids": sorted(referencing),
+                "type_ids": sorted(set(referencing.values())),
+                "user_id": user.get_public_id(),
+                "event": 'update'
+            })
+            self.event_queue.put(event)
+
+        return sorted(referencing)
+
+
+    def delete_many(self, public_ids: list[int], user: UserModel = None,
+                    permission: AccessControlPermission = None) -> int:
+        """
+        Deletes several objects with a single database call and sends one batched event
+
+        Args:
+            public_ids (list[int]): public_ids of the objects
+            user: Request user
+            permission: ACL permission
+
+        Raises:
+            AccessDeniedError: If the type of an object is deactivated or the user has no access,
+                               nothing is deleted in this case
+
+        Returns:
+            int: Number of deleted objects
+        """
+        objects = self.find({'public_id': {'$in': public_ids}}).results
+        type_ids = list({object_.type_id for object_ in objects})
+
+        for type_ in self.type_manager.find({'public_id': {'$in': type_ids}}).results:
+            if not type_.active:
+                raise AccessDeniedError(f'Objects cannot be removed because type `{type_.name}` is deactivated.')
+            verify_access(type_, user, permission)
+
+        deleted_ids = [object_.public_id for object_ in objects]
+
+        if not deleted_ids:
+            return 0
+
+        delete_result = self._delete_many(self.collection, {'public_id': {'$in': deleted_ids}})
+
+        if self.event_queue and user:
+            event = Event("cmdb.core.objects.deleted", {"ids": deleted_ids,
+                                                        "type_ids": sorted(type_ids),
+                                                        "user_id": user.get_public_id(),
+                                                        "event": 'delete'})
+            self.event_queue.put(event)
+
+        return delete_result.deleted_count
@@ -18,7 +18,7 @@
 """
 import json
 import logging
-from typing import Union, List
+from typing import Union, List, Optional
 
 from bson import json_util
 
@@ -27,14 +27,18 @@
 from cmdb.framework import TypeModel
 from cmdb.framework.models.type_model.type_field_section import TypeFieldSection
 from cmdb.manager.managers import ManagerBase
+from cmdb.manager.count_strategy import CountStrategy, count_cache
 from cmdb.framework.results.iteration import IterationResult
 from cmdb.framework.results.list import ListResult
 from cmdb.framework.utils import PublicID
 from cmdb.manager import ManagerGetError, ManagerIterationError, ManagerUpdateError, ManagerDeleteError
 from cmdb.search import Pipeline
 from cmdb.framework.cmdb_object import CmdbObject
-
-import cmdb.framework.cmdb_object_manager as com
+from cmdb.framework.sort_keys import SORT_KEYS, SORT_INDEX_PREFIX, sort_key_index, sort_keys_expression
+from cmdb.framework.field_diff import diff_names
+from cmdb.framework.mds_references import MDS_REFS, get_mds_ref_fields, mds_refs_expression
+from cmdb.framework.models.type_migration import TypeMigrationModel
+from cmdb.framework.managers.type_migration_manager import TypeMigrationManager
 
 # -------------------------------------------------------------------------------------------------------------------- #
 
@@ -79,13 +83,12 @@ def iterate(self, filter: dict, limit: int, skip: int, sort: str, order: int, *a
             query: Pipeline = self.builder.build(filter=filter, limit=limit, skip=skip, sort=sort, order=order)
             count_query: Pipeline = self.builder.count(filter=filter)
             aggregation_result = list(self._aggregate(self.collection, query))
-            total_cursor = self._aggregate(self.collection, count_query)
-            total = 0
-            while total_cursor.alive:
-                total = next(total_cursor)['total']
+            count_result = self.count_total(filter, count_query)
         except ManagerGetError as err:
             raise ManagerIterationError(err) from err
-        iteration_result: IterationResult[TypeModel] = IterationResult(aggregation_result, total)
+        iteration_result: IterationResult[TypeModel] = IterationResult(aggregation_result,
+                                                                       count_result.total,
+                                                                       count_result.exact)
         iteration_result.convert_to(TypeModel)
         return iteration_result
 
@@ -138,7 +141,12 @@ def insert(self, type: Union[TypeModel, dict]) -> PublicID:
         elif isinstance(type, dict):
             type = json.loads(json.dumps(type, default=json_util.default), object_hook=object_hook)
 
-        return self._insert(self.collection, resource=type)
+        public_id = self._insert(self.collection, resource=type)
+
+        if type.get('sortable_fields'):
+            self.sync_sort_keys(self.get(public_id))
+
+        return public_id
 
 
     def update(self, public_id: Union[PublicID, int], type: Union[TypeModel, dict]):
@@ -157,10 +165,20 @@ def update(self, public_id: Union[PublicID, int], type: Union[TypeModel, dict]):
         elif isinstance(type, dict):
             type = json.loads(json.dumps(type, default=json_util.default), object_hook=object_hook)
 
+        unchanged_type = self.get(public_id)
+
         update_result = self._update(self.collection, filter={'public_id': public_id}, resource=type)
         if update_result.matched_count != 1:
             raise ManagerUpdateError('Something happened during the update!')
 
+        updated_type = self.get(public_id)
+
+        if unchanged_type.sortable_fields != updated_type.sortable_fields:
+            self.sync_sort_keys(updated_type)
+
+        if get_mds_ref_fields(unchanged_type) != get_mds_ref_fields(updated_type):
+            self.sync_mds_refs(updated_type)
+
         return update_result
 
 
@@ -182,111 +200,108 @@ def delete(self, public_id: Union[PublicID, int]) -> TypeModel:
 
 # -------------------------------------------------- HELPER SECTION -------------------------------------------------- #
 
-    def handle_mutli_data_sections(self, target_type: TypeModel, updated_data: dict):
-        """TODO: document"""
-        added_fields: dict = {}
-        deleted_fields: dict = {}
-
-        a_section: TypeFieldSection
-        for a_section in target_type.render_meta.sections:
-            # LOGGER.info(f"a type section: {a_section}")
-
-            if a_section.type == "multi-data-section":
-                for updated_section in updated_data["render_meta"]["sections"]:
-                    # LOGGER.info(f"new sections: {updated_section}")
-
-                    if a_section.type == updated_section["type"] and a_section.name == updated_section["name"]:
-                        # get the field changes for each multi-data-section
-                        added_fields[a_section.name] = self.fields_diff(a_section.fields,
-                                                                        updated_section["fields"],
-                                                                        True)
-                        deleted_fields[a_section.name] = self.fields_diff(a_section.fields,
-                                                                          updated_section["fields"],
-                                                                          False)
-
-        return self.update_multi_data_fields(target_type, added_fields, deleted_fields)
-
-
-    def update_multi_data_fields(self, target_type: TypeModel, added_fields: dict, deleted_fields: dict):
-        """TODO: document"""
-        # get all objects of this type
-        cmdb_object_manager = com.CmdbObjectManager(self._database_manager)
-        all_type_objects = cmdb_object_manager.get_objects_by_type(target_type.public_id)
-
-        # update the multi-data-sections
-        an_object: CmdbObject
-        for an_object in all_type_objects:
-            try:
-                for current_mds_section in an_object.multi_data_sections:
-                    section_id = current_mds_section["section_id"]
-                    fields_to_add = added_fields[section_id]
-                    fields_to_delete = deleted_fields[section_id]
-
-                    # add new fields and remove deleted fields
-                    if len(fields_to_add) > 0:
-                        for data_set in current_mds_section["values"]:
-                            data_set = self.create_mds_field_entries(fields_to_add, data_set)
+    def sync_sort_keys(self, target_type: TypeModel) -> None:
+        """
+        Regenerates the sort keys of all objects of a type with a single pipeline update,
+        creates the indexes of the sortable fields and drops sort indexes which are not used by any type
 
-                    if len(fields_to_delete) > 0:
-                        for data_set in current_mds_section["values"]:
-                            data_set = self.delete_mds_field_entries(fields_to_delete, data_set)
+        Args:
+            target_type (TypeModel): Type whose sortable fields changed
+        """
+        criteria = {'type_id': target_type.public_id}
 
-            except Exception as err:
-                LOGGER.error(f"Error while updating multi data fields of objects: {err}")
+        try:
+            if target_type.sortable_fields:
+                self._database_manager.create_indexes(
+                    CmdbObject.COLLECTION,
+                    [sort_key_index(field_name) for field_name in target_type.sortable_fields]
+                )
+                self._database_manager.update_with_pipeline(
+                    CmdbObject.COLLECTION,
+                    criteria,
+                    [{'$unset': SORT_KEYS}, {'$set': {SORT_KEYS: sort_keys_expression(target_type.sortable_fields)}}]
+                )
+            else:
+                self._database_manager.update_with_pipeline(CmdbObject.COLLECTION, criteria, [{'$unset': SORT_KEYS}])
+
+            used_fields = {name for type_ in self.find({}).results for name in type_.sortable_fields}
+
+            for index_name in self._database_manager.get_index_info(CmdbObject.COLLECTION):
+                if index_name.startswith(SORT_INDEX_PREFIX) \
+                    and index_name[len(SORT_INDEX_PREFIX):] not in used_fields:
+                    self._database_manager.drop_index(CmdbObject.COLLECTION, index_name)
+        except Exception as err:
+            raise ManagerUpdateError(f'Could not sync the sort keys of type {target_type.public_id}: {err}') from err
+        finally:
+            CountStrategy.invalidate_indexes(CmdbObject.COLLECTION)
+            count_cache.invalidate(CmdbObject.COLLECTION)
 
-        return all_type_objects
 
+    def sync_mds_refs(self, target_type: TypeModel) -> None:
+        """
+        Regenerates the flattened multi data section references of all objects of a type
+        with a single pipeline update
 
+        Args:
+            target_type (TypeModel): Type whose multi data section reference fields changed
+        """
+        ref_fields = get_mds_ref_fields(target_type)
+        criteria = {'type_id': target_type.public_id}
 
-    def create_mds_field_entries(self, fields_to_add: list, data_set) -> list:
-        """TODO: document"""
         try:
-            for field_name in fields_to_add:
-
-                new_field = {
-                    "name": field_name,
-                    "value": None
-                }
+            if ref_fields:
+                pipeline = [{'$set': {MDS_REFS: mds_refs_expression(ref_fields)}}]
+            else:
+                pipeline = [{'$unset': MDS_REFS}]
 
-                data_set["data"].append(new_field)
+            self._database_manager.update_with_pipeline(CmdbObject.COLLECTION, criteria, pipeline)
+            count_cache.invalidate(CmdbObject.COLLECTION)
         except Exception as err:
-            LOGGER.debug(f"Error in create_mds_field_entries(): {err}")
-
-        return data_set
+            raise ManagerUpdateError(f'Could not sync the MDS references of type {target_type.public_id}: {err}') \
+                from err
 
 
-    def delete_mds_field_entries(self, fields_to_delete: list, data_set: list) -> list:
-        """TODO: document"""
-        to_delete = []
+    def handle_mutli_data_sections(self, target_type: TypeModel, updated_data: dict) -> Optional[TypeMigrationModel]:
+        """
+        Migrates the objects of a type after fields were added to or removed from its multi data sections
 
-        try:
-            # get all fields which should be deleted
-            for field_name in fields_to_delete:
-                index: int = 0
+        Args:
+            target_type (TypeModel): The type before the update
+            updated_data (dict): The data of the updated type
 
-                for entry in data_set["data"]:
-                    if entry["name"] == field_name:
-                        break
+        Raises:
+            ManagerUpdateError: If the objects could not be migrated directly
 
-                    index += 1
+        Returns:
+            Optional[TypeMigrationModel]: The background migration of a large type,
+                                          None if the objects were migrated directly
+        """
+        sections: list[dict] = []
 
-                to_delete.append(index)
+        a_section: TypeFieldSection
+        for a_section in target_type.render_meta.sections:
+            if a_section.type == "multi-data-section":
+                for updated_section in updated_data["render_meta"]["sections"]:
+                    if a_section.type == updated_section["type"] and a_section.name == updated_section["name"]:
+                        # get the field changes for each multi-data-section
+                        added, deleted = diff_names(a_section.fields, updated_section["fields"])
+                        sections.append({'section_id': a_section.name, 'added': added, 'deleted': deleted})
 
-            # delete from end
-            for idx in to_delete[::-1]:
-                del data_set["data"][idx]
+        return TypeMigrationManager(self._database_manager).migrate(target_type.public_id, sections)
 
-        except Exception as err:
-            LOGGER.debug(f"Error in delete_mds_field_entries(): {err}") 
 
-        return data_set
+    def fields_diff(self, initial_fields: list, new_fields: list,  check_added: bool = False) -> list:
+        """
+        Returns the added or the deleted field names of a section
 
+        Args:
+            initial_fields (list): Field names before the update
+            new_fields (list): Field names after the update
+            check_added (bool): Return the added instead of the deleted names
 
-    def fields_diff(self, initial_fields: list, new_fields: list,  check_added: bool = False) -> list:
-        """TODO: document"""
-        if check_added:
-            # check which fields were added
-            return [field_name for field_name in new_fields if field_name not in initial_fields]
+        Returns:
+            list: Added or deleted field names
+        """
+        added_fields, deleted_fields = diff_names(initial_fields, new_fields)
 
-        #check which fields were deleted
-        return [field_name for field_name in initial_fields if field_name not in new_fields]
+        return added_fields if check_added else deleted_fields
@@ -0,0 +1,519 @@
+# DATAGERRY - OpenSource Enterprise CMDB
+# Copyright (C) 2024 becon GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+Set based migration of the objects of a type
+
+When fields are added to or removed from a multi data section of a type, the data sets of all objects of
+the type are changed inside the database: removed fields are pulled with `arrayFilters`, added fields are
+appended by an aggregation pipeline update. Objects whose fields do not match the fields of their type
+(unstructured objects) are detected by comparing the field names with `$setDifference` and restructured
+by a single pipeline update. All operations are idempotent, so a batch can be applied again after an
+interruption.
+
+Types with few objects are migrated within the request. Larger types get a `TypeMigrationModel` which is
+processed by the `TypeMigrationService` in batches ordered by public_id. The progress is stored after each batch,
+migrations of a crashed process are resumed once their heartbeat is outdated.
+"""
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from cmdb.database.database_manager_mongo import DatabaseManagerMongo
+from cmdb.framework.cmdb_object import CmdbObject
+from cmdb.framework.models.type import TypeModel
+from cmdb.framework.sort_keys import SORT_KEYS, sort_keys_expression
+from cmdb.framework.models.type_migration import TypeMigrationModel
+from cmdb.manager.managers import ManagerBase
+from cmdb.manager.count_strategy import count_cache
+
+from cmdb.errors.manager import ManagerGetError, ManagerUpdateError
+# -------------------------------------------------------------------------------------------------------------------- #
+
+LOGGER = logging.getLogger(__name__)
+
+
+def mds_field_removal(section_id: str, deleted_fields: list[str]) -> tuple[dict, list[dict]]:
+    """
+    Update which removes fields from all data sets of a multi data section
+
+    Args:
+        section_id (str): Name of the multi data section
+        deleted_fields (list[str]): Names of the removed fields
+
+    Returns:
+        tuple[dict, list[dict]]: Update operators and their array filters
+    """
+    return (
+        {'$pull': {'multi_data_sections.$[section].values.$[].data': {'name': {'$in': deleted_fields}}}},
+        [{'section.section_id': section_id}]
+    )
+
+
+def mds_field_addition(section_id: str, added_fields: list[str]) -> list[dict]:
+    """
+    Update pipeline which appends empty entries of new fields to all data sets of a multi data section,
+    entries which already exist are not added again
+
+    Args:
+        section_id (str): Name of the multi data section
+        added_fields (list[str]): Names of the added fields
+
+    Returns:
+        list[dict]: Update pipeline
+    """
+    missing_entries = {
+        '$filter': {
+            'input': {'$literal': [{'name': field_name, 'value': None} for field_name in added_fields]},
+            'as': 'entry',
+            'cond': {'$not': [{'$in': ['$$entry.name', {'$ifNull': ['$$data_set.data.name', []]}]}]}
+        }
+    }
+
+    updated_data_sets = {
+        '$map': {
+            'input': {'$ifNull': ['$$mds.values', []]},
+            'as': 'data_set',
+            'in': {'$mergeObjects': [
+                '$$data_set',
+                {'data': {'$concatArrays': [{'$ifNull': ['$$data_set.data', []]}, missing_entries]}}
+            ]}
+        }
+    }
+
+    return [{
+        '$set': {
+            'multi_data_sections': {
+                '$map': {
+                    'input': '$multi_data_sections',
+                    'as': 'mds',
+                    'in': {'$cond': [
+                        {'$eq': ['$$mds.section_id', {'$literal': section_id}]},
+                        {'$mergeObjects': ['$$mds', {'values': updated_data_sets}]},
+                        '$$mds'
+                    ]}
+                }
+            }
+        }
+    }]
+
+
+def unstructured_objects_expression(type_field_names: list[str]) -> dict:
+    """
+    Query expression matching objects whose field names differ from the field names of their type
+
+    Args:
+        type_field_names (list[str]): Names of the fields of the type
+
+    Returns:
+        dict: Expression for `$expr`
+    """
+    object_field_names = {'$ifNull': ['$fields.name', []]}
+    type_field_names = {'$literal': type_field_names}
+
+    return {'$or': [
+        {'$gt': [{'$size': {'$setDifference': [object_field_names, type_field_names]}}, 0]},
+        {'$gt': [{'$size': {'$setDifference': [type_field_names, object_field_names]}}, 0]}
+    ]}
+
+
+def restructure_pipeline(type_: TypeModel) -> list[dict]:
+    """
+    Update pipeline which removes the fields unknown to the type from an object and appends the missing
+    fields of the type with their default value, the sort keys are regenerated afterwards
+
+    Args:
+        type_ (TypeModel): The type of the objects
+
+    Returns:
+        list[dict]: Update pipeline
+    """
+    type_field_names = [field.get('name') for field in type_.fields]
+    type_field_entries = [{'name': field.get('name'), 'value': field.get('value', None)} for field in type_.fields]
+
+    known_fields = {
+        '$filter': {
+            'input': {'$ifNull': ['$fields', []]},
+            'as': 'field',
+            'cond': {'$in': ['$$field.name', {'$literal': type_field_names}]}
+        }
+    }
+    missing_fields = {
+        '$filter': {
+            'input': {'$literal': type_field_entries},
+            'as': 'type_field',
+            'cond': {'$not': [{'$in': ['$$type_field.name', {'$ifNull': ['$fields.name', []]}]}]}
+        }
+    }
+
+    pipeline = [{'$set': {'fields': {'$concatArrays': [known_fields, missing_fields]}}}]
+
+    if type_.sortable_fields:
+        pipeline += [{'$unset': SORT_KEYS}, {'$set': {SORT_KEYS: sort_keys_expression(type_.sortable_fields)}}]
+
+    return pipeline
+
+# -------------------------------------------------------------------------------------------------------------------- #
+#                                              TypeMigrationManager - CLASS                                            #
+# -------------------------------------------------------------------------------------------------------------------- #
+
+class TypeMigrationManager(ManagerBase):
+    """
+    Migrates the objects of a type after its multi data sections changed
+    """
+
+    # Number of objects migrated by one database call
+    BATCH_SIZE = 5000
+    # Types with more objects are migrated in the background
+    BACKGROUND_THRESHOLD = 10000
+    # Seconds without heartbeat after which a running migration is taken over by another process
+    HEARTBEAT_TIMEOUT = 300
+
+
+    def __init__(self, database_manager: DatabaseManagerMongo):
+        """
+        Constructor of `TypeMigrationManager`
+
+        Args:
+            database_manager: Connection to the database class.
+        """
+        super().__init__(TypeMigrationModel.COLLECTION, database_manager=database_manager)
+
+
+    def migrate(self, type_id: int, sections: list[dict]) -> Optional[TypeMigrationModel]:
+        """
+        Migrates the objects of a type
+
+        Args:
+            type_id (int): public_id of the type
+            sections (list[dict]): Added and deleted field names per multi data section
+                                   (`{'section_id': str, 'added': list[str], 'deleted': list[str]}`)
+
+        Raises:
+            ManagerUpdateError: If the objects could not be migrated directly
+
+        Returns:
+            Optional[TypeMigrationModel]: The background migration or None if the objects were migrated directly
+        """
+        sections = [section for section in sections if section['added'] or section['deleted']]
+
+        if not sections:
+            return None
+
+        total = self._count_documents(CmdbObject.COLLECTION, {'type_id': type_id})
+
+        if total <= self.BACKGROUND_THRESHOLD and not self.has_unfinished_migrations(type_id):
+            try:
+                self.apply(type_id, sections)
+            except Exception as err:
+                raise ManagerUpdateError(f'Could not migrate the objects of type {type_id}: {err}') from err
+
+            return None
+
+        return self.__enqueue(type_id, TypeMigrationModel.MDS_FIELDS, total, sections)
+
+
+    def restructure(self, type_: TypeModel) -> Optional[TypeMigrationModel]:
+        """
+        Restructures the objects of a type whose fields do not match the fields of the type
+
+        Args:
+            type_ (TypeModel): The type of the objects
+
+        Raises:
+            ManagerUpdateError: If the objects could not be restructured directly
+
+        Returns:
+            Optional[TypeMigrationModel]: The background migration or None if the objects were restructured directly
+        """
+        unstructured = self.count_unstructured(type_)
+
+        if not unstructured:
+            return None
+
+        if unstructured <= self.BACKGROUND_THRESHOLD and not self.has_unfinished_migrations(type_.public_id):
+            try:
+                self.apply_restructure(type_)
+            except Exception as err:
+                raise ManagerUpdateError(f'Could not restructure the objects of type {type_.public_id}: {err}') \
+                    from err
+
+            return None
+
+        total = self._count_documents(CmdbObject.COLLECTION, {'type_id': type_.public_id})
+
+        return self.__enqueue(type_.public_id, TypeMigrationModel.RESTRUCTURE, total)
+
+
+    def count_unstructured(self, type_: TypeModel) -> int:
+        """
+        Counts the objects of a type whose fields do not match the fields of the type
+
+        Args:
+            type_ (TypeModel): The type of the objects
+
+        Returns:
+            int: Number of unstructured objects
+        """
+        return self._count_documents(CmdbObject.COLLECTION, self.unstructured_filter(type_))
+
+
+    @staticmethod
+    def unstructured_filter(type_: TypeModel) -> dict:
+        """
+        Filter of the objects of a type whose fields do not match the fields of the type
+
+        Args:
+            type_ (TypeModel): The type of the objects
+
+        Returns:
+            dict: Filter of the unstructured objects
+        """
+        return {
+            'type_id': type_.public_id,
+            '$expr': unstructured_objects_expression([field.get('name') for field in type_.fields])
+        }
+
+
+    def apply_restructure(self, type_: TypeModel, public_id_range: dict = None) -> None:
+        """
+        Restructures the unstructured objects of a type
+
+        Args:
+            type_ (TypeModel): The type of the objects
+            public_id_range (dict, optional): Condition of the public_ids of the restructured objects
+        """
+        criteria = self.unstructured_filter(type_)
+
+        if public_id_range:
+            criteria['public_id'] = public_id_range
+
+        self._database_manager.update_with_pipeline(CmdbObject.COLLECTION, criteria, restructure_pipeline(type_))
+        count_cache.invalidate(CmdbObject.COLLECTION)
+
+
+    def apply(self, type_id: int, sections: list[dict], public_id_range: dict = None) -> None:
+        """
+        Applies the field changes of multi data sections to the objects of a type
+
+        Args:
+            type_id (int): public_id of the type
+            sections (list[dict]): Added and deleted field names per multi data section
+            public_id_range (dict, optional): Condition of the public_ids of the migrated objects
+        """
+        for section in sections:
+            criteria = {'type_id': type_id, 'multi_data_sections.section_id': section['section_id']}
+
+            if public_id_range:
+                criteria['public_id'] = public_id_range
+
+            if section['deleted']:
+                update, array_filters = mds_field_removal(section['section_id'], section['deleted'])
+                self._database_manager.update_many_with_array_filters(CmdbObject.COLLECTION, criteria, update,
+                                                                      array_filters)
+
+            if section['added']:
+                self._database_manager.update_with_pipeline(CmdbObject.COLLECTION, criteria,
+                                                            mds_field_addition(section['section_id'],
+                                                                               section['added']))
+
+        count_cache.invalidate(CmdbObject.COLLECTION)
+
+
+    def get_migrations(self, type_id: int) -> list[TypeMigrationModel]:
+        """
+        Returns the background migrations of a type, the newest first
+
+        Args:
+            type_id (int): public_id of the type
+
+        Returns:
+            list[TypeMigrationModel]: Migrations of the type
+        """
+        results = self._get(self.collection, filter={'type_id': type_id}, sort=[('public_id', -1)])
+
+        return [TypeMigrationModel.from_data(result) for result in results]
+
+
+    def has_unfinished_migrations(self, type_id: int) -> bool:
+        """
+        Checks if a background migration of a type is pending or running
+
+        Args:
+            type_id (int): public_id of the type
+
+        Returns:
+            bool: True if the objects of the type are still migrated
+        """
+        return self._count_documents(self.collection, {'type_id': type_id, 'status': {'$in': [
+            TypeMigrationModel.PENDING, TypeMigrationModel.RUNNING]}}) > 0
+
+
+    def run_pending(self, stop_event: threading.Event = None) -> None:
+        """
+        Runs the migrations which are pending or whose process stopped sending heartbeats,
+        the migrations of a type are run one after another in the order they were created
+
+        Args:
+            stop_event (threading.Event, optional): Stops the migrations after the current batch when set,
+                                                    the interrupted migration is released to be resumed later
+        """
+        try:
+            unfinished = self._get(self.collection,
+                                   filter={'status': {'$in': [TypeMigrationModel.PENDING, TypeMigrationModel.RUNNING]}},
+                                   projection={'_id': 0, 'type_id': 1})
+            type_ids = sorted({migration['type_id'] for migration in unfinished})
+        except Exception as err:
+            LOGGER.error('Could not search for unfinished type migrations: %s', err)
+            return
+
+        for type_id in type_ids:
+            if stop_event and stop_event.is_set():
+                return
+
+            self.__run_type(type_id, stop_event)
+
+# -------------------------------------------------- HELPER SECTION -------------------------------------------------- #
+
+    def __enqueue(self, type_id: int, action: str, total: int, sections: list[dict] = None) -> TypeMigrationModel:
+        """Stores a migration which is processed in the background by the `TypeMigrationService`"""
+        migration = {
+            'type_id': type_id,
+            'action': action,
+            'sections': sections or [],
+            'status': TypeMigrationModel.PENDING,
+            'total': total,
+            'processed': 0,
+            'last_public_id': 0,
+            'creation_time': datetime.now(timezone.utc),
+        }
+        migration['public_id'] = self._insert(self.collection, migration)
+        LOGGER.info('Objects of type %s are migrated in the background (migration %s, %s, %s objects)',
+                    type_id, migration['public_id'], action, total)
+
+        return TypeMigrationModel.from_data(migration)
+
+
+    def __run_type(self, type_id: int, stop_event: threading.Event = None) -> None:
+        """Runs the migrations of a type one after another in the order they were created"""
+        try:
+            while not (stop_event and stop_event.is_set()):
+                migration = self.__claim_next(type_id)
+
+                if not migration:
+                    return
+
+                self.__run(migration, stop_event)
+        except Exception as err:
+            LOGGER.error('Migration of the objects of type %s stopped: %s', type_id, err)
+
+
+    def __claim_next(self, type_id: int) -> Optional[TypeMigrationModel]:
+        """
+        Claims the oldest unfinished migration of a type, returns None if there is none
+        or if it is running in another process which is still alive
+        """
+        unfinished = list(self._get(self.collection,
+                                    filter={'type_id': type_id, 'status': {'$in': [TypeMigrationModel.PENDING,
+                                                                                   TypeMigrationModel.RUNNING]}},
+                                    sort=[('public_id', 1)], limit=1))
+
+        if not unfinished:
+            return None
+
+        now = datetime.now(timezone.utc)
+        stale = now - timedelta(seconds=self.HEARTBEAT_TIMEOUT)
+        claimed = self._database_manager.find_one_and_update(
+            self.collection,
+            {
+                'public_id': unfinished[0]['public_id'],
+                '$or': [{'status': TypeMigrationModel.PENDING},
+                        {'status': TypeMigrationModel.RUNNING, 'last_heartbeat': {'$lt': stale}}]
+            },
+            {'$set': {'status': TypeMigrationModel.RUNNING, 'last_heartbeat': now}}
+        )
+
+        return TypeMigrationModel.from_data(claimed) if claimed else None
+
+
+    def __run(self, migration: TypeMigrationModel, stop_event: threading.Event = None) -> None:
+        """Migrates the objects of a claimed migration in batches and stores the progress after each batch"""
+        last_public_id = migration.last_public_id
+        processed = migration.processed
+
+        LOGGER.info('Migration %s of type %s started after object %s', migration.public_id, migration.type_id,
+                    last_public_id)
+
+        try:
+            # restructured objects are compared to the type as it is when the migration starts
+            type_ = self.__get_type(migration.type_id) \
+                if migration.action == TypeMigrationModel.RESTRUCTURE else None
+
+            while True:
+                if stop_event and stop_event.is_set():
+                    # released, so the next start resumes it without waiting for the heartbeat timeout
+                    self._update(self.collection, {'public_id': migration.public_id},
+                                 {'status': TypeMigrationModel.PENDING})
+                    LOGGER.info('Migration %s of type %s interrupted after object %s', migration.public_id,
+                                migration.type_id, last_public_id)
+                    return
+
+                batch = [result['public_id'] for result in
+                         self._get(CmdbObject.COLLECTION,
+                                   filter={'type_id': migration.type_id, 'public_id': {'$gt': last_public_id}},
+                                   projection={'_id': 0, 'public_id': 1},
+                                   sort=[('public_id', 1)],
+                                   limit=self.BATCH_SIZE)]
+
+                if not batch:
+                    break
+
+                public_id_range = {'$gte': batch[0], '$lte': batch[-1]}
+
+                if type_:
+                    self.apply_restructure(type_, public_id_range)
+                else:
+                    self.apply(migration.type_id, migration.sections, public_id_range)
+
+                last_public_id = batch[-1]
+                processed += len(batch)
+                self._update(self.collection, {'public_id': migration.public_id}, {
+                    'last_public_id': last_public_id,
+                    'processed': processed,
+                    'last_heartbeat': datetime.now(timezone.utc)
+                })
+
+            self._update(self.collection, {'public_id': migration.public_id}, {
+                'status': TypeMigrationModel.DONE,
+                'finish_time': datetime.now(timezone.utc)
+            })
+            LOGGER.info('Migration %s of type %s finished, %s objects migrated', migration.public_id,
+                        migration.type_id, processed)
+        except Exception as err:
+            LOGGER.error('Migration %s of type %s failed: %s', migration.public_id, migration.type_id, err)
+            self._update(self.collection, {'public_id': migration.public_id}, {
+                'status': TypeMigrationModel.FAILED,
+                'finish_time': datetime.now(timezone.utc),
+                'error': str(err)
+            })
+
+
+    def __get_type(self, type_id: int) -> TypeModel:
+        """Loads the current version of a type"""
+        for result in self._get(TypeModel.COLLECTION, filter={'public_id': type_id}, limit=1):
+            return TypeModel.from_data(result)
+
+        raise ManagerGetError(f'Type with ID: {type_id} not found!')
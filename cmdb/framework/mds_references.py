@@ -0,0 +1,129 @@
+# DATAGERRY - OpenSource Enterprise CMDB
+# Copyright (C) 2024 becon GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+Flattened references of multi data sections
+
+The public_ids referenced by reference fields inside the multi data sections of an object are stored in
+the indexed top level array `mds_refs`. Finding all objects referencing an object through a multi data
+section is therefore a single indexed query instead of scanning the data sets of all objects.
+"""
+import logging
+
+from cmdb.framework.models.type import TypeModel
+# -------------------------------------------------------------------------------------------------------------------- #
+
+LOGGER = logging.getLogger(__name__)
+
+MDS_REFS = 'mds_refs'
+
+
+def get_mds_ref_fields(type_: TypeModel) -> list[str]:
+    """
+    Returns the names of the reference fields inside the multi data sections of a type
+
+    Args:
+        type_ (TypeModel): The type of the objects
+
+    Returns:
+        list[str]: Sorted names of the reference fields
+    """
+    ref_fields = {field.get('name') for field in type_.fields if field.get('type') == 'ref'}
+    mds_fields = set()
+
+    for section in type_.render_meta.sections:
+        if section.type == 'multi-data-section':
+            mds_fields.update(section.fields or [])
+
+    return sorted(ref_fields & mds_fields)
+
+
+def build_mds_refs(multi_data_sections: list[dict], ref_fields: list[str]) -> list[int]:
+    """
+    Collects the referenced public_ids of the multi data sections of an object
+
+    Args:
+        multi_data_sections (list[dict]): Multi data sections of the object
+        ref_fields (list[str]): Names of the reference fields of the multi data sections
+
+    Returns:
+        list[int]: Sorted unique public_ids of the referenced objects
+    """
+    if not ref_fields:
+        return []
+
+    ref_fields = set(ref_fields)
+    references = set()
+
+    for section in multi_data_sections or []:
+        for value in section.get('values', []):
+            for data_set in value.get('data', []):
+                data_value = data_set.get('value')
+
+                if data_set.get('name') in ref_fields and isinstance(data_value, int) \
+                    and not isinstance(data_value, bool):
+                    references.add(data_value)
+
+    return sorted(references)
+
+
+def mds_refs_expression(ref_fields: list[str]) -> dict:
+    """
+    Aggregation expression which generates the `mds_refs` from the multi data sections of an object,
+    used to sync the references of all objects of a type with a single pipeline update
+
+    Args:
+        ref_fields (list[str]): Names of the reference fields of the multi data sections
+
+    Returns:
+        dict: Expression for a `$set` stage
+    """
+    data_set_references = {
+        '$map': {
+            'input': {
+                '$filter': {
+                    'input': {'$ifNull': ['$$this.data', []]},
+                    'as': 'data_set',
+                    'cond': {'$and': [
+                        {'$in': ['$$data_set.name', ref_fields]},
+                        {'$isNumber': '$$data_set.value'}
+                    ]}
+                }
+            },
+            'as': 'data_set',
+            'in': '$$data_set.value'
+        }
+    }
+
+    section_references = {
+        '$reduce': {
+            'input': {'$ifNull': ['$$this.values', []]},
+            'initialValue': [],
+            'in': {'$concatArrays': ['$$value', data_set_references]}
+        }
+    }
+
+    return {
+        '$setUnion': [
+            [],
+            {
+                '$reduce': {
+                    'input': {'$ifNull': ['$multi_data_sections', []]},
+                    'initialValue': [],
+                    'in': {'$concatArrays': ['$$value', section_references]}
+                }
+            }
+        ]
+    }
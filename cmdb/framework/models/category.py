@@ -15,7 +15,7 @@
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 """TODO: document"""
 import logging
-from typing import List, Union
+from typing import Dict, List, Union
 
 from cmdb.framework.models import TypeModel
 from cmdb.framework.cmdb_dao import CmdbDAO
@@ -205,14 +205,15 @@ class CategoryNode:
         """Class of a category node inside the category tree"""
 
         def __init__(self, category: CategoryModel, children: List["CategoryTree.CategoryNode"] = None,
-                     types: List[TypeModel] = None):
+                     types: Union[List[TypeModel], Dict[int, TypeModel]] = None):
             self.category: CategoryModel = category
             self.node_order: int = self.category.get_meta().get_order()
             self.children: List["CategoryTree.CategoryNode"] = sorted(children or [], key=lambda node: (
                                                              node.get_order() is None, node.get_order()))
+            if not isinstance(types, dict):
+                types = {type_.public_id: type_ for type_ in types or []}
             # prevent wrong type order
-            self.types: List[TypeModel] = [type_ for id_ in self.category.types for type_ in types if
-                                           id_ == type_.public_id]
+            self.types: List[TypeModel] = [types[id_] for id_ in self.category.types if id_ in types]
 
 
         @classmethod
@@ -278,15 +279,25 @@ def tree(self) -> List[CategoryNode]:
     @classmethod
     def __create_tree(cls, categories, parent: int = None, types: List[TypeModel] = None) -> List[CategoryNode]:
         """
-        Generate the category tree from list structure
+        Generate the category tree from list structure in linear time, the categories are grouped by
+        their parent and the types are indexed by their public_id once
         Args:
             categories: list of root/child categories
             parent: the parent id of the current subset, None if root list
             types: list of all possible types
         """
-        return [category for category in [CategoryTree.CategoryNode(category, CategoryTree.__create_tree(
-            categories, category.get_public_id(), types), types) for category in categories if
-                                          category.get_parent() == parent]]
+        categories_by_parent: Dict[int, List[CategoryModel]] = {}
+
+        for category in categories:
+            categories_by_parent.setdefault(category.get_parent(), []).append(category)
+
+        types_by_id: Dict[int, TypeModel] = {type_.public_id: type_ for type_ in types or []}
+
+        def create_nodes(parent_id: int) -> List[CategoryTree.CategoryNode]:
+            return [CategoryTree.CategoryNode(category, create_nodes(category.get_public_id()), types_by_id)
+                    for category in categories_by_parent.get(parent_id, [])]
+
+        return create_nodes(parent)
 
 
     @classmethod
@@ -26,6 +26,12 @@ class ObjectLinkModel(CmdbDAO):
     COLLECTION: Collection = "framework.links"
     MODEL: Model = 'ObjectLink'
 
+    INDEX_KEYS = [
+        {'keys': [('primary', CmdbDAO.DAO_ASCENDING), ('secondary', CmdbDAO.DAO_ASCENDING)],
+         'name': 'primary_secondary', 'unique': True},
+        {'keys': [('secondary', CmdbDAO.DAO_ASCENDING)], 'name': 'secondary', 'unique': False}
+    ]
+
     def __init__(self, public_id: int, primary: int, secondary: int, creation_time: datetime = None):
         if primary == secondary:
             raise ValueError(f'Same link IDs: {primary}/{secondary}')
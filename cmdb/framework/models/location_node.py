@@ -37,7 +37,7 @@ def __init__(self, params: dict):
 
     def get_children(self, public_id:int, locations_list: list[dict]):
         """
-        Gets recursively all children for a location
+        Gets all children for a location
 
         Args:
             public_id (int): public:id of the location
@@ -46,20 +46,31 @@ def get_children(self, public_id:int, locations_list: list[dict]):
         Returns:
             list[LocationNode]: returns all children for the given public_id
         """
-        sorted_children: list["LocationNode"] = []
-        filtered_list: list[dict] = []
-
-        if len(locations_list) > 0:
-            for location in locations_list:
-                if location['parent'] == public_id:
-                    sorted_children.append(LocationNode(location))
-                else:
-                    filtered_list.append(location)
-
-            if len(filtered_list) > 0:
-                for child in sorted_children:
-                    child.children = self.get_children(child.get_public_id(), filtered_list)
-        return sorted_children
+        return self.build_tree(locations_list, public_id)
+
+
+    @classmethod
+    def build_tree(cls, locations_list: list[dict], root: int = 1) -> list["LocationNode"]:
+        """
+        Builds the location tree in linear time by grouping the locations by their parent once
+
+        Args:
+            locations_list (list): list of locations from database
+            root (int): public_id of the location whose children are the top level nodes
+
+        Returns:
+            list[LocationNode]: the top level nodes in the order of the locations list
+        """
+        nodes_by_parent: dict[int, list[LocationNode]] = {}
+
+        for location in locations_list:
+            nodes_by_parent.setdefault(location['parent'], []).append(cls(location))
+
+        for nodes in nodes_by_parent.values():
+            for node in nodes:
+                node.children = nodes_by_parent.get(node.public_id, [])
+
+        return nodes_by_parent.get(root, [])
 
 
     def get_public_id(self):
@@ -38,6 +38,13 @@ class CmdbMetaLog(CmdbDAO):
     COLLECTION: Collection = 'framework.logs'
     MODEL: Model = 'CmdbLog'
 
+    INDEX_KEYS = [
+        {'keys': [('object_id', CmdbDAO.DAO_ASCENDING), ('public_id', CmdbDAO.DAO_DESCENDING)],
+         'name': 'object_id_public_id', 'unique': False},
+        {'keys': [('object_exists', CmdbDAO.DAO_ASCENDING), ('object_id', CmdbDAO.DAO_ASCENDING)],
+         'name': 'object_exists_object_id', 'unique': False}
+    ]
+
     def __init__(self, public_id, log_type, log_time: datetime, action: LogAction, action_name: str):
         self.log_type = log_type
         self.log_time: datetime = log_time
@@ -47,9 +54,16 @@ def __init__(self, public_id, log_type, log_time: datetime, action: LogAction, a
 
 
 class CmdbObjectLog(CmdbMetaLog):
-    """TODO:document"""
+    """
+    Log of an object action
+
+    New logs do not contain a `render_state`. Every `SNAPSHOT_INTERVAL` logs of an object store a `snapshot`
+    of its raw state, the logs in between store the `delta` to the previous log (see `cmdb.framework.object_states`).
+    `object_exists` is cleared on all logs of an object when the object is deleted and set again if it is recreated.
+    """
 
     DEFAULT_VERSION: str = '1.0.0'
+    SNAPSHOT_INTERVAL: int = 20
     SCHEMA: dict = {
         'object_id': {
             'type': 'integer'
@@ -72,6 +86,26 @@ class CmdbObjectLog(CmdbMetaLog):
         'render_state': {
             'type': 'string'
         },
+        'snapshot': {
+            'type': 'dict',
+            'nullable': True
+        },
+        'snapshot_id': {
+            'type': 'integer',
+            'nullable': True
+        },
+        'snapshot_distance': {
+            'type': 'integer',
+            'nullable': True
+        },
+        'delta': {
+            'type': 'dict',
+            'nullable': True
+        },
+        'object_exists': {
+            'type': 'boolean',
+            'default': True
+        },
         'log_type': {
             'type': 'string',
             'required': True,
@@ -104,7 +138,8 @@ class CmdbObjectLog(CmdbMetaLog):
 
     def __init__(self, public_id: int, log_type, log_time: datetime, action: LogAction, action_name: str,
                  object_id: int, version, user_id: int, user_name: str = None, changes: list = None,
-                 comment: str = None, render_state=None):
+                 comment: str = None, render_state=None, snapshot: dict = None, snapshot_id: int = None,
+                 snapshot_distance: int = None, delta: dict = None, object_exists: bool = True):
         self.object_id = object_id
         self.version = version
         self.user_id = user_id
@@ -112,6 +147,11 @@ def __init__(self, public_id: int, log_type, log_time: datetime, action: LogActi
         self.comment = comment
         self.changes = changes or []
         self.render_state = render_state
+        self.snapshot = snapshot
+        self.snapshot_id = snapshot_id
+        self.snapshot_distance = snapshot_distance
+        self.delta = delta
+        self.object_exists = object_exists
         super().__init__(public_id=public_id, log_type=log_type, log_time=log_time, action=action,
                                             action_name=action_name)
 
@@ -126,6 +166,11 @@ def from_data(cls, data: dict, *args, **kwargs) -> "CmdbObjectLog":
             user_name=data.get('user_name'),
             user_id=data.get('user_id'),
             render_state=data.get('render_state'),
+            snapshot=data.get('snapshot'),
+            snapshot_id=data.get('snapshot_id'),
+            snapshot_distance=data.get('snapshot_distance'),
+            delta=data.get('delta'),
+            object_exists=data.get('object_exists', True),
             log_time=data.get('log_time', None),
             log_type=data.get('log_type', None),
             changes=data.get('changes', None),
@@ -148,6 +193,11 @@ def to_json(cls, instance: "CmdbObjectLog") -> dict:
             'user_name': instance.user_name,
             'user_id': instance.user_id,
             'render_state': instance.render_state,
+            'snapshot': instance.snapshot,
+            'snapshot_id': instance.snapshot_id,
+            'snapshot_distance': instance.snapshot_distance,
+            'delta': instance.delta,
+            'object_exists': instance.object_exists,
             'changes': instance.changes,
             'comment': instance.comment,
             'action_name': instance.action_name
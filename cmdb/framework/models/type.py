@@ -83,6 +83,14 @@ class TypeModel(CmdbDAO):
                 'type': 'string',
             }
         },
+        'sortable_fields':{
+            'type': 'list',
+            'required': False,
+            'default': [],
+            'schema': {
+                'type': 'string',
+            }
+        },
         'active': {
             'type': 'boolean',
             'required': False,
@@ -325,7 +333,8 @@ class TypeModel(CmdbDAO):
     }
 
     INDEX_KEYS = [
-        {'keys': [('name', CmdbDAO.DAO_ASCENDING)], 'name': 'name', 'unique': True}
+        {'keys': [('name', CmdbDAO.DAO_ASCENDING)], 'name': 'name', 'unique': True},
+        {'keys': [('global_template_ids', CmdbDAO.DAO_ASCENDING)], 'name': 'global_template_ids', 'unique': False}
     ]
 
 
@@ -333,13 +342,15 @@ def __init__(self, public_id: int, name: str, author_id: int, render_meta: TypeR
                  creation_time: datetime = None, last_edit_time: datetime = None, editor_id: int = None,
                  active: bool = True,  selectable_as_parent: bool = True,
                  global_template_ids: list[int] = None, fields: list = None, version: str = None,
-                 label: str = None, description: str = None, acl: AccessControlList = None):
+                 label: str = None, description: str = None, acl: AccessControlList = None,
+                 sortable_fields: list[str] = None):
         self.name: str = name
         self.label: str = label or self.name.title()
         self.description: str = description
         self.version: str = version or TypeModel.DEFAULT_VERSION
         self.selectable_as_parent: bool = selectable_as_parent
         self.global_template_ids: list = global_template_ids or []
+        self.sortable_fields: list[str] = sortable_fields or []
         self.active: bool = active
         self.author_id: int = author_id
         self.creation_time: datetime = creation_time or datetime.now(timezone.utc)
@@ -376,6 +387,7 @@ def from_data(cls, data: dict) -> "TypeModel":
             name = data.get('name'),
             selectable_as_parent = data.get('selectable_as_parent', True),
             global_template_ids = data.get('global_template_ids', []),
+            sortable_fields = data.get('sortable_fields', None) or [],
             active = data.get('active', True),
             author_id = data.get('author_id'),
             creation_time = creation_time,
@@ -398,6 +410,7 @@ def to_json(cls, instance: "TypeModel") -> dict:
             'name': instance.name,
             'selectable_as_parent': instance.selectable_as_parent,
             'global_template_ids': instance.global_template_ids,
+            'sortable_fields': instance.sortable_fields,
             'active': instance.active,
             'author_id': instance.author_id,
             'creation_time': instance.creation_time,
@@ -0,0 +1,132 @@
+# DATAGERRY - OpenSource Enterprise CMDB
+# Copyright (C) 2024 becon GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+This module contains the model of a type migration
+"""
+from datetime import datetime, timezone
+
+from cmdb.framework import CmdbDAO
+from cmdb.framework.utils import Collection, Model
+# -------------------------------------------------------------------------------------------------------------------- #
+
+class TypeMigrationModel(CmdbDAO):
+    """
+    Migration of the objects of a type, either after its multi data section fields changed (`MDS_FIELDS`)
+    or to restructure the fields of objects which do not match the fields of the type (`RESTRUCTURE`)
+
+    The objects are migrated in batches ordered by their public_id. `last_public_id` is the highest
+    public_id of the last finished batch, so an interrupted migration continues after it.
+    """
+
+    COLLECTION: Collection = 'framework.typeMigrations'
+    MODEL: Model = 'TypeMigration'
+
+    MDS_FIELDS = 'mds_fields'
+    RESTRUCTURE = 'restructure'
+
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+
+    INDEX_KEYS = [
+        {'keys': [('type_id', CmdbDAO.DAO_ASCENDING), ('status', CmdbDAO.DAO_ASCENDING)],
+         'name': 'type_id_status', 'unique': False}
+    ]
+
+
+    def __init__(self, public_id: int, type_id: int, sections: list[dict] = None, action: str = MDS_FIELDS,
+                 status: str = PENDING, total: int = 0, processed: int = 0, last_public_id: int = 0,
+                 creation_time: datetime = None, last_heartbeat: datetime = None, finish_time: datetime = None,
+                 error: str = None):
+        """
+        Args:
+            public_id (int): public_id of the migration
+            type_id (int): public_id of the migrated type
+            sections (list[dict]): Added and deleted field names per multi data section
+                                   (`{'section_id': str, 'added': list[str], 'deleted': list[str]}`)
+            action (str): mds_fields or restructure
+            status (str): pending, running, done or failed
+            total (int): Number of objects of the type when the migration was created
+            processed (int): Number of already migrated objects
+            last_public_id (int): Highest public_id of the already migrated objects
+            creation_time (datetime): Creation time of the migration
+            last_heartbeat (datetime): Last sign of life of the process running the migration
+            finish_time (datetime): Time when the migration was done or failed
+            error (str): Reason of a failed migration
+        """
+        self.type_id: int = type_id
+        self.sections: list[dict] = sections or []
+        self.action: str = action
+        self.status: str = status
+        self.total: int = total
+        self.processed: int = processed
+        self.last_public_id: int = last_public_id
+        self.creation_time: datetime = creation_time or datetime.now(timezone.utc)
+        self.last_heartbeat: datetime = last_heartbeat
+        self.finish_time: datetime = finish_time
+        self.error: str = error
+        super().__init__(public_id=public_id)
+
+
+    @property
+    def progress(self) -> float:
+        """Share of the migrated objects between 0 and 1"""
+        if self.status == TypeMigrationModel.DONE:
+            return 1.0
+
+        if not self.total:
+            return 0.0
+
+        return min(self.processed / self.total, 1.0)
+
+
+    @classmethod
+    def from_data(cls, data: dict, *args, **kwargs) -> "TypeMigrationModel":
+        """Convert the database data to a type migration instance"""
+        return cls(
+            public_id=data.get('public_id'),
+            type_id=data.get('type_id'),
+            sections=data.get('sections', []),
+            action=data.get('action', TypeMigrationModel.MDS_FIELDS),
+            status=data.get('status', TypeMigrationModel.PENDING),
+            total=data.get('total', 0),
+            processed=data.get('processed', 0),
+            last_public_id=data.get('last_public_id', 0),
+            creation_time=data.get('creation_time', None),
+            last_heartbeat=data.get('last_heartbeat', None),
+            finish_time=data.get('finish_time', None),
+            error=data.get('error', None),
+        )
+
+
+    @classmethod
+    def to_json(cls, instance: "TypeMigrationModel") -> dict:
+        """Convert a type migration instance to json conform data"""
+        return {
+            'public_id': instance.public_id,
+            'type_id': instance.type_id,
+            'sections': instance.sections,
+            'action': instance.action,
+            'status': instance.status,
+            'total': instance.total,
+            'processed': instance.processed,
+            'last_public_id': instance.last_public_id,
+            'creation_time': instance.creation_time,
+            'last_heartbeat': instance.last_heartbeat,
+            'finish_time': instance.finish_time,
+            'error': instance.error,
+        }
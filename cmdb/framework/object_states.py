@@ -0,0 +1,116 @@
+# DATAGERRY - OpenSource Enterprise CMDB
+# Copyright (C) 2024 becon GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+States of objects stored in the object logs
+
+Object logs do not store a rendered object. Every few logs of an object store a `snapshot` with the raw state
+of the object, the logs in between only store the `delta` to the state of the previous log. The state of an
+object at any log is reconstructed by applying the deltas to the preceding snapshot.
+
+A delta has the following structure:
+    {
+        'set': {<top level key>: <new value>, ...},
+        'fields': {'set': [<changed or added field>, ...], 'unset': [<name of removed field>, ...]}
+    }
+"""
+import copy
+import logging
+from typing import Union
+
+from cmdb.framework.cmdb_object import CmdbObject
+from cmdb.framework.field_diff import diff_fields
+# -------------------------------------------------------------------------------------------------------------------- #
+
+LOGGER = logging.getLogger(__name__)
+
+# Keys of an object state beside the fields, multi data sections are stored as a whole if they changed
+STATE_KEYS = ('public_id', 'type_id', 'status', 'version', 'creation_time', 'author_id', 'last_edit_time',
+              'editor_id', 'active', 'multi_data_sections')
+
+
+def object_state(object_: Union[CmdbObject, dict]) -> dict:
+    """
+    Returns the raw state of an object which is stored in a log snapshot
+
+    Args:
+        object_ (Union[CmdbObject, dict]): The object or its data
+
+    Returns:
+        dict: The state keys and the fields of the object
+    """
+    if isinstance(object_, CmdbObject):
+        object_ = CmdbObject.to_json(object_)
+
+    state = {key: object_.get(key) for key in STATE_KEYS}
+    state['fields'] = [{'name': field.get('name'), 'value': field.get('value')}
+                       for field in object_.get('fields') or []]
+    state['multi_data_sections'] = state['multi_data_sections'] or []
+
+    return state
+
+
+def object_delta(old_state: dict, new_state: dict) -> dict:
+    """
+    Calculates the delta between two states of an object
+
+    Args:
+        old_state (dict): State of the previous log
+        new_state (dict): Current state
+
+    Returns:
+        dict: Changed top level values and changed fields
+    """
+    change_set = diff_fields(old_state.get('fields'), new_state.get('fields'))
+
+    return {
+        'set': {key: new_state.get(key) for key in STATE_KEYS if old_state.get(key) != new_state.get(key)},
+        'fields': {
+            'set': [change.new for change in change_set.changed] + change_set.added,
+            'unset': [field.get('name') for field in change_set.removed]
+        }
+    }
+
+
+def apply_delta(state: dict, delta: dict) -> dict:
+    """
+    Applies a delta to a state of an object
+
+    Args:
+        state (dict): State of the previous log
+        delta (dict): Delta stored in the current log
+
+    Returns:
+        dict: A new state, the passed state is not modified
+    """
+    new_state = copy.deepcopy(state)
+    new_state.update(copy.deepcopy(delta.get('set', {})))
+
+    field_delta = delta.get('fields', {})
+    unset = set(field_delta.get('unset', []))
+    changed = {field.get('name'): field for field in field_delta.get('set', [])}
+    fields = []
+
+    for field in new_state.get('fields') or []:
+        name = field.get('name')
+
+        if name in unset:
+            continue
+
+        fields.append(dict(changed.pop(name)) if name in changed else field)
+
+    new_state['fields'] = fields + [dict(field) for field in changed.values()]
+
+    return new_state
@@ -25,16 +25,18 @@
 class IterationResult(Generic[C]):
     """Framework Result for a iteration call over a collection"""
 
-    def __init__(self, results: List[Union[C, dict]], total: int):
+    def __init__(self, results: List[Union[C, dict]], total: int, total_exact: bool = True):
         """
         Constructor of IterationResult
         Args:
             results: List of raw oder generic database results
             total: Total number of elements in the query.
+            total_exact: False if the total is estimated or was taken from the count cache
         """
         self.results = results
         self.count = len(self.results)
         self.total = total
+        self.total_exact = total_exact
 
 
     def convert_to(self, c: Type[C]):
@@ -0,0 +1,159 @@
+# DATAGERRY - OpenSource Enterprise CMDB
+# Copyright (C) 2024 becon GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+Materialised sort keys of objects
+
+The values of the fields listed in `TypeModel.sortable_fields` are copied into the top level
+document `sort_keys` of every object of the type. Each sort key is indexed together with `type_id`,
+so sorting the objects of a type by such a field is an index walk instead of an in-memory sort.
+"""
+import logging
+from typing import Union, Optional
+
+from pymongo import IndexModel
+# -------------------------------------------------------------------------------------------------------------------- #
+
+LOGGER = logging.getLogger(__name__)
+
+SORT_KEYS = 'sort_keys'
+SORT_INDEX_PREFIX = 'sort_key_'
+
+
+def sort_key_path(field_name: str) -> str:
+    """
+    Returns the document path of the sort key of a field
+
+    Args:
+        field_name (str): Name of the type field
+
+    Returns:
+        str: Path of the sort key (e.g. 'sort_keys.hostname')
+    """
+    return f'{SORT_KEYS}.{field_name}'
+
+
+def build_sort_keys(fields: list[dict], sortable_fields: list[str]) -> dict:
+    """
+    Generates the sort keys of an object
+
+    Args:
+        fields (list[dict]): Fields of the object
+        sortable_fields (list[str]): Sortable fields of the type of the object
+
+    Returns:
+        dict: Sort key values by field name
+    """
+    if not sortable_fields:
+        return {}
+
+    values = {field.get('name'): field.get('value') for field in fields or []}
+
+    return {name: values.get(name) for name in sortable_fields}
+
+
+def sort_keys_expression(sortable_fields: list[str]) -> dict:
+    """
+    Aggregation expression which generates the sort keys from the `fields` of an object,
+    used to sync the sort keys of all objects of a type with a single pipeline update
+
+    Args:
+        sortable_fields (list[str]): Sortable fields of the type
+
+    Returns:
+        dict: Expression for a `$set` stage
+    """
+    keys = {}
+
+    for name in sortable_fields:
+        keys[name] = {
+            '$let': {
+                'vars': {
+                    'field': {
+                        '$arrayElemAt': [
+                            {'$filter': {'input': '$fields', 'cond': {'$eq': ['$$this.name', name]}}},
+                            0
+                        ]
+                    }
+                },
+                'in': '$$field.value'
+            }
+        }
+
+    return {'$literal': {}} if not keys else keys
+
+
+def sort_key_index(field_name: str) -> IndexModel:
+    """
+    Index for sorting the objects of a type by a field
+
+    Args:
+        field_name (str): Name of the type field
+
+    Returns:
+        IndexModel: Compound index of `type_id`, the sort key and `public_id` as tie breaker
+    """
+    return IndexModel([('type_id', 1), (sort_key_path(field_name), 1), ('public_id', 1)],
+                      name=f'{SORT_INDEX_PREFIX}{field_name}')
+
+
+def sort_field_name(sort: str) -> Optional[str]:
+    """
+    Extracts the field name of a sort parameter on object field values
+
+    Args:
+        sort (str): Sort parameter of the request (e.g. 'fields.hostname')
+
+    Returns:
+        Optional[str]: Name of the field or None if the sort is not on a field value
+    """
+    if sort and sort.startswith('fields.'):
+        return sort[7:]
+
+    return None
+
+
+def single_type_id(criteria: Union[dict, list[dict]]) -> Optional[int]:
+    """
+    Returns the type id if the criteria of a request only matches objects of one type
+
+    Args:
+        criteria (Union[dict, list[dict]]): Filter or list of `$match` stages
+
+    Returns:
+        Optional[int]: The type id or None if it can not be determined
+    """
+    if isinstance(criteria, list):
+        conditions = [stage.get('$match') for stage in criteria if isinstance(stage, dict) and '$match' in stage]
+    else:
+        conditions = [criteria]
+
+    while conditions:
+        condition = conditions.pop()
+
+        if not isinstance(condition, dict):
+            continue
+
+        type_id = condition.get('type_id')
+
+        if isinstance(type_id, dict) and '$eq' in type_id:
+            type_id = type_id['$eq']
+
+        if isinstance(type_id, int) and not isinstance(type_id, bool):
+            return type_id
+
+        conditions.extend(condition.get('$and', []))
+
+    return None
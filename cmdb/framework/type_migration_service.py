@@ -0,0 +1,66 @@
+# DATAGERRY - OpenSource Enterprise CMDB
+# Copyright (C) 2024 becon GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""Background service which runs the object migrations of changed types"""
+import logging
+import threading
+
+import cmdb.process_management.service
+from cmdb.database.database_manager_mongo import DatabaseManagerMongo
+from cmdb.event_management.event import Event
+from cmdb.framework.managers.type_migration_manager import TypeMigrationManager
+from cmdb.utils.system_config import SystemConfigReader
+# -------------------------------------------------------------------------------------------------------------------- #
+
+LOGGER = logging.getLogger(__name__)
+
+
+class TypeMigrationService(cmdb.process_management.service.AbstractCmdbService):
+    """Runs the pending type migrations, including the ones interrupted by a stopped process"""
+
+    # Seconds between two searches for pending migrations
+    CHECK_INTERVAL = 5
+
+    def __init__(self):
+        super().__init__()
+        self._name = "type_migration"
+        self._eventtypes = ["cmdb.type_migration.#"]
+        self.__run_requested = threading.Event()
+
+
+    def _run(self):
+        LOGGER.info("%s: start run", self._name)
+        database_manager = DatabaseManagerMongo(**SystemConfigReader().get_all_values_from_section('Database'))
+        type_migration_manager = TypeMigrationManager(database_manager)
+
+        while not self._event_shutdown.is_set():
+            self.__run_requested.clear()
+
+            try:
+                type_migration_manager.run_pending(self._event_shutdown)
+            except Exception as err:
+                LOGGER.error("%s: run failed: %s", self._name, err)
+
+            for _ in range(self.CHECK_INTERVAL):
+                if self._event_shutdown.is_set() or self.__run_requested.is_set():
+                    break
+                self._event_shutdown.wait(1)
+        LOGGER.info("%s: end run", self._name)
+
+
+    def _handle_event(self, event: Event):
+        LOGGER.debug("event received:%s", event.get_type())
+        if event.get_type() == "cmdb.type_migration.run":
+            self.__run_requested.set()
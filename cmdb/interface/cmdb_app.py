@@ -18,6 +18,7 @@
 from flask import Flask
 
 from cmdb.database.database_manager_mongo import DatabaseManagerMongo
+from cmdb.event_management.event_dispatcher import DispatchingEventQueue
 # -------------------------------------------------------------------------------------------------------------------- #
 
 class BaseCmdbApp(Flask):
@@ -27,7 +28,7 @@ def __init__(self, import_name: str,
                  database_manager: DatabaseManagerMongo = None,
                  event_queue: Queue = None):
         self.database_manager: DatabaseManagerMongo = database_manager
-        self.event_queue: Queue = event_queue
+        self.event_queue: Queue = DispatchingEventQueue(event_queue)
         self.temp_folder: str = '/tmp/'
 
         super().__init__(import_name)
@@ -0,0 +1,248 @@
+# DATAGERRY - OpenSource Enterprise CMDB
+# Copyright (C) 2024 becon GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+Compression of the http responses
+
+The `CompressionMiddleware` compresses json and text responses with brotli (if the `brotli` package is installed)
+or gzip, depending on the `Accept-Encoding` of the request. Responses with a known length are compressed as a
+whole if they are larger than the threshold, streamed responses without a length (e.g. exports) are compressed
+chunk by chunk while they are sent.
+
+The middleware is configured in the optional `[Compression]` section of the configuration:
+    enabled = True
+    threshold = 1024   (minimum size of the compressed responses in bytes)
+    level = 6          (gzip level 1-9)
+    brotli_level = 4   (brotli quality 0-11)
+"""
+import logging
+import zlib
+from typing import Iterable, Optional
+
+from cmdb.errors.system_config import ConfigFileError
+from cmdb.utils.cast import auto_cast
+from cmdb.utils.system_config import SystemConfigReader
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+# -------------------------------------------------------------------------------------------------------------------- #
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_SETTINGS = {
+    'enabled': True,
+    'threshold': 1024,
+    'level': 6,
+    'brotli_level': 4,
+}
+
+COMPRESSIBLE_MIME_TYPES = ('application/json', 'application/javascript', 'application/xml', 'application/xhtml',
+                           'text/', 'image/svg+xml')
+
+
+def get_compression_settings() -> dict:
+    """
+    Returns the settings of the `[Compression]` section, which are overwritten by environment variables
+    (e.g. `DATAGERRY_Compression_brotli_level`), missing values are taken from the defaults
+
+    Returns:
+        dict: `enabled`, `threshold`, `level` and `brotli_level`
+    """
+    settings = dict(DEFAULT_SETTINGS)
+
+    try:
+        configured = SystemConfigReader().get_all_values_from_section('Compression')
+        settings.update({key: auto_cast(value) for key, value in configured.items() if key in DEFAULT_SETTINGS})
+    except ConfigFileError:
+        pass
+
+    return settings
+
+
+class CompressionMiddleware:
+    """WSGI middleware which compresses the responses of an application"""
+
+    def __init__(self, app, threshold: int = 1024, level: int = 6, brotli_level: int = 4, **kwargs):
+        """
+        Args:
+            app: The wrapped WSGI application
+            threshold (int): Responses with a known length below this size are not compressed
+            level (int): Compression level of gzip
+            brotli_level (int): Quality of brotli
+        """
+        self.app = app
+        self.threshold = threshold
+        self.level = level
+        self.brotli_level = brotli_level
+
+
+    def __call__(self, environ, start_response):
+        encoding = self.negotiate(environ.get('HTTP_ACCEPT_ENCODING', ''))
+
+        if not encoding or environ.get('REQUEST_METHOD') == 'HEAD':
+            return self.app(environ, start_response)
+
+        response = {}
+
+        def buffering_start_response(status: str, headers: list, exc_info=None):
+            if not self.__is_compressible(status, headers):
+                response['passed'] = True
+                return start_response(status, headers, exc_info)
+
+            response.update(status=status, headers=headers, exc_info=exc_info)
+            return self.__write_not_supported
+
+        app_iter = self.app(environ, buffering_start_response)
+
+        if response.get('passed') or 'status' not in response:
+            return app_iter
+
+        headers = response['headers']
+        content_length = next((value for name, value in headers if name.lower() == 'content-length'), None)
+
+        if content_length is None:
+            start_response(response['status'], self.__compressed_headers(headers, encoding), response['exc_info'])
+            return self.__compress_stream(app_iter, encoding)
+
+        try:
+            body = b''.join(app_iter)
+        finally:
+            if hasattr(app_iter, 'close'):
+                app_iter.close()
+
+        if len(body) < self.threshold:
+            start_response(response['status'], headers, response['exc_info'])
+            return [body]
+
+        compressed = self.__get_compressor(encoding)
+        body = compressed.compress(body) + compressed.flush()
+        start_response(response['status'], self.__compressed_headers(headers, encoding, len(body)),
+                       response['exc_info'])
+        return [body]
+
+
+    @staticmethod
+    def negotiate(accept_encoding: str) -> Optional[str]:
+        """
+        Selects the content encoding of the response
+
+        Args:
+            accept_encoding (str): `Accept-Encoding` header of the request
+
+        Returns:
+            str: `br` or `gzip`, None if the client accepts neither of them
+        """
+        accepted = {}
+
+        for entry in accept_encoding.lower().split(','):
+            coding, _, params = entry.strip().partition(';')
+            quality = 1.0
+
+            if params.strip().startswith('q='):
+                try:
+                    quality = float(params.strip()[2:])
+                except ValueError:
+                    quality = 0.0
+
+            if coding:
+                accepted[coding.strip()] = quality
+
+        candidates = ('br', 'gzip') if brotli else ('gzip',)
+        encodings = [coding for coding in candidates if accepted.get(coding, accepted.get('*', 0.0)) > 0]
+
+        return max(encodings, key=lambda coding: accepted.get(coding, accepted.get('*')), default=None)
+
+
+    def __get_compressor(self, encoding: str):
+        """Returns a compressor with `compress` and `flush` for the encoding"""
+        if encoding == 'br':
+            return _BrotliCompressor(self.brotli_level)
+
+        return zlib.compressobj(self.level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+
+    def __compress_stream(self, app_iter: Iterable[bytes], encoding: str) -> Iterable[bytes]:
+        """Compresses a streamed response, every chunk is flushed to keep the stream progressing"""
+        compressor = self.__get_compressor(encoding)
+
+        try:
+            for chunk in app_iter:
+                if chunk:
+                    yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+            yield compressor.flush()
+        finally:
+            if hasattr(app_iter, 'close'):
+                app_iter.close()
+
+
+    def __is_compressible(self, status: str, headers: list) -> bool:
+        """Checks the status and the headers of the response"""
+        if status[:3] in ('204', '206', '304') or int(status[:3]) < 200:
+            return False
+
+        header_values = {name.lower(): value for name, value in headers}
+
+        if 'content-encoding' in header_values or 'no-transform' in header_values.get('cache-control', ''):
+            return False
+
+        content_length = header_values.get('content-length')
+
+        if content_length is not None and int(content_length) < self.threshold:
+            return False
+
+        return header_values.get('content-type', '').startswith(COMPRESSIBLE_MIME_TYPES)
+
+
+    @staticmethod
+    def __compressed_headers(headers: list, encoding: str, content_length: int = None) -> list:
+        """
+        Replaces the length and adds the encoding to the headers of a response. A strong ETag is weakened because
+        the compressed body differs from the body it was built from, a weak `If-None-Match` still matches it.
+        """
+        vary = [value for name, value in headers if name.lower() == 'vary']
+        compressed_headers = [(name, f'W/{value}' if name.lower() == 'etag' and not value.startswith('W/') else value)
+                              for name, value in headers if name.lower() not in ('content-length', 'vary')]
+        compressed_headers.append(('Content-Encoding', encoding))
+        compressed_headers.append(('Vary', ', '.join(vary + ['Accept-Encoding'])))
+
+        if content_length is not None:
+            compressed_headers.append(('Content-Length', str(content_length)))
+
+        return compressed_headers
+
+
+    @staticmethod
+    def __write_not_supported(data: bytes):
+        raise NotImplementedError('The write callable is not supported for compressed responses')
+
+
+class _BrotliCompressor:
+    """Adapter of the brotli compressor to the interface of the zlib compressor"""
+
+    def __init__(self, quality: int):
+        self.compressor = brotli.Compressor(quality=quality)
+
+
+    def compress(self, data: bytes) -> bytes:
+        """Compresses a chunk"""
+        return self.compressor.process(data)
+
+
+    def flush(self, mode: int = zlib.Z_FINISH) -> bytes:
+        """Flushes the buffered data, the stream is finished with `Z_FINISH`"""
+        return self.compressor.finish() if mode == zlib.Z_FINISH else self.compressor.flush()
@@ -15,7 +15,25 @@
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 """
 Server module for web-based services
+
+The web service runs gunicorn with one of the following worker classes, configured in the `[WebServer]` section:
+    worker_class = sync        (sync, gthread or gevent)
+    workers = 9                (number of worker processes, default: 2 * cpu cores + 1)
+    threads = 4                (threads of every gthread worker)
+    worker_connections = 1000  (concurrent requests of every gevent worker)
+    timeout = 120              (seconds until a blocked worker is restarted)
+
+With `sync` workers every request occupies a whole process. `gthread` and `gevent` workers serve several requests
+per process while others wait for I/O (database, LDAP, message broker). The gevent worker requires the optional
+`gevent` package, without it `gthread` workers are used.
+
+The WSGI app and its database connection are created inside every worker, after the gevent worker patched the
+standard library, so the MongoDB client only uses cooperative sockets and is never shared between forked processes.
+The workers do not connect to the message broker, their events are passed through a multiprocessing queue to the
+pika connection of the web service process.
 """
+import functools
+import importlib.util
 import logging
 import multiprocessing
 
@@ -24,15 +42,16 @@
 from cmdb import __MODE__
 import cmdb.process_management.service
 from cmdb.database.database_manager_mongo import DatabaseManagerMongo
-from cmdb.interface.net_app import create_app
-from cmdb.interface.docs import create_docs_server
-from cmdb.interface.rest_api import create_rest_api
+from cmdb.errors.system_config import ConfigFileError
+from cmdb.utils.cast import auto_cast
 from cmdb.utils.system_config import SystemConfigReader
 from cmdb.utils.logger import get_logging_conf
 # -------------------------------------------------------------------------------------------------------------------- #
 
 LOGGER = logging.getLogger(__name__)
 
+WORKER_CLASSES = ('sync', 'gthread', 'gevent')
+
 
 class WebCmdbService(cmdb.process_management.service.AbstractCmdbService):
     """CmdbService: Webapp"""
@@ -49,25 +68,12 @@ def __init__(self):
     def _run(self):
         # get queue for sending events
         event_queue = self._event_manager.get_send_queue()
-        database_manager = DatabaseManagerMongo(
-            **SystemConfigReader().get_all_values_from_section('Database')
-        )
-
-
-        # get WSGI app
-        app = DispatcherMiddleware(
-            app=create_app(),
-            mounts={
-                '/docs': create_docs_server(),
-                '/rest': create_rest_api(database_manager, event_queue)
-            }
-        )
 
         # get gunicorn options
         options = SystemConfigReader().get_all_values_from_section('WebServer')
 
-        # start gunicorn as own process
-        webserver = HTTPServer(app, options)
+        # start gunicorn as own process, the WSGI app is created by every worker
+        webserver = HTTPServer(options=options, app_factory=functools.partial(create_wsgi_app, event_queue))
         self.__webserver_proc = multiprocessing.Process(target=webserver.run)
         self.__webserver_proc.start()
         self.__webserver_proc.join()
@@ -82,26 +88,67 @@ def _handle_event(self, event):
         """ignore incomming events"""
 
 
+def create_wsgi_app(event_queue):
+    """
+    Creates the WSGI app of the web service with its own database connection
+
+    Args:
+        event_queue: Queue for sending events to the web service process
+
+    Returns:
+        DispatcherMiddleware: The frontend, the docs and the REST API
+    """
+    # imported here so the routes are loaded after the gevent worker patched the standard library
+    from cmdb.interface.net_app import create_app
+    from cmdb.interface.docs import create_docs_server
+    from cmdb.interface.rest_api import create_rest_api
+
+    database_manager = DatabaseManagerMongo(
+        **SystemConfigReader().get_all_values_from_section('Database')
+    )
+
+    return DispatcherMiddleware(
+        app=create_app(),
+        mounts={
+            '/docs': create_docs_server(),
+            '/rest': create_rest_api(database_manager, event_queue)
+        }
+    )
+
+
 class HTTPServer(BaseApplication):
     """Basic server main_application"""
 
-    def __init__(self, app, options=None):
-        self.options = options or {}
+    def __init__(self, app=None, options=None, app_factory=None):
+        """
+        Args:
+            app (optional): WSGI app which is served by all workers
+            options (dict, optional): Values of the `[WebServer]` section
+            app_factory (Callable, optional): Creates the WSGI app inside every worker, used if no app is passed
+        """
+        self.options = {key: auto_cast(value) if isinstance(value, str) else value
+                        for key, value in (options or {}).items()}
         if 'host' in self.options and 'port' in self.options:
             self.options['bind'] = '%s:%s' % (self.options['host'], self.options['port'])
         if 'workers' not in self.options:
             self.options['workers'] = HTTPServer.number_of_workers()
-        self.options['worker_class'] = 'sync'
+        self.options['worker_class'] = HTTPServer.worker_class(self.options.get('worker_class', 'sync'))
+        if self.options['worker_class'] == 'gthread':
+            self.options.setdefault('threads', HTTPServer.number_of_threads())
+        elif self.options['worker_class'] == 'gevent':
+            self.options.setdefault('worker_connections', 1000)
         self.options['disable_existing_loggers'] = False
         self.options['logconfig_dict'] = get_logging_conf()
-        self.options['timeout'] = 120
-        self.options['daemon'] = True
+        self.options.setdefault('timeout', 120)
+        self.options.setdefault('daemon', True)
         if __MODE__ in ('DEBUG','TESTING'):
             self.options['reload'] = True
             self.options['check_config'] = True
             LOGGER.debug("Gunicorn starting with auto reload option")
-        LOGGER.info("Interfaces started @ http://%s:%s",self.options['host'], self.options['port'])
+        LOGGER.info("Interfaces started @ http://%s:%s with %s %s workers", self.options['host'],
+                    self.options['port'], self.options['workers'], self.options['worker_class'])
         self.application = app
+        self.app_factory = app_factory
         super().__init__()
 
 
@@ -113,15 +160,56 @@ def load_config(self):
 
 
     def load(self):
+        if self.application is None:
+            self.application = self.app_factory()
         return self.application
 
 
+    @staticmethod
+    def worker_class(name: str) -> str:
+        """
+        Returns the gunicorn worker class for the configured name
+
+        Args:
+            name (str): `sync`, `gthread` or `gevent`
+
+        Returns:
+            str: The worker class, `gthread` if gevent is configured but not installed
+        """
+        name = str(name).lower()
+
+        if name not in WORKER_CLASSES:
+            LOGGER.warning("Unknown worker class '%s', using sync workers", name)
+            return 'sync'
+
+        if name == 'gevent' and importlib.util.find_spec('gevent') is None:
+            LOGGER.warning("The gevent package is not installed, using gthread workers")
+            return 'gthread'
+
+        return name
+
+
     @staticmethod
     def number_of_workers() -> int:
         """TODO: document"""
         return (multiprocessing.cpu_count() * 2) + 1
 
 
+    @staticmethod
+    def configured_workers() -> int:
+        """Number of worker processes of the `[WebServer]` section, the default number if it is not set"""
+        try:
+            return int(SystemConfigReader().get_value('workers', 'WebServer'))
+        except (ConfigFileError, KeyError, TypeError, ValueError):
+            return HTTPServer.number_of_workers()
+
+
+    @staticmethod
+    def number_of_threads() -> int:
+        """Default number of threads of a gthread worker"""
+        return 4
+
+
 class DispatcherMiddleware:
     """TODO: document"""
 
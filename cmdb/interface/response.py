@@ -14,12 +14,11 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 """TODO: document"""
-from json import dumps
 from datetime import datetime, timezone
 from enum import Enum
 from math import ceil
 from typing import List, Union
-from flask import make_response as flask_response
+from flask import current_app, make_response as flask_response
 from werkzeug.wrappers import Response
 
 from cmdb.framework.utils import PublicID, Model
@@ -28,10 +27,11 @@
 from cmdb.interface.api_project import APIProjection, APIProjector
 
 from cmdb.interface.api_pagination import APIPagination, APIPager
-from cmdb.interface.route_utils import default
+from cmdb.interface.route_utils import default, body_etag, make_conditional
+from cmdb.utils.json_encoding import dumps
 # -------------------------------------------------------------------------------------------------------------------- #
 
-def make_api_response(body, status: int = 200, mime: str = None, indent: int = 2) -> Response:
+def make_api_response(body, status: int = 200, mime: str = None, indent: int = None) -> Response:
     """
     Make a valid http response.
 
@@ -39,11 +39,14 @@ def make_api_response(body, status: int = 200, mime: str = None, indent: int = 2
         body: http body content
         status: http status code
         mime: mime type
-        indent: display indent
+        indent: display indent, responses are only indented in debug mode by default
 
     Returns:
         Response
     """
+    if indent is None and current_app.debug:
+        indent = 2
+
     response = flask_response(dumps(body, default=default, indent=indent), status)
     response.mimetype = mime or DEFAULT_MIME_TYPE
     response.headers['X-API-Version'] = API_VERSION
@@ -161,6 +164,20 @@ def export(self, text: str = 'json') -> dict:
         }
 
 
+    def make_conditional(self, response: Response) -> Response:
+        """
+        Adds an ETag to the response which is built from the body without the response time, so the ETag
+        only changes with the content. Requests with the current ETag get a `304 Not Modified` response.
+
+        Args:
+            response: The complete response
+
+        Returns:
+            The response with the ETag or a 304 response
+        """
+        return make_conditional(response, etag=body_etag(response.get_data().replace(self.time.encode(), b'')))
+
+
 class ErrorBody:
     """Used to return errors to frontend"""
     def __init__(self, status: int, error: str):
@@ -207,7 +224,7 @@ def make_response(self, *args, **kwargs) -> Response:
             Instance of Response with a HTTP 200 status code.
         """
         if self.body:
-            response = make_api_response(self.export(*args, **kwargs))
+            response = self.make_conditional(make_api_response(self.export(*args, **kwargs)))
         else:
             response = make_api_response(None)
         return response
@@ -225,10 +242,10 @@ class GetMultiResponse(BaseAPIResponse):
     """
     API Response for get calls with a collection of resources.
     """
-    __slots__ = 'results', 'count', 'total', 'parameters', 'pager', 'pagination'
+    __slots__ = 'results', 'count', 'total', 'total_exact', 'parameters', 'pager', 'pagination'
 
     def __init__(self, results: List[dict], total: int, params: CollectionParameters, url: str = None,
-                 model: Model = None, body: bool = None):
+                 model: Model = None, body: bool = None, total_exact: bool = True):
         """
         Constructor of GetMultiResponse.
 
@@ -239,6 +256,7 @@ def __init__(self, results: List[dict], total: int, params: CollectionParameters
             url: Requested url.
             model: Data-Model of the results.
             body: If http response should not have a body.
+            total_exact: False if the total is estimated or was taken from the count cache.
         """
         self.parameters = params
         if self.parameters.projection:
@@ -248,6 +266,7 @@ def __init__(self, results: List[dict], total: int, params: CollectionParameters
             self.results = results
         self.count: int = len(self.results)
         self.total: int = total
+        self.total_exact: bool = total_exact
 
         if params.limit == 0:
             total_pages = 1
@@ -271,10 +290,11 @@ def make_response(self, *args, **kwargs) -> Response:
             Instance of Response.
         """
         if self.body:
-            response = make_api_response(self.export(*args, **kwargs))
+            response = self.make_conditional(make_api_response(self.export(*args, **kwargs)))
         else:
             response = make_api_response(None)
         response.headers['X-Total-Count'] = self.total
+        response.headers['X-Total-Exact'] = str(self.total_exact).lower()
         return response
 
 
@@ -301,6 +321,7 @@ def export(self, text: str = 'json', pagination: bool = True) -> dict:
             'results': self.results,
             'count': self.count,
             'total': self.total,
+            'total_exact': self.total_exact,
             **extra
         }, **super().export()}
 
@@ -519,7 +540,7 @@ def make_response(self, *args, **kwargs) -> Response:
             Instance of Response with a HTTP 200 status code.
         """
         if self.body:
-            response = make_api_response(self.export(*args, **kwargs))
+            response = self.make_conditional(make_api_response(self.export(*args, **kwargs)))
         else:
             response = make_api_response(None)
         response.headers['X-Total-Count'] = len(self.results)
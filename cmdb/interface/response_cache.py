@@ -0,0 +1,498 @@
+# DATAGERRY - OpenSource Enterprise CMDB
+# Copyright (C) 2024 becon GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+Cache for the responses of read-heavy routes which rarely change (types, categories, section templates, ...)
+
+A cached route declares the collections its response is built from. The responses are keyed by the method, the
+path, the query parameters and the group of the request user and are stored together with the versions of these
+collections. Every invalidation of the `CountCache` (all manager writes and the `cmdb.core.*` events) increases the
+version of the collection, so a response is only returned while all of its collections are unchanged.
+
+Two backends are available:
+    - memory:  LRU cache inside the worker process, writes of other workers are only seen after the ttl expired
+    - mongodb: Responses and versions are stored in the database and shared by all workers
+
+The cache is configured in the optional `[ResponseCache]` section of the configuration:
+    enabled = True       (default: True for the mongodb backend or a single web worker, otherwise False)
+    backend = memory     (memory or mongodb)
+    ttl = 60             (seconds after which a cached response expires)
+    max_entries = 1024   (maximum number of responses of the memory backend)
+"""
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from functools import wraps
+from typing import Optional
+
+from flask import request, current_app
+from werkzeug.wrappers import Response
+
+from cmdb.errors.system_config import ConfigFileError
+from cmdb.interface.gunicorn import HTTPServer
+from cmdb.manager.count_strategy import count_cache
+from cmdb.utils.cast import auto_cast
+from cmdb.utils.system_config import SystemConfigReader
+# -------------------------------------------------------------------------------------------------------------------- #
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_SETTINGS = {
+    'enabled': True,
+    'backend': 'memory',
+    'ttl': 60,
+    'max_entries': 1024,
+}
+
+# Version of all collections, increased if the whole cache is invalidated
+ALL_COLLECTIONS = '*'
+
+
+def get_response_cache_settings() -> dict:
+    """
+    Returns the settings of the `[ResponseCache]` section, missing values are taken from the defaults.
+    The memory backend is only enabled by default if the web server runs a single worker, because the
+    other workers would serve outdated responses after a write until the ttl expired
+
+    Returns:
+        dict: `enabled`, `backend`, `ttl` and `max_entries`
+    """
+    settings = dict(DEFAULT_SETTINGS)
+    configured = {}
+
+    try:
+        configured = {key: auto_cast(value) for key, value in
+                      SystemConfigReader().get_all_values_from_section('ResponseCache').items()
+                      if key in DEFAULT_SETTINGS}
+    except ConfigFileError:
+        pass
+
+    settings.update(configured)
+
+    if 'enabled' not in configured and settings['backend'] != MongoCacheBackend.NAME \
+        and HTTPServer.configured_workers() > 1:
+        LOGGER.info("Response cache disabled, the memory backend is not shared by several web workers")
+        settings['enabled'] = False
+
+    return settings
+
+# -------------------------------------------------------------------------------------------------------------------- #
+#                                                   BACKENDS - CLASSES                                                 #
+# -------------------------------------------------------------------------------------------------------------------- #
+
+class MemoryCacheBackend:
+    """Thread safe LRU storage of the responses inside the worker process"""
+
+    NAME = 'memory'
+
+    def __init__(self, max_entries: int = 1024):
+        """
+        Args:
+            max_entries (int): Maximum number of stored responses
+        """
+        self.max_entries = max_entries
+        self.__versions: dict[str, int] = {}
+        self.__entries: OrderedDict = OrderedDict()
+        self.__lock = threading.Lock()
+
+
+    def __len__(self):
+        return len(self.__entries)
+
+
+    def versions(self, collections: tuple) -> dict:
+        """
+        Returns the current versions of the collections
+
+        Args:
+            collections (tuple): Names of the collections
+
+        Returns:
+            dict: Version of every collection and of `ALL_COLLECTIONS`
+        """
+        with self.__lock:
+            return {name: self.__versions.get(name, 0) for name in (ALL_COLLECTIONS, ) + collections}
+
+
+    def get(self, key: str, versions: dict) -> Optional[dict]:
+        """
+        Returns a stored response if it was built with the passed versions and is not expired
+
+        Args:
+            key (str): Key of the response
+            versions (dict): Current versions of the collections of the response
+
+        Returns:
+            Optional[dict]: The stored response or None
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+
+            if entry is None:
+                return None
+
+            if entry[0] != versions or entry[1] < time.monotonic():
+                del self.__entries[key]
+                return None
+
+            self.__entries.move_to_end(key)
+
+            return entry[2]
+
+
+    def set(self, key: str, response: dict, versions: dict, ttl: int) -> None:
+        """
+        Stores a response
+
+        Args:
+            key (str): Key of the response
+            response (dict): Status, headers and body of the response
+            versions (dict): Versions of the collections before the response was built
+            ttl (int): Seconds after which the response expires
+        """
+        with self.__lock:
+            self.__entries[key] = (versions, time.monotonic() + ttl, response)
+            self.__entries.move_to_end(key)
+
+            while len(self.__entries) > self.max_entries:
+                self.__entries.popitem(last=False)
+
+
+    def invalidate(self, collection: str = None) -> None:
+        """
+        Increases the version of a collection, the outdated responses are removed on their next request
+
+        Args:
+            collection (str, optional): Name of the collection, all responses are invalidated if not set
+        """
+        with self.__lock:
+            name = collection or ALL_COLLECTIONS
+            self.__versions[name] = self.__versions.get(name, 0) + 1
+
+            if collection is None:
+                self.__entries.clear()
+
+
+class MongoCacheBackend:
+    """Storage of the responses in the database which is shared by all worker processes"""
+
+    NAME = 'mongodb'
+    COLLECTION = 'cache.responses'
+    VERSIONS_COLLECTION = 'cache.versions'
+
+    def __init__(self, database_manager):
+        """
+        Args:
+            database_manager: Database manager of the application
+        """
+        self.database_manager = database_manager
+        self.__indexes_created = False
+
+
+    def __len__(self):
+        return self.database_manager.get_collection(self.COLLECTION).estimated_document_count()
+
+
+    def versions(self, collections: tuple) -> dict:
+        """
+        Returns the current versions of the collections
+
+        Args:
+            collections (tuple): Names of the collections
+
+        Returns:
+            dict: Version of every collection and of `ALL_COLLECTIONS`
+        """
+        names = (ALL_COLLECTIONS, ) + collections
+        stored = {document['_id']: document['version'] for document in
+                  self.database_manager.get_collection(self.VERSIONS_COLLECTION).find({'_id': {'$in': list(names)}})}
+
+        return {name: stored.get(name, 0) for name in names}
+
+
+    def get(self, key: str, versions: dict) -> Optional[dict]:
+        """
+        Returns a stored response if it was built with the passed versions and is not expired
+
+        Args:
+            key (str): Key of the response
+            versions (dict): Current versions of the collections of the response
+
+        Returns:
+            Optional[dict]: The stored response or None
+        """
+        entry = self.database_manager.get_collection(self.COLLECTION).find_one({'_id': key})
+
+        if entry is None or entry['versions'] != self.__encode(versions):
+            return None
+
+        if entry['expires'].replace(tzinfo=timezone.utc) < datetime.now(timezone.utc):
+            return None
+
+        return entry['response']
+
+
+    def set(self, key: str, response: dict, versions: dict, ttl: int) -> None:
+        """
+        Stores a response, expired responses are removed by a ttl index
+
+        Args:
+            key (str): Key of the response
+            response (dict): Status, headers and body of the response
+            versions (dict): Versions of the collections before the response was built
+            ttl (int): Seconds after which the response expires
+        """
+        collection = self.database_manager.get_collection(self.COLLECTION)
+
+        if not self.__indexes_created:
+            collection.create_index('expires', expireAfterSeconds=0)
+            self.__indexes_created = True
+
+        collection.replace_one({'_id': key}, {
+            'response': response,
+            'versions': self.__encode(versions),
+            'expires': datetime.now(timezone.utc) + timedelta(seconds=ttl)
+        }, upsert=True)
+
+
+    def invalidate(self, collection: str = None) -> None:
+        """
+        Increases the version of a collection for all worker processes
+
+        Args:
+            collection (str, optional): Name of the collection, all responses are invalidated if not set
+        """
+        self.database_manager.get_collection(self.VERSIONS_COLLECTION).update_one(
+            {'_id': collection or ALL_COLLECTIONS}, {'$inc': {'version': 1}}, upsert=True)
+
+
+    @staticmethod
+    def __encode(versions: dict) -> list:
+        """Stores the versions as pairs, the names of the collections contain dots"""
+        return [[name, version] for name, version in sorted(versions.items())]
+
+# -------------------------------------------------------------------------------------------------------------------- #
+#                                                ResponseCache - CLASS                                                 #
+# -------------------------------------------------------------------------------------------------------------------- #
+
+class ResponseCache:
+    """Caches the responses of routes until one of their collections is changed"""
+
+    def __init__(self, backend=None, ttl: int = 60, enabled: bool = True):
+        """
+        Args:
+            backend: Storage of the responses, an in-process `MemoryCacheBackend` if not set
+            ttl (int): Seconds after which a cached response expires
+            enabled (bool): If False all requests are passed to the routes
+        """
+        self.backend = backend or MemoryCacheBackend()
+        self.ttl = ttl
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.__collections: set[str] = set()
+        self.__lock = threading.Lock()
+
+
+    def configure(self, database_manager=None, enabled: bool = True, backend: str = 'memory', ttl: int = 60,
+                  max_entries: int = 1024) -> None:
+        """
+        Applies the settings of the `[ResponseCache]` section
+
+        Args:
+            database_manager: Database manager of the application, required by the mongodb backend
+            enabled (bool): If False all requests are passed to the routes
+            backend (str): `memory` or `mongodb`
+            ttl (int): Seconds after which a cached response expires
+            max_entries (int): Maximum number of responses of the memory backend
+        """
+        if backend == MongoCacheBackend.NAME and database_manager is not None:
+            self.backend = MongoCacheBackend(database_manager)
+        else:
+            if backend != MemoryCacheBackend.NAME:
+                LOGGER.warning("Unknown response cache backend '%s', using the memory backend", backend)
+            self.backend = MemoryCacheBackend(max_entries)
+
+        self.ttl = ttl
+        self.enabled = enabled
+
+
+    def cached(self, *collections: str, ttl: int = None):
+        """
+        Decorator for `GET`/`HEAD` routes whose response only depends on the passed collections
+
+        Args:
+            *collections (str): Names of the collections the response is built from
+            ttl (int, optional): Seconds after which a cached response expires, the default ttl if not set
+        """
+        self.__collections.update(collections)
+
+        def _cached(f):
+            @wraps(f)
+            def _decorate(*args, **kwargs):
+                if not self.enabled or request.method not in ('GET', 'HEAD'):
+                    return f(*args, **kwargs)
+
+                try:
+                    key = self.make_key()
+                    versions = self.backend.versions(collections)
+                    stored = self.backend.get(key, versions)
+                except Exception as err:
+                    LOGGER.warning("Response cache lookup failed: %s", err)
+                    return f(*args, **kwargs)
+
+                if stored is not None:
+                    self.__count(hit=True)
+                    return self.__restore(stored)
+
+                self.__count(hit=False)
+                response = current_app.make_response(f(*args, **kwargs))
+
+                if response.status_code == 200 and not response.is_streamed:
+                    try:
+                        self.backend.set(key, self.__dump(response), versions, ttl or self.ttl)
+                    except Exception as err:
+                        LOGGER.warning("Response could not be cached: %s", err)
+
+                response.headers['X-Cache'] = 'MISS'
+
+                return response
+
+            return _decorate
+
+        return _cached
+
+
+    def invalidate(self, collection: str = None) -> None:
+        """
+        Invalidates the cached responses which were built from a collection
+
+        Args:
+            collection (str, optional): Name of the collection, all responses are invalidated if not set
+        """
+        # writes to collections without cached responses (e.g. logs) do not reach the backend
+        if collection is not None and collection not in self.__collections:
+            return
+
+        with self.__lock:
+            self.invalidations += 1
+
+        try:
+            self.backend.invalidate(collection)
+        except Exception as err:
+            LOGGER.error("Response cache could not be invalidated: %s", err)
+
+
+    def statistics(self) -> dict:
+        """
+        Returns the metrics of the cache in this worker process
+
+        Returns:
+            dict: Backend, number of entries, hits, misses, hit rate and invalidations
+        """
+        try:
+            entries = len(self.backend)
+        except Exception:
+            entries = None
+
+        requests = self.hits + self.misses
+
+        return {
+            'enabled': self.enabled,
+            'backend': self.backend.NAME,
+            'ttl': self.ttl,
+            'entries': entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / requests, 4) if requests else 0.0,
+            'invalidations': self.invalidations,
+        }
+
+
+    @staticmethod
+    def make_key() -> str:
+        """
+        Generates the key of the current request from the method, path, query parameters and user group
+
+        Returns:
+            str: Hash of the request
+        """
+        parts = (request.method, request.path, sorted(request.args.items(multi=True)), request_group_id())
+
+        return hashlib.blake2b(repr(parts).encode('utf-8'), digest_size=16).hexdigest()
+
+# ------------------------------------------------- HELPER FUNCTIONS ------------------------------------------------- #
+
+    def __count(self, hit: bool) -> None:
+        """Counts a hit or a miss"""
+        with self.__lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+
+    @staticmethod
+    def __dump(response: Response) -> dict:
+        """Converts a response into a storable dict"""
+        return {
+            'status': response.status_code,
+            'headers': [[name, value] for name, value in response.headers.items()
+                        if name.lower() not in ('content-length', 'set-cookie')],
+            'body': response.get_data()
+        }
+
+
+    @staticmethod
+    def __restore(stored: dict) -> Response:
+        """Creates the response of a cache hit, conditional requests are answered with `304 Not Modified`"""
+        response = current_app.response_class(stored['body'], status=stored['status'],
+                                              headers=[tuple(header) for header in stored['headers']])
+        response.headers['X-Cache'] = 'HIT'
+
+        return response.make_conditional(request)
+
+
+def request_group_id() -> Optional[int]:
+    """
+    Returns the group of the request user
+
+    Returns:
+        Optional[int]: public_id of the group or None for requests without a valid token
+    """
+    from cmdb.interface.route_utils import parse_authorization_header
+    from cmdb.security.token.validator import TokenValidator
+    from cmdb.user_management.managers.user_manager import UserManager
+
+    if 'Authorization' not in request.headers:
+        return None
+
+    try:
+        token = parse_authorization_header(request.headers['Authorization'])
+        decrypted_token = TokenValidator(current_app.database_manager).decode_token(token)
+        user_id = decrypted_token['DATAGERRY']['value']['user']['public_id']
+
+        return UserManager(current_app.database_manager).get(user_id).group_id
+    except Exception:
+        return None
+
+
+response_cache = ResponseCache()
+
+count_cache.add_listener(response_cache.invalidate)
@@ -19,7 +19,11 @@
 from flask_cors import CORS
 
 from cmdb.interface.cmdb_app import BaseCmdbApp
+from cmdb.interface.compression import CompressionMiddleware, get_compression_settings
 from cmdb.interface.config import app_config
+from cmdb.interface.gunicorn import HTTPServer
+from cmdb.interface.response_cache import response_cache, get_response_cache_settings
+from cmdb.manager.tree_cache import tree_cache
 
 
 def create_rest_api(database_manager, event_queue):
@@ -28,7 +32,7 @@ def create_rest_api(database_manager, event_queue):
     app.url_map.strict_slashes = True
 
     # Import App Extensions
-    CORS(app, expose_headers=['X-API-Version', 'X-Total-Count'])
+    CORS(app, expose_headers=['X-API-Version', 'X-Total-Count', 'X-Total-Exact'])
 
     import cmdb
     if cmdb.__MODE__ == 'DEBUG':
@@ -44,11 +48,18 @@ def create_rest_api(database_manager, event_queue):
         config.APPLICATION_ROOT = '/rest/'
         app.config.from_object(config)
 
+    response_cache.configure(database_manager, **get_response_cache_settings())
+    tree_cache.configure(HTTPServer.configured_workers())
+
     with app.app_context():
         register_converters(app)
         register_error_pages(app)
         register_blueprints(app)
 
+    compression_settings = get_compression_settings()
+    if compression_settings['enabled']:
+        app.wsgi_app = CompressionMiddleware(app.wsgi_app, **compression_settings)
+
     return app
 
 
@@ -63,6 +74,7 @@ def register_blueprints(app):
     import cmdb
     from cmdb.interface.rest_api.auth_routes import auth_blueprint
     from cmdb.interface.rest_api.settings_routes.date_routes import date_blueprint
+    from cmdb.interface.rest_api.settings_routes.log_retention_routes import log_retention_blueprint
     from cmdb.interface.rest_api.framework_routes.objects_routes import objects_blueprint
     from cmdb.interface.rest_api.framework_routes.object_links_routes import links_blueprint
     from cmdb.interface.rest_api.framework_routes.types_routes import types_blueprint
@@ -90,6 +102,7 @@ def register_blueprints(app):
 
     app.register_blueprint(auth_blueprint, url_prefix='/auth')
     app.register_blueprint(date_blueprint, url_prefix='/date')
+    app.register_blueprint(log_retention_blueprint, url_prefix='/log_retention')
     app.register_blueprint(objects_blueprint, url_prefix='/objects')
     app.register_blueprint(links_blueprint, url_prefix='/objects/links')
     app.register_blueprint(types_blueprint, url_prefix='/types')
@@ -22,6 +22,7 @@
 from flask import current_app, request
 
 from cmdb.framework.models.category import CategoryModel, CategoryTree
+from cmdb.framework.models.type import TypeModel
 from cmdb.errors.manager import ManagerGetError, \
                                 ManagerInsertError, \
                                 ManagerDeleteError, \
@@ -40,6 +41,7 @@
                                     UpdateSingleResponse, \
                                     ErrorBody
 from cmdb.interface.blueprint import APIBlueprint
+from cmdb.interface.response_cache import response_cache
 # -------------------------------------------------------------------------------------------------------------------- #
 
 LOGGER = logging.getLogger(__name__)
@@ -91,6 +93,7 @@ def insert_category(data: dict):
 
 @categories_blueprint.route('/', methods=['GET', 'HEAD'])
 @categories_blueprint.protect(auth=True, right='base.framework.category.view')
+@response_cache.cached(CategoryModel.COLLECTION, TypeModel.COLLECTION)
 @categories_blueprint.parse_collection_parameters(view='list')
 def get_categories(params: CollectionParameters):
     """
@@ -112,8 +115,8 @@ def get_categories(params: CollectionParameters):
 
     try:
         if params.optional['view'] == 'tree':
-            tree: CategoryTree = categories_manager.tree
-            api_response = GetMultiResponse(CategoryTree.to_json(tree),
+            tree: list[dict] = categories_manager.get_tree_json()
+            api_response = GetMultiResponse(tree,
                                             len(tree),
                                             params,
                                             request.url,
@@ -134,7 +137,8 @@ def get_categories(params: CollectionParameters):
                                         params,
                                         request.url,
                                         CategoryModel.MODEL,
-                                        body)
+                                        body,
+                                        total_exact=iteration_result.total_exact)
     except ManagerIterationError as err:
         LOGGER.debug("ManagerIterationError: %s", err)
         return ErrorBody(400, "Could not retrieve categories from database!").response()
@@ -144,6 +148,7 @@ def get_categories(params: CollectionParameters):
 
 @categories_blueprint.route('/<int:public_id>', methods=['GET', 'HEAD'])
 @categories_blueprint.protect(auth=True, right='base.framework.category.view')
+@response_cache.cached(CategoryModel.COLLECTION)
 def get_category(public_id: int):
     """
     HTTP `GET`/`HEAD` route to retrieve a single category
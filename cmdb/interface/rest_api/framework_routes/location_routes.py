@@ -31,7 +31,6 @@
 from cmdb.interface.response import GetMultiResponse, UpdateSingleResponse, ErrorBody
 from cmdb.interface.route_utils import make_response, insert_request_user
 from cmdb.interface.blueprint import APIBlueprint
-from cmdb.framework.models.location_node import LocationNode
 
 from cmdb.errors.manager import ManagerInsertError,\
                                 ManagerIterationError,\
@@ -128,7 +127,8 @@ def get_all_locations(params: CollectionParameters):
                                         params,
                                         request.url,
                                         CmdbLocation.MODEL,
-                                        request.method == 'HEAD')
+                                        request.method == 'HEAD',
+                                        total_exact=iteration_result.total_exact)
 
     except ManagerIterationError as err:
         LOGGER.debug("ManagerIterationError: %s", err)
@@ -154,36 +154,15 @@ def get_locations_tree(params: CollectionParameters):
     """
     try:
         builder_params = BuilderParameters(**CollectionParameters.get_builder_params(params))
-        iteration_result: IterationResult[CmdbLocation] = locations_manager.iterate(builder_params)
-
-        location_list: list[dict] = [location_.__dict__ for location_ in iteration_result.results]
-        # get all root locations
-        filtered_location_list = []
-        root_locations: list[LocationNode] = []
-
-        for location in location_list:
-            if location['parent'] == 1:
-                root_locations.append(LocationNode(location))
-            else:
-                filtered_location_list.append(location)
-
-        # get all children for each root location
-        for root_location in root_locations:
-            children = root_location.get_children(root_location.public_id, filtered_location_list)
-            root_location.children = children
-
-        # pack the root locations
-        packed_locations = []
-
-        for root_location in root_locations:
-            packed_locations.append(root_location.to_json(root_location))
+        packed_locations, total, total_exact = locations_manager.get_tree(builder_params)
 
         api_response = GetMultiResponse(packed_locations,
-                                        iteration_result.total,
+                                        total,
                                         params,
                                         request.url,
                                         CmdbLocation.MODEL,
-                                        request.method == 'HEAD')
+                                        request.method == 'HEAD',
+                                        total_exact=total_exact)
 
     except ManagerIterationError as err:
         LOGGER.debug("ManagerIterationError: %s", err)
@@ -317,7 +296,7 @@ def update_location_for_object(params: dict, request_user: UserModel):
                                                      else f"ObjectID: {location_update_params['object_id']}"
 
     try:
-        result = locations_manager.update({'object_id': object_id}, location_update_params)
+        result = locations_manager.update_location_for_object(object_id, location_update_params)
     except ManagerUpdateError as err:
         LOGGER.debug("ManagerUpdateError: %s", err)
         return ErrorBody(400, f"Could not update the location (E: {err})!").response()
@@ -31,7 +31,8 @@
 from cmdb.interface.response import DeleteSingleResponse,\
                                     InsertSingleResponse,\
                                     GetMultiResponse,\
-                                    ErrorBody
+                                    ErrorBody,\
+                                    make_api_response
 from cmdb.interface.blueprint import APIBlueprint
 from cmdb.errors.manager import ManagerGetError, ManagerDeleteError, ManagerInsertError, ManagerIterationError
 from cmdb.security.acl.errors import AccessDeniedError
@@ -81,6 +82,40 @@ def insert_link(request_user: UserModel):
 
     return api_response.make_response(prefix='objects/links')
 
+
+@links_blueprint.route('/bulk', methods=['POST'])
+@links_blueprint.protect(auth=True, right='base.framework.object.add')
+@insert_request_user
+def insert_links(request_user: UserModel):
+    """
+    Creates several object links with a single database call, existing links are skipped
+
+    Args:
+        request_user (UserModel): User requesting this operation
+    Returns:
+        Response: The public_ids of the created object links and the skipped links
+    """
+    data = request.json
+
+    if not isinstance(data, list):
+        return ErrorBody(400, "A list of ObjectLinks is required!").response()
+
+    try:
+        result_ids, skipped = object_links_manager.insert_object_links(data,
+                                                                       request_user,
+                                                                       AccessControlPermission.CREATE)
+    except ManagerInsertError as err:
+        LOGGER.debug("ManagerInsertError: %s", err)
+        return ErrorBody(400, "Could not create the ObjectLinks!").response()
+    except ManagerGetError as err:
+        LOGGER.debug("ManagerGetError: %s", err)
+        return ErrorBody(404, "Could not retrieve the objects of the ObjectLinks!").response()
+    except AccessDeniedError as err:
+        LOGGER.debug("AccessDeniedError: %s", err)
+        return ErrorBody(403, "No permission to create an ObjectLink!").response()
+
+    return make_api_response({'result_ids': result_ids, 'skipped': skipped}, 201)
+
 # ---------------------------------------------------- CRUD - READ --------------------------------------------------- #
 
 @links_blueprint.route('/', methods=['GET', 'HEAD'])
@@ -108,7 +143,8 @@ def get_links(params: CollectionParameters):
                                         params,
                                         request.url,
                                         ObjectLinkModel.MODEL,
-                                        request.method == 'HEAD')
+                                        request.method == 'HEAD',
+                                        total_exact=iteration_result.total_exact)
 
     except ManagerIterationError as err:
         return abort(400, err)
@@ -148,3 +184,36 @@ def delete_link(public_id: int, request_user: UserModel):
         return ErrorBody(403, "No permission to delete an ObjectLink!").response()
 
     return api_response.make_response()
+
+
+@links_blueprint.route('/objects/<string:public_ids>', methods=['DELETE'])
+@links_blueprint.protect(auth=True, right='base.framework.object.delete')
+@insert_request_user
+def delete_links_of_objects(public_ids: str, request_user: UserModel):
+    """
+    Deletes all object links touching one of the given objects
+
+    Args:
+        public_ids (str): Comma separated public_ids of the objects
+        request_user (UserModel): User requesting this operation
+    Returns:
+        Response: The number of deleted object links
+    """
+    try:
+        ids = [int(public_id) for public_id in public_ids.split(",")]
+    except (ValueError, TypeError):
+        return abort(400)
+
+    try:
+        deleted = object_links_manager.delete_links_of_objects(ids, request_user, AccessControlPermission.DELETE)
+    except ManagerGetError as err:
+        LOGGER.debug("ManagerGetError: %s", err)
+        return ErrorBody(404, "Could not retrieve the objects of the ObjectLinks!").response()
+    except ManagerDeleteError as err:
+        LOGGER.debug("ManagerDeleteError: %s", err)
+        return ErrorBody(400, "Could not delete the ObjectLinks!").response()
+    except AccessDeniedError as err:
+        LOGGER.debug("AccessDeniedError: %s", err)
+        return ErrorBody(403, "No permission to delete an ObjectLink!").response()
+
+    return make_api_response({'deleted': deleted})
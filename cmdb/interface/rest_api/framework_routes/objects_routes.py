@@ -17,28 +17,29 @@
 Definition of all routes for objects
 """
 import json
-import copy
 import logging
 from typing import List
 from datetime import datetime, timezone
 from bson import json_util
-from flask import abort, jsonify, request, current_app
+from flask import abort, request, current_app
 
+from cmdb.event_management.event import Event
 from cmdb.framework.managers.object_manager import ObjectManager
 from cmdb.framework.cmdb_object_manager import CmdbObjectManager
 from cmdb.framework.managers.type_manager import TypeManager
+from cmdb.framework.managers.object_bulk_update import ObjectBulkUpdate
+from cmdb.framework.managers.object_bulk_delete import ObjectBulkDelete
+from cmdb.framework.managers.type_migration_manager import TypeMigrationManager
 from cmdb.user_management import UserModel, UserManager
 from cmdb.manager.object_links_manager import ObjectLinksManager
 from cmdb.manager.locations_manager import LocationsManager
 from cmdb.manager.logs_manager import LogsManager
 
-from cmdb.manager.query_builder.builder_parameters import BuilderParameters
-from cmdb.database.utils import object_hook, default
 from cmdb.framework import CmdbObject, TypeModel
-from cmdb.framework.cmdb_errors import ObjectDeleteError, ObjectInsertError, ObjectManagerGetError, \
+from cmdb.framework.cmdb_errors import ObjectInsertError, ObjectManagerGetError, \
     ObjectManagerUpdateError
 from cmdb.framework.models.log import LogAction, CmdbObjectLog
-from cmdb.framework import ObjectLinkModel
+from cmdb.framework.object_states import object_state
 from cmdb.framework.cmdb_render import CmdbRender, RenderList, RenderError
 from cmdb.framework.results import IterationResult
 from cmdb.framework.utils import Model
@@ -47,15 +48,15 @@
     ResponseFailedMessage, ErrorBody
 from cmdb.interface.route_utils import make_response, insert_request_user
 from cmdb.interface.blueprint import APIBlueprint
+from cmdb.interface.response_cache import response_cache
 from cmdb.security.acl.errors import AccessDeniedError
 from cmdb.security.acl.permission import AccessControlPermission
 
 from cmdb.manager import ManagerIterationError, ManagerGetError, ManagerUpdateError
 from cmdb.utils.error import CMDBError
 
-from cmdb.errors.manager import ManagerInsertError
+from cmdb.errors.manager import ManagerInsertError, ManagerDeleteError
 
-from cmdb.framework import CmdbLocation
 # -------------------------------------------------------------------------------------------------------------------- #
 
 objects_blueprint = APIBlueprint('objects', __name__)
@@ -64,8 +65,9 @@
 
 with current_app.app_context():
     object_manager = CmdbObjectManager(current_app.database_manager, current_app.event_queue)
-    manager = ObjectManager(database_manager=current_app.database_manager)
+    manager = ObjectManager(database_manager=current_app.database_manager, event_queue=current_app.event_queue)
     type_manager = TypeManager(database_manager=current_app.database_manager)
+    type_migration_manager = TypeMigrationManager(database_manager=current_app.database_manager)
     user_manager = UserManager(current_app.database_manager)
     object_links_manager = ObjectLinksManager(current_app.database_manager, current_app.event_queue)
     locations_manager = LocationsManager(current_app.database_manager, current_app.event_queue)
@@ -102,24 +104,15 @@ def insert_object(request_user: UserModel):
         new_object_id = object_manager.insert_object(new_object_data,
                                                      user=request_user,
                                                      permission=AccessControlPermission.CREATE)
-        # get current object state
-        current_type_instance = object_manager.get_type(new_object_data['type_id'])
-        current_object = object_manager.get_object(new_object_id)
-
-        current_object_render_result = CmdbRender(object_instance=current_object,
-                                                  object_manager=object_manager,
-                                                  type_instance=current_type_instance,
-                                                  render_user=request_user).result()
-
-        # Generate new insert log
+        # Generate new insert log with a snapshot of the inserted data, the object is rendered when the log is read
         try:
             log_params = {
                 'object_id': new_object_id,
                 'user_id': request_user.get_public_id(),
                 'user_name': request_user.get_display_name(),
                 'comment': 'Object was created',
-                'render_state': json.dumps(current_object_render_result, default=default).encode('UTF-8'),
-                'version': current_object.version
+                'object_state': object_state(new_object_data),
+                'version': new_object_data['version']
             }
 
             logs_manager.insert_log(action=LogAction.CREATE, log_type=CmdbObjectLog.__name__, **log_params)
@@ -134,9 +127,6 @@ def insert_object(request_user: UserModel):
         return abort(404, err.message)
     except AccessDeniedError as err:
         return abort(403, err.message)
-    except RenderError as err:
-        LOGGER.error(err)
-        return abort(500)
 
     return make_response(new_object_id)
 
@@ -219,7 +209,8 @@ def get_objects(params: CollectionParameters, request_user: UserModel):
                                             params=params,
                                             url=request.url,
                                             model=CmdbObject.MODEL,
-                                            body=request.method == 'HEAD')
+                                            body=request.method == 'HEAD',
+                                            total_exact=iteration_result.total_exact)
         elif view == 'render':
             rendered_list = RenderList(object_list=iteration_result.results,
                                        request_user=request_user,
@@ -232,7 +223,8 @@ def get_objects(params: CollectionParameters, request_user: UserModel):
                                             params=params,
                                             url=request.url,
                                             model=Model('RenderResult'),
-                                            body=request.method == 'HEAD')
+                                            body=request.method == 'HEAD',
+                                            total_exact=iteration_result.total_exact)
         else:
             return abort(401, 'No possible view parameter')
 
@@ -263,6 +255,7 @@ def get_native_object(public_id: int, request_user: UserModel):
 
 @objects_blueprint.route('/group/<string:value>', methods=['GET'])
 @objects_blueprint.protect(auth=True, right='base.framework.object.view')
+@response_cache.cached(CmdbObject.COLLECTION, TypeModel.COLLECTION)
 @insert_request_user
 def group_objects_by_type_id(value, request_user: UserModel):
     """TODO: document"""
@@ -400,7 +393,8 @@ def get_object_references(public_id: int, params: CollectionParameters, request_
         if view == 'native':
             object_list: List[dict] = [object_.__dict__ for object_ in iteration_result.results]
             api_response = GetMultiResponse(object_list, total=iteration_result.total, params=params,
-                                            url=request.url, model=CmdbObject.MODEL, body=request.method == 'HEAD')
+                                            url=request.url, model=CmdbObject.MODEL, body=request.method == 'HEAD',
+                                            total_exact=iteration_result.total_exact)
         elif view == 'render':
             rendered_list = RenderList(object_list=iteration_result.results, request_user=request_user,
                                        database_manager=current_app.database_manager,
@@ -408,7 +402,8 @@ def get_object_references(public_id: int, params: CollectionParameters, request_
                 raw=True)
 
             api_response = GetMultiResponse(rendered_list, total=iteration_result.total, params=params,
-                                            url=request.url, model=Model('RenderResult'), body=request.method == 'HEAD')
+                                            url=request.url, model=Model('RenderResult'), body=request.method == 'HEAD',
+                                            total_exact=iteration_result.total_exact)
         else:
             return abort(401, 'No possible view parameter')
     except ManagerIterationError as err:
@@ -440,6 +435,7 @@ def get_unstructured_objects(public_id: int, request_user: UserModel):
     HTTP `GET`/`HEAD` route for a multi resources which are not formatted according the type structure.
     Args:
         public_id (int): Public ID of the type.
+        Query parameters `limit` and `skip` page the objects of a `GET` request, by default all are returned.
     Raises:
         ManagerGetError: When the selected type does not exists or the objects could not be loaded.
     Returns:
@@ -447,25 +443,28 @@ def get_unstructured_objects(public_id: int, request_user: UserModel):
     """
     try:
         type_instance: TypeModel = type_manager.get(public_id=public_id)
-        objects: List[CmdbObject] = manager.iterate({'type_id': public_id},
-                                                    limit=0,
-                                                    skip=0,
-                                                    sort='public_id',
-                                                    order=1,
-                                                    user=request_user).results
+
+        # HEAD requests only need the total, no object is read
+        if request.method == 'HEAD':
+            objects: List[CmdbObject] = []
+            total = manager.count_unstructured_objects(type_instance, request_user, AccessControlPermission.READ)
+        else:
+            unstructured: IterationResult[CmdbObject] = manager.get_unstructured_objects(
+                type_instance, request_user, AccessControlPermission.READ,
+                limit=request.args.get('limit', 0, type=int), skip=request.args.get('skip', 0, type=int))
+            objects = unstructured.results
+            total = unstructured.total
     except ManagerGetError as err:
         return abort(400, err)
+    except AccessDeniedError as err:
+        return abort(403, err)
 
-    type_fields = sorted([field.get('name') for field in type_instance.fields])
-    unstructured: List[dict] = []
-
-    for object_ in objects:
-        object_fields = [field.get('name') for field in object_.fields]
-        if sorted(object_fields) != type_fields:
-            unstructured.append(object_.__dict__)
+    api_response = GetListResponse([object_.__dict__ for object_ in objects], url=request.url,
+                                   model=CmdbObject.MODEL, body=request.method == 'HEAD')
+    response = api_response.make_response()
+    response.headers['X-Total-Count'] = total
 
-    api_response = GetListResponse(unstructured, url=request.url, model=CmdbObject.MODEL, body=request.method == 'HEAD')
-    return api_response.make_response()
+    return response
 
 # --------------------------------------------------- CRUD - UPDATE -------------------------------------------------- #
 
@@ -482,106 +481,16 @@ def update_object(public_id: int, data: dict, request_user: UserModel):
     else:
         object_ids = [public_id]
 
-    results: list[dict] = []
-    failed = []
-
-    for obj_id in object_ids:
-        # deep copy
-        active_state = request.get_json().get('active', None)
-        new_data = copy.deepcopy(data)
-        try:
-            current_object_instance = manager.get(obj_id, user=request_user, permission=AccessControlPermission.READ)
-            current_type_instance = type_manager.get(current_object_instance.get_type_id())
-            current_object_render_result = CmdbRender(object_instance=current_object_instance,
-                                                      object_manager=object_manager,
-                                                      type_instance=current_type_instance,
-                                                      render_user=request_user).result()
-            update_comment = ''
-            try:
-                # check for comment
-                new_data['public_id'] = obj_id
-                new_data['creation_time'] = current_object_instance.creation_time
-                new_data['author_id'] = current_object_instance.author_id
-                new_data['active'] = active_state if active_state in [True, False] else current_object_instance.active
-
-                if 'version' not in data:
-                    new_data['version'] = current_object_instance.version
-
-                old_fields = list(map(lambda x: {k: v for k, v in x.items() if k in ['name', 'value']},
-                                      current_object_render_result.fields))
-                new_fields = data['fields']
-                for item in new_fields:
-                    for old in old_fields:
-                        if item['name'] == old['name']:
-                            old['value'] = item['value']
-                new_data['fields'] = old_fields
-
-                update_comment = data['comment']
-                del new_data['comment']
-
-            except (KeyError, IndexError, ValueError):
-                update_comment = ''
-            except TypeError as err:
-                LOGGER.error('Error: %s Object: %s', str(err.args), json.dumps(new_data, default=default))
-                failed.append(ResponseFailedMessage(error_message=str(err.args), status=400,
-                                                    public_id=obj_id, obj=new_data).to_dict())
-                continue
-
-            # update edit time
-            new_data['last_edit_time'] = datetime.now(timezone.utc)
-            new_data['editor_id'] = request_user.public_id
-
-            update_object_instance = CmdbObject(**json.loads(json.dumps(new_data, default=json_util.default),
-                                                             object_hook=object_hook))
-
-            # calc version
-            changes = current_object_instance / update_object_instance
-
-            if len(changes['new']) == 1:
-                new_data['version'] = update_object_instance.update_version(update_object_instance.VERSIONING_PATCH)
-            elif len(changes['new']) == len(update_object_instance.fields):
-                new_data['version'] = update_object_instance.update_version(update_object_instance.VERSIONING_MAJOR)
-            elif len(changes['new']) > (len(update_object_instance.fields) / 2):
-                new_data['version'] = update_object_instance.update_version(update_object_instance.VERSIONING_MINOR)
-            else:
-                new_data['version'] = update_object_instance.update_version(update_object_instance.VERSIONING_PATCH)
-
-            manager.update(obj_id, new_data, request_user, AccessControlPermission.UPDATE)
-            results.append(new_data)
+    try:
+        results, failed = ObjectBulkUpdate(manager, logs_manager).execute(object_ids, data, request_user)
+    except AccessDeniedError as err:
+        LOGGER.error(err)
+        return abort(403)
+    except (ManagerGetError, ManagerUpdateError) as err:
+        LOGGER.error(err)
+        return abort(400, err)
 
-            # Generate log entry
-            try:
-                log_data = {
-                    'object_id': obj_id,
-                    'version': update_object_instance.get_version(),
-                    'user_id': request_user.get_public_id(),
-                    'user_name': request_user.get_display_name(),
-                    'comment': update_comment,
-                    'changes': changes,
-                    'render_state': json.dumps(update_object_instance, default=default).encode('UTF-8')
-                }
-                logs_manager.insert_log(action=LogAction.EDIT, log_type=CmdbObjectLog.__name__, **log_data)
-            except ManagerInsertError as err:
-                LOGGER.error("ManagerInsertError: %s", err)
-
-        except AccessDeniedError as err:
-            LOGGER.error(err)
-            return abort(403)
-        except ObjectManagerGetError as err:
-            LOGGER.error(err)
-            failed.append(ResponseFailedMessage(error_message=err.message, status=400,
-                                                public_id=obj_id, obj=new_data).to_dict())
-            continue
-        except (ManagerGetError, ObjectManagerUpdateError) as err:
-            LOGGER.error(err)
-            failed.append(ResponseFailedMessage(error_message=err.message, status=404,
-                                                public_id=obj_id, obj=new_data).to_dict())
-            continue
-        except (CMDBError, RenderError) as error:
-            LOGGER.warning(error)
-            failed.append(ResponseFailedMessage(error_message=str(error.__repr__), status=500,
-                                                public_id=obj_id, obj=new_data).to_dict())
-            continue
+    failed = [ResponseFailedMessage(**failure).to_dict() for failure in failed]
 
     api_response = UpdateMultiResponse(results=results, failed=failed, url=request.url, model=CmdbObject.MODEL)
     return api_response.make_response()
@@ -613,20 +522,6 @@ def update_object_state(public_id: int, request_user: UserModel):
         LOGGER.error(err)
         return abort(500, err.message)
 
-        # get current object state
-    try:
-        current_type_instance = type_manager.get(found_object.get_type_id())
-        current_object_render_result = CmdbRender(object_instance=found_object,
-                                                  object_manager=object_manager,
-                                                  type_instance=current_type_instance,
-                                                  render_user=request_user).result()
-    except ObjectManagerGetError as err:
-        LOGGER.error(err)
-        return abort(404)
-    except RenderError as err:
-        LOGGER.error(err)
-        return abort(500)
-
     try:
         # generate log
         change = {
@@ -638,7 +533,7 @@ def update_object_state(public_id: int, request_user: UserModel):
             'version': found_object.version,
             'user_id': request_user.get_public_id(),
             'user_name': request_user.get_display_name(),
-            'render_state': json.dumps(current_object_render_result, default=default).encode('UTF-8'),
+            'object_state': object_state(found_object),
             'comment': 'Active status has changed',
             'changes': change,
         }
@@ -668,46 +563,11 @@ def update_unstructured_objects(public_id: int, request_user: UserModel):
     try:
         update_type_instance = type_manager.get(public_id)
 
-        type_fields = update_type_instance.fields
-
-        objects_by_type = manager.iterate({'type_id': public_id},
-                                          limit=0,
-                                          skip=0,
-                                          sort='public_id',
-                                          order=1,
-                                          user=request_user).results
-
-        for obj in objects_by_type:
-            incorrect = []
-            correct = []
-            obj_fields = obj.get_all_fields()
-            for t_field in type_fields:
-                name = t_field["name"]
-                for field in obj_fields:
-                    if name == field["name"]:
-                        correct.append(field["name"])
-                    else:
-                        incorrect.append(field["name"])
-            removed_type_fields = [item for item in incorrect if not item in correct]
-            for field in removed_type_fields:
-                manager.update_many(query={'public_id': obj.public_id},
-                                    update={'$pull': {'fields': {"name": field}}})
-
-        objects_by_type = manager.iterate({'type_id': public_id}, limit=0, skip=0,
-                                          sort='public_id', order=1, user=request_user).results
-
-        for obj in objects_by_type:
-            for t_field in type_fields:
-                name = t_field["name"]
-                value = None
-                if [item for item in obj.get_all_fields() if item["name"] == name]:
-                    continue
-                if "value" in t_field:
-                    value = t_field["value"]
-
-                manager.update_many(query={'public_id': obj.public_id},
-                                    update={'fields': {"name": name, "value": value}},
-                                    add_to_set=True)
+        # large types are restructured in the background, see GET /types/<public_id>/migrations
+        if type_migration_manager.restructure(update_type_instance):
+            current_app.event_queue.put(Event("cmdb.type_migration.run"))
+    except ManagerGetError as err:
+        return abort(404, err)
     except ManagerUpdateError as err:
         return abort(400, err)
 
@@ -730,68 +590,24 @@ def delete_object(public_id: int, request_user: UserModel):
     Returns:
         Response: Acknowledgment of database 
     """
-    current_location = None
+    bulk_delete = ObjectBulkDelete(manager, logs_manager, locations_manager, object_links_manager)
 
     try:
-        current_object_instance = object_manager.get_object(public_id)
-
-        # Remove object links and references
-        if current_object_instance:
-            delete_object_links(public_id)
-            manager.delete_all_object_references(public_id)
-
-        current_type_instance = object_manager.get_type(current_object_instance.get_type_id())
-        current_object_render_result = CmdbRender(object_instance=current_object_instance,
-                                                  object_manager=object_manager,
-                                                  type_instance=current_type_instance,
-                                                  render_user=request_user).result()
-
         #an object can not be deleted if it has a location AND the location is a parent for other locations
-        try:
-            current_location = locations_manager.get_location_for_object(public_id)
-            child_location = locations_manager.get_one_by({'parent': current_location.public_id})
+        if bulk_delete.has_child_locations([public_id]):
+            return ErrorBody(405, "The location of this object has child locations!").response()
 
-            if child_location and len(child_location) > 0:
-                return ErrorBody(405, "The location of this object has child locations!").response()
-        except ManagerGetError:
-            pass
-
-    except ObjectManagerGetError as err:
-        LOGGER.error(err)
-        return abort(404)
-    except RenderError as err:
-        LOGGER.error(err)
-        return abort(500)
-
-    try:
-        if current_location:
-            locations_manager.delete({'public_id':current_location.public_id})
-
-        ack = object_manager.delete_object(public_id, request_user, AccessControlPermission.DELETE)
-    except ObjectManagerGetError as err:
-        return abort(400, err.message)
+        deleted_ids = bulk_delete.execute([public_id], request_user)
     except AccessDeniedError as err:
         return abort(403, err.message)
-    except ObjectDeleteError:
-        return abort(400)
-    except CMDBError:
-        return abort(500)
+    except (ManagerGetError, ManagerDeleteError, ManagerUpdateError) as err:
+        LOGGER.error(err)
+        return abort(400, err)
 
-    try:
-        # generate log
-        log_data = {
-            'object_id': public_id,
-            'version': current_object_render_result.object_information['version'],
-            'user_id': request_user.get_public_id(),
-            'user_name': request_user.get_display_name(),
-            'comment': 'Object was deleted',
-            'render_state': json.dumps(current_object_render_result, default=default).encode('UTF-8')
-        }
-        logs_manager.insert_log(action=LogAction.DELETE, log_type=CmdbObjectLog.__name__, **log_data)
-    except ManagerInsertError as err:
-        LOGGER.error("ManagerInsertError: %s", err)
+    if not deleted_ids:
+        return abort(404)
 
-    return make_response(ack)
+    return make_response(True)
 
 
 @objects_blueprint.route('/<int:public_id>/locations', methods=['DELETE'])
@@ -803,31 +619,16 @@ def delete_object_with_child_locations(public_id: int, request_user: UserModel):
         # check if object exists
         current_object_instance = object_manager.get_object(public_id)
 
-        # Remove object links and references
-        if current_object_instance:
-            delete_object_links(public_id)
-            manager.delete_all_object_references(public_id)
-
         # check if location for this object exists
         current_location = locations_manager.get_location_for_object(public_id)
 
         if current_object_instance and current_location:
-            # get all child locations for this location
-            build_params = BuilderParameters([{"$match":{"public_id":{"$gt":1}}}])
-
-            iteration_result: IterationResult[CmdbLocation] = locations_manager.iterate(build_params)
-
-            all_locations: List[dict] = [location_.__dict__ for location_ in iteration_result.results]
-            all_children = locations_manager.get_all_children(current_location.public_id, all_locations)
-
             # delete all child locations
-            for child in all_children:
-                locations_manager.delete({'public_id':child['public_id']})
-
-            # delete the current object and its location
-            locations_manager.delete({'public_id':current_location.public_id})
+            locations_manager.delete_descendants(current_location.public_id)
 
-            deleted = object_manager.delete_object(public_id, request_user, permission=AccessControlPermission.DELETE)
+            # delete the current object with its location, links and references
+            deleted = bool(ObjectBulkDelete(manager, logs_manager, locations_manager,
+                                            object_links_manager).execute([public_id], request_user))
 
         else:
             # something went wrong, either object or location don't exist
@@ -836,9 +637,8 @@ def delete_object_with_child_locations(public_id: int, request_user: UserModel):
     except ObjectManagerGetError as err:
         LOGGER.error(err)
         return abort(404)
-    except RenderError as err:
-        LOGGER.error(err)
-        return abort(500)
+    except AccessDeniedError as err:
+        return abort(403, err.message)
 
     return make_response(deleted)
 
@@ -862,37 +662,18 @@ def delete_object_with_child_objects(public_id: int, request_user: UserModel):
         # check if object exists
         current_object_instance = object_manager.get_object(public_id)
 
-        # Remove object links and references
-        if current_object_instance:
-            delete_object_links(public_id)
-            manager.delete_all_object_references(public_id)
-
         # check if location for this object exists
         current_location = locations_manager.get_location_for_object(public_id)
 
         if current_object_instance and current_location:
             # get all child locations for this location
-            builder_params = BuilderParameters([{"$match":{"public_id":{"$gt":1}}}])
-
-            iteration_result: IterationResult[CmdbLocation] = locations_manager.iterate(builder_params)
-
-            all_locations: List[dict] = [location_.__dict__ for location_ in iteration_result.results]
-            all_children_locations = locations_manager.get_all_children(current_location.public_id, all_locations)
-
-            children_object_ids = []
+            children_object_ids = [child.object_id for child in
+                                   locations_manager.get_descendants(current_location.public_id)]
 
-            # delete all child locations and extract their corresponding object_ids
-            for child in all_children_locations:
-                children_object_ids.append(child['object_id'])
-                locations_manager.delete({'public_id':child['public_id']})
-
-            # # delete the objects of child locations
-            for child_object_id in children_object_ids:
-                object_manager.delete_object(child_object_id, request_user, AccessControlPermission.DELETE)
-
-            # # delete the current object and its location
-            locations_manager.delete({'public_id':current_location.public_id})
-            deleted = object_manager.delete_object(public_id, request_user, AccessControlPermission.DELETE)
+            # delete the current object and the objects of child locations with their locations, links and references
+            deleted = bool(ObjectBulkDelete(manager, logs_manager, locations_manager,
+                                            object_links_manager).execute([public_id] + children_object_ids,
+                                                                          request_user))
 
         else:
             # something went wrong, either object or location don't exist
@@ -901,9 +682,8 @@ def delete_object_with_child_objects(public_id: int, request_user: UserModel):
     except ObjectManagerGetError as err:
         LOGGER.error(err)
         return abort(404)
-    except RenderError as err:
-        LOGGER.error(err)
-        return abort(500)
+    except AccessDeniedError as err:
+        return abort(403, err.message)
 
     return make_response(deleted)
 
@@ -914,81 +694,24 @@ def delete_object_with_child_objects(public_id: int, request_user: UserModel):
 def delete_many_objects(public_ids, request_user: UserModel):
     """TODO: document"""
     try:
-        ids = []
-        operator_in = {'$in': []}
-        filter_public_ids = {'public_id': {}}
-        for v in public_ids.split(","):
-            try:
-                ids.append(int(v))
-            except (ValueError, TypeError):
-                return abort(400)
-        operator_in.update({'$in': ids})
-        filter_public_ids.update({'public_id': operator_in})
-
-        ack = []
-        objects = object_manager.get_objects_by(**filter_public_ids)
-
-        # At the current state it is not possible to bulk delete objects with locations
-        # check if any object has a location
-        for current_object_instance in objects:
-            try:
-                location_for_object = locations_manager.get_location_for_object(current_object_instance.public_id)
+        ids = [int(public_id) for public_id in public_ids.split(",")]
+    except (ValueError, TypeError):
+        return abort(400)
 
-                if location_for_object:
-                    return ErrorBody(405, """It is not possible to bulk delete objects
-                                             if any of them has a location""").response()
-            except ManagerGetError:
-                pass
+    bulk_delete = ObjectBulkDelete(manager, logs_manager, locations_manager, object_links_manager)
 
-        for current_object_instance in objects:
-            try:
-                # Remove object links and references
-                delete_object_links(current_object_instance.public_id)
-                manager.delete_all_object_references(current_object_instance.public_id)
-
-                current_type_instance = object_manager.get_type(current_object_instance.get_type_id())
-                current_object_render_result = CmdbRender(object_instance=current_object_instance,
-                                                          object_manager=object_manager,
-                                                          type_instance=current_type_instance,
-                                                          render_user=request_user).result()
-            except ObjectManagerGetError as err:
-                LOGGER.error(err)
-                return abort(404)
-            except RenderError as err:
-                LOGGER.error(err)
-                return abort(500)
+    try:
+        if bulk_delete.has_child_locations(ids):
+            return ErrorBody(405, "The location of at least one object has child locations!").response()
 
-            try:
-                ack.append(object_manager.delete_object(public_id=current_object_instance.get_public_id(),
-                                                        user=request_user,
-                                                        permission=AccessControlPermission.DELETE))
-            except ObjectDeleteError:
-                return abort(400)
-            except AccessDeniedError as err:
-                return abort(403, err.message)
-            except CMDBError:
-                return abort(500)
+        deleted_ids = bulk_delete.execute(ids, request_user)
+    except AccessDeniedError as err:
+        return abort(403, err.message)
+    except (ManagerGetError, ManagerDeleteError, ManagerUpdateError) as err:
+        LOGGER.error(err)
+        return abort(400, err)
 
-            try:
-                # generate log
-                log_data = {
-                    'object_id': current_object_instance.get_public_id(),
-                    'version': current_object_render_result.object_information['version'],
-                    'user_id': request_user.get_public_id(),
-                    'user_name': request_user.get_display_name(),
-                    'comment': 'Object was deleted',
-                    'render_state': json.dumps(current_object_render_result, default=default).encode('UTF-8')
-                }
-                logs_manager.insert_log(action=LogAction.DELETE, log_type=CmdbObjectLog.__name__, **log_data)
-            except ManagerInsertError as err:
-                LOGGER.error("ManagerInsertError: %s", err)
-
-        return make_response({'successfully': ack})
-
-    except ObjectDeleteError as error:
-        return jsonify(message='Delete Error', error=error.message)
-    except CMDBError:
-        return abort(500)
+    return make_response({'successfully': [True for _ in deleted_ids]})
 
 # -------------------------------------------------------------------------------------------------------------------- #
 #                                                   HELPER - METHODS                                                   #
@@ -1006,19 +729,3 @@ def _fetch_only_active_objs() -> bool:
 
     return False
 
-
-def delete_object_links(public_id: int) -> None:
-    """
-    Deletes all object links where this public_id is set
-
-    Args:
-        public_id (int): public_id of the object which is deleted
-    """
-    object_link_filter: dict = {'$or': [{'primary': public_id}, {'secondary': public_id}]}
-
-    builder_params = BuilderParameters(object_link_filter)
-
-    links: list[ObjectLinkModel] = object_links_manager.iterate(builder_params).results
-
-    for link in links:
-        object_links_manager.delete({'public_id':link.public_id})
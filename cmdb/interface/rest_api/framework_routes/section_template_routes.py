@@ -23,6 +23,7 @@
 
 from cmdb.interface.blueprint import APIBlueprint
 from cmdb.interface.route_utils import make_response
+from cmdb.interface.response_cache import response_cache
 
 from cmdb.manager.section_templates_manager import SectionTemplatesManager
 
@@ -80,6 +81,7 @@ def create_section_template(params: dict):
 
 @section_template_blueprint.route('/', methods=['GET', 'HEAD'])
 @section_template_blueprint.protect(auth=True, right='base.framework.sectionTemplate.view')
+@response_cache.cached(CmdbSectionTemplate.COLLECTION)
 @section_template_blueprint.parse_collection_parameters(view='native')
 def get_all_section_templates(params: CollectionParameters):
     """Returns all CmdbSectionTemplates based on the params
@@ -100,7 +102,8 @@ def get_all_section_templates(params: CollectionParameters):
                                         params,
                                         request.url,
                                         CmdbSectionTemplate.MODEL,
-                                        request.method == 'HEAD')
+                                        request.method == 'HEAD',
+                                        total_exact=iteration_result.total_exact)
     except ManagerIterationError as err:
         LOGGER.debug("ManagerIterationError: %s", err)
         return ErrorBody(400, "Could not retrieve SectionTemplates!").response()
@@ -111,6 +114,7 @@ def get_all_section_templates(params: CollectionParameters):
 
 @section_template_blueprint.route('/<int:public_id>', methods=['GET'])
 @section_template_blueprint.protect(auth=True, right='base.framework.sectionTemplate.view')
+@response_cache.cached(CmdbSectionTemplate.COLLECTION)
 def get_section_template(public_id: int):
     """
     Retrieves the CmdbSectionTemplate with the given public_id
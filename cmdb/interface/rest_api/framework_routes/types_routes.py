@@ -19,30 +19,32 @@
 
 from flask import abort, request, current_app
 
+from cmdb.event_management.event import Event
 from cmdb.framework.managers.type_manager import TypeManager
+from cmdb.framework.managers.type_migration_manager import TypeMigrationManager
 from cmdb.manager.locations_manager import LocationsManager
 from cmdb.framework.managers.object_manager import ObjectManager
 from cmdb.framework.cmdb_object_manager import CmdbObjectManager
 
 from cmdb.framework.models.type import TypeModel
+from cmdb.framework.models.type_migration import TypeMigrationModel
 from cmdb.interface.rest_api.framework_routes.type_parameters import TypeIterationParameters
 from cmdb.errors.manager import ManagerGetError, ManagerInsertError, ManagerUpdateError, ManagerDeleteError, \
     ManagerIterationError
 from cmdb.framework.results.iteration import IterationResult
 from cmdb.framework.utils import PublicID
 from cmdb.interface.blueprint import APIBlueprint
+from cmdb.interface.response_cache import response_cache
 from cmdb.interface.response import GetMultiResponse, GetSingleResponse, InsertSingleResponse, UpdateSingleResponse, \
     DeleteSingleResponse, make_api_response
 
-from cmdb.framework.cmdb_location import CmdbLocation
-from cmdb.framework.cmdb_object import CmdbObject
-
 # -------------------------------------------------------------------------------------------------------------------- #
 
 LOGGER = logging.getLogger(__name__)
 types_blueprint = APIBlueprint('types', __name__)
 
 type_manager = TypeManager(database_manager=current_app.database_manager)
+type_migration_manager = TypeMigrationManager(database_manager=current_app.database_manager)
 locations_manager = LocationsManager(current_app.database_manager, current_app.event_queue)
 object_manager = ObjectManager(current_app.database_manager)
 deprecated_object_manager = CmdbObjectManager(database_manager=current_app.database_manager)
@@ -50,6 +52,7 @@
 
 @types_blueprint.route('/', methods=['GET', 'HEAD'])
 @types_blueprint.protect(auth=True, right='base.framework.type.view')
+@response_cache.cached(TypeModel.COLLECTION)
 @types_blueprint.parse_parameters(TypeIterationParameters)
 def get_types(params: TypeIterationParameters):
     """
@@ -85,7 +88,8 @@ def get_types(params: TypeIterationParameters):
             filter=params.filter, limit=params.limit, skip=params.skip, sort=params.sort, order=params.order)
         types = [TypeModel.to_json(type) for type in iteration_result.results]
         api_response = GetMultiResponse(types, total=iteration_result.total, params=params,
-                                        url=request.url, model=TypeModel.MODEL, body=body)
+                                        url=request.url, model=TypeModel.MODEL, body=body,
+                                        total_exact=iteration_result.total_exact)
     except ManagerIterationError as err:
         return abort(400, err)
     except ManagerGetError as err:
@@ -95,6 +99,7 @@ def get_types(params: TypeIterationParameters):
 
 @types_blueprint.route('/<int:public_id>', methods=['GET', 'HEAD'])
 @types_blueprint.protect(auth=True, right='base.framework.type.view')
+@response_cache.cached(TypeModel.COLLECTION)
 def get_type(public_id: int):
     """
     HTTP `GET`/`HEAD` route for a single type resource.
@@ -187,25 +192,22 @@ def update_type(public_id: int, data: dict):
         return abort(400, err)
 
     # when types are updated, update all locations with relevant data from this type
-    updated_type = type_manager.get(public_id)
-    locations_with_type = locations_manager.get_locations_by(type_id=public_id)
-
-    loc_data = {
-        'type_label': updated_type.label,
-        'type_icon': updated_type.render_meta.icon,
-        'type_selectable': updated_type.selectable_as_parent
-    }
-
-    location: CmdbLocation
-    for location in locations_with_type:
-        locations_manager.update({'public_id':location.public_id}, loc_data)
+    try:
+        updated_type = type_manager.get(public_id)
 
-    # check and update all multi data sections for the type if required
-    updated_objects = type_manager.handle_mutli_data_sections(unchanged_type, data)
+        if locations_manager.get_type_data(updated_type) != locations_manager.get_type_data(unchanged_type):
+            locations_manager.update_type_data(updated_type)
+    except ManagerGetError as err:
+        return abort(404, err)
+    except ManagerUpdateError as err:
+        return abort(400, err)
 
-    an_object: CmdbObject
-    for an_object in updated_objects:
-        object_manager._update(object_manager.collection, {'public_id': an_object.public_id}, CmdbObject.to_json(an_object))
+    # migrate the multi data sections of the objects, large types are migrated in the background
+    try:
+        if type_manager.handle_mutli_data_sections(unchanged_type, data):
+            current_app.event_queue.put(Event("cmdb.type_migration.run"))
+    except ManagerUpdateError as err:
+        return abort(400, err)
 
     return api_response.make_response()
 
@@ -265,3 +267,21 @@ def count_objects(public_id: int):
         return abort(404, err)
 
     return make_api_response(objects_count)
+
+
+@types_blueprint.route('/<int:public_id>/migrations', methods=['GET'])
+@types_blueprint.protect(auth=True, right='base.framework.type.view')
+def get_type_migrations(public_id: int):
+    """
+    Return the background migrations of the objects of a type with their progress, the newest first
+
+    Args:
+        public_id (int): public_id of the type
+    """
+    try:
+        migrations = type_migration_manager.get_migrations(public_id)
+    except ManagerGetError as err:
+        return abort(404, err)
+
+    return make_api_response([{**TypeMigrationModel.to_json(migration), 'progress': migration.progress}
+                              for migration in migrations])
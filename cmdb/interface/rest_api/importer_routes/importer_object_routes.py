@@ -14,7 +14,6 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 """TODO: document"""
-import json
 import logging
 
 from flask import request, abort, current_app
@@ -22,14 +21,14 @@
 from werkzeug.utils import secure_filename
 
 from cmdb.framework.cmdb_object_manager import CmdbObjectManager
+from cmdb.framework.managers.object_manager import ObjectManager
 from cmdb.framework.managers.type_manager import TypeManager
 from cmdb.user_management import UserModel, UserManager
 from cmdb.manager.logs_manager import LogsManager
 
-from cmdb.database.utils import default
 from cmdb.framework.cmdb_errors import ObjectManagerGetError
 from cmdb.framework.models.log import LogAction, CmdbObjectLog
-from cmdb.framework.cmdb_render import RenderError, CmdbRender
+from cmdb.framework.object_states import object_state
 from cmdb.importer import load_parser_class, load_importer_class, __OBJECT_IMPORTER__, __OBJECT_PARSER__, \
     __OBJECT_IMPORTER_CONFIG__, load_importer_config_class, ParserLoadError, ImporterLoadError
 from cmdb.security.acl.errors import AccessDeniedError
@@ -44,7 +43,7 @@
 from cmdb.interface.rest_api.importer_routes.importer_route_utils import get_file_in_request, \
     get_element_from_data_request, generate_parsed_output, verify_import_access
 
-from cmdb.errors.manager import ManagerInsertError
+from cmdb.errors.manager import ManagerInsertError, ManagerGetError
 
 # -------------------------------------------------------------------------------------------------------------------- #
 
@@ -54,6 +53,7 @@
     user_manager = UserManager(current_app.database_manager)
     object_manager: CmdbObjectManager = CmdbObjectManager(current_app.database_manager, current_app.event_queue)
     logs_manager = LogsManager(current_app.database_manager, current_app.event_queue)
+    objects_manager = ObjectManager(current_app.database_manager)
 
 importer_object_blueprint = NestedBlueprint(importer_blueprint, url_prefix='/object')
 
@@ -207,37 +207,23 @@ def import_objects(request_user: UserModel):
     # close request file
     request_file.close()
 
-    # log all successful imports
-    for message in import_response.success_imports:
-        try:
-
-            # get object state of every imported object
-            current_type_instance = object_manager.get_type(importer_config_request.get('type_id'))
-            current_object = object_manager.get_object(message.public_id)
-
-            current_object_render_result = CmdbRender(object_instance=current_object,
-                                                      type_instance=current_type_instance,
-                                                      render_user=request_user,
-                                                      object_manager=object_manager).result()
-
-            # insert object create log
-            log_params = {
-                'object_id': message.public_id,
-                'user_id': request_user.get_public_id(),
-                'user_name': request_user.get_display_name(),
-                'comment': 'Object was imported',
-                'render_state': json.dumps(current_object_render_result, default=default).encode('UTF-8'),
-                'version': current_object.version
-            }
-            logs_manager.insert_log(action=LogAction.CREATE, log_type=CmdbObjectLog.__name__, **log_params)
-
-        except ObjectManagerGetError as err:
-            LOGGER.error(err)
-            return abort(404)
-        except RenderError as err:
-            LOGGER.error(err)
-            return abort(500)
-        except ManagerInsertError as err:
-            LOGGER.error("ManagerInsertError: %s", err)
+    # log all successful imports with a snapshot of each object, the objects are rendered when the logs are read
+    try:
+        imported_ids = [message.public_id for message in import_response.success_imports]
+        imported_objects = objects_manager.find({'public_id': {'$in': imported_ids}}).results if imported_ids else []
+
+        logs_manager.insert_logs(LogAction.CREATE, CmdbObjectLog.__name__, [{
+            'object_id': current_object.public_id,
+            'user_id': request_user.get_public_id(),
+            'user_name': request_user.get_display_name(),
+            'comment': 'Object was imported',
+            'object_state': object_state(current_object),
+            'version': current_object.version
+        } for current_object in imported_objects])
+    except ManagerGetError as err:
+        LOGGER.error(err)
+        return abort(404)
+    except ManagerInsertError as err:
+        LOGGER.error("ManagerInsertError: %s", err)
 
     return make_response(import_response)
@@ -14,15 +14,21 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 """Definition of all routes for Logs"""
+import json
 import logging
 
 from flask import current_app, request
 
 from cmdb.framework.managers.object_manager import ObjectManager
+from cmdb.framework.cmdb_object_manager import CmdbObjectManager
+from cmdb.framework.managers.type_manager import TypeManager
 from cmdb.manager.logs_manager import LogsManager
 
+from cmdb.database.utils import default
+from cmdb.framework import CmdbObject
+from cmdb.framework.cmdb_render import CmdbRender, RenderError
 from cmdb.framework.models.log import CmdbObjectLog, CmdbMetaLog, LogAction
-from cmdb.interface.route_utils import make_response
+from cmdb.interface.route_utils import make_response, insert_request_user
 from cmdb.interface.api_parameters import CollectionParameters
 from cmdb.interface.blueprint import APIBlueprint
 from cmdb.interface.response import GetMultiResponse, ErrorBody
@@ -30,6 +36,7 @@
 from cmdb.errors.manager import ManagerIterationError, ManagerGetError, ManagerDeleteError
 
 from cmdb.manager.query_builder.builder_parameters import BuilderParameters
+from cmdb.user_management import UserModel
 # -------------------------------------------------------------------------------------------------------------------- #
 
 LOGGER = logging.getLogger(__name__)
@@ -38,22 +45,29 @@
 with current_app.app_context():
     logs_manager = LogsManager(current_app.database_manager, current_app.event_queue)
     object_manager = ObjectManager(current_app.database_manager, current_app.event_queue)
+    render_manager = CmdbObjectManager(current_app.database_manager)
+    type_manager = TypeManager(current_app.database_manager)
 
 # ---------------------------------------------------- CRUD - READ --------------------------------------------------- #
 
 @logs_blueprint.route('/<int:public_id>', methods=['GET'])
 @logs_blueprint.protect(auth=True, right='base.framework.log.view')
-def get_log(public_id: int):
+@insert_request_user
+def get_log(public_id: int, request_user: UserModel):
     """
-    Retrives a single log from the database
+    Retrives a single log from the database, the logged object state is rendered for the request
 
     Args:
         public_id (int): public_id of the requested log
+        request_user (UserModel): User requesting the log
     Returns:
         CmdbObjectLog: The log with the given public_id
     """
     try:
         requested_log: CmdbObjectLog = logs_manager.get_one(public_id)
+
+        if requested_log:
+            _add_render_states([requested_log], request_user)
     except ManagerGetError:
         return ErrorBody(404, "Could not retrieve the requested log from database!").response()
 
@@ -86,7 +100,8 @@ def get_logs_with_existing_objects(params: CollectionParameters):
                                         params,
                                         request.url,
                                         CmdbMetaLog.MODEL,
-                                        request.method == 'HEAD')
+                                        request.method == 'HEAD',
+                                        total_exact=object_logs.total_exact)
 
     except ManagerIterationError as err:
         LOGGER.debug("ManagerIterationError: %s", err)
@@ -121,7 +136,8 @@ def get_logs_with_deleted_objects(params: CollectionParameters):
                                         params,
                                         request.url,
                                         CmdbMetaLog.MODEL,
-                                        request.method == 'HEAD')
+                                        request.method == 'HEAD',
+                                        total_exact=object_logs.total_exact)
 
     except ManagerIterationError as err:
         LOGGER.debug("ManagerIterationError: %s", err)
@@ -157,7 +173,8 @@ def get_object_delete_logs(params: CollectionParameters):
                                         params,
                                         request.url,
                                         CmdbMetaLog.MODEL,
-                                        request.method == 'HEAD')
+                                        request.method == 'HEAD',
+                                        total_exact=object_logs.total_exact)
 
     except ManagerIterationError as err:
         LOGGER.debug("ManagerIterationError: %s", err)
@@ -195,7 +212,8 @@ def get_logs_by_object(object_id: int, params: CollectionParameters):
                                         params,
                                         request.url,
                                         CmdbMetaLog.MODEL,
-                                        request.method == 'HEAD')
+                                        request.method == 'HEAD',
+                                        total_exact=iteration_result.total_exact)
     except ManagerIterationError as err:
         LOGGER.debug("ManagerIterationError: %s", err)
         return ErrorBody(400, f"Could not retrieve logs for object with ID:{object_id}!").response()
@@ -205,12 +223,14 @@ def get_logs_by_object(object_id: int, params: CollectionParameters):
 
 @logs_blueprint.route('/<int:public_id>/corresponding', methods=['GET', 'HEAD'])
 @logs_blueprint.protect(auth=True, right='base.framework.log.view')
-def get_corresponding_object_logs(public_id: int):
+@insert_request_user
+def get_corresponding_object_logs(public_id: int, request_user: UserModel):
     """
     Get the corresponding log
 
     Args:
         public_id (int): public_id of log
+        request_user (UserModel): User requesting the logs
     Returns:
         dict: object log
     """
@@ -229,6 +249,10 @@ def get_corresponding_object_logs(public_id: int):
 
         logs = logs_manager.iterate(builder_params)
         corresponding_logs = [CmdbObjectLog.to_json(log) for log in logs.results]
+        _add_render_states(corresponding_logs, request_user)
+    except ManagerGetError as err:
+        LOGGER.debug("ManagerGetError: %s", err)
+        return ErrorBody(400, f"Could not retrieve corresponding logs for ID:{public_id}!").response()
     except ManagerIterationError as err:
         LOGGER.debug("ManagerIterationError: %s", err)
         return ErrorBody(400, f"Could not retrieve corresponding logs for ID:{public_id}!").response()
@@ -255,3 +279,37 @@ def delete_log(public_id: int):
         return ErrorBody(400, f"Could not delete the log with the ID:{public_id}!").response()
 
     return make_response(deleted)
+
+# -------------------------------------------------------------------------------------------------------------------- #
+#                                                   HELPER - METHODS                                                   #
+# -------------------------------------------------------------------------------------------------------------------- #
+
+def _add_render_states(logs: list[dict], request_user: UserModel) -> None:
+    """
+    Sets the `render_state` of logs which store a snapshot or a delta of the object state, the object
+    is rendered with its current type
+
+    Args:
+        logs (list[dict]): Logs as json, logs which already have a `render_state` are not changed
+        request_user (UserModel): User the objects are rendered for
+    """
+    logs = [log for log in logs if not log.get('render_state')]
+    states = logs_manager.get_object_states(logs)
+    type_ids = list({state.get('type_id') for state in states.values()})
+    types = {type_.public_id: type_ for type_ in type_manager.find({'public_id': {'$in': type_ids}}).results} \
+        if type_ids else {}
+
+    for log in logs:
+        state = states.get(log['public_id'])
+
+        if not state or state.get('type_id') not in types:
+            continue
+
+        try:
+            render_result = CmdbRender(object_instance=CmdbObject(**state),
+                                       object_manager=render_manager,
+                                       type_instance=types[state['type_id']],
+                                       render_user=request_user).result()
+            log['render_state'] = json.dumps(render_result, default=default)
+        except RenderError as err:
+            LOGGER.warning("Could not render the state of log %s: %s", log['public_id'], err)
@@ -24,7 +24,8 @@
 from cmdb.media_library.media_file_manager import MediaFileManagerGetError, \
     MediaFileManagerDeleteError, MediaFileManagerUpdateError, MediaFileManagerInsertError, MediaFileManagement
 
-from cmdb.interface.route_utils import make_response, insert_request_user, login_required, right_required
+from cmdb.interface.route_utils import make_response, insert_request_user, login_required, right_required, \
+    not_modified
 from cmdb.user_management import UserModel
 
 from cmdb.interface.rest_api.media_library_routes.media_file_route_utils import get_element_from_data_request, \
@@ -240,18 +241,76 @@ def download_file(filename: str):
     try:
         filter_metadata = generate_metadata_filter('metadata', request)
         filter_metadata.update({'filename': filename})
-        result = media_file_manager.get_file(metadata=filter_metadata, blob=True)
+        grid_out = media_file_manager.open_file(metadata=filter_metadata)
     except MediaFileManagerGetError:
         return abort(500)
 
-    return Response(
-        result,
-        mimetype="application/octet-stream",
-        headers={
-            "Content-Disposition":
-                f"attachment; filename={filename}"
-        }
-    )
+    # stored files are never changed, a new upload gets a new _id
+    etag = grid_out.md5 or str(grid_out._id)
+    not_modified_response = not_modified(etag, grid_out.upload_date)
+
+    if not_modified_response:
+        grid_out.close()
+        return not_modified_response
+
+    headers = {
+        'Content-Disposition': f'attachment; filename={filename}',
+        'Accept-Ranges': 'bytes'
+    }
+    length = grid_out.length
+    status = 200
+    start, end = 0, length
+    requested_range = _requested_range(length, etag, grid_out.upload_date)
+
+    if requested_range == 'unsatisfiable':
+        grid_out.close()
+        return Response(status=416, headers={'Content-Range': f'bytes */{length}', 'Accept-Ranges': 'bytes'})
+
+    if requested_range:
+        status = 206
+        start, end = requested_range
+        headers['Content-Range'] = f'bytes {start}-{end - 1}/{length}'
+
+    headers['Content-Length'] = str(end - start)
+
+    response = Response(media_file_manager.stream_file(grid_out, start, end), status=status,
+                        mimetype='application/octet-stream', headers=headers, direct_passthrough=True)
+    response.set_etag(etag)
+    response.last_modified = grid_out.upload_date
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+
+    return response
+
+
+def _requested_range(length: int, etag: str, last_modified):
+    """
+    Returns the byte range of a download request
+
+    Args:
+        length (int): Size of the file
+        etag (str): ETag of the file, compared with the `If-Range` header
+        last_modified (datetime): Upload time of the file, compared with the `If-Range` header
+
+    Returns:
+        tuple[int, int]: Start and end of the range, None if the whole file is requested or
+                         'unsatisfiable' if the range is outside of the file
+    """
+    byte_range = request.range
+
+    # several ranges (multipart responses) are not supported, the whole file is sent
+    if byte_range is None or byte_range.units != 'bytes' or len(byte_range.ranges) != 1:
+        return None
+
+    # the range only applies to the version of the file the client already has
+    if_range = request.if_range
+    if if_range.etag and if_range.etag != etag:
+        return None
+    if if_range.date and (not last_modified or if_range.date < last_modified.replace(microsecond=0,
+                                                                                       tzinfo=if_range.date.tzinfo)):
+        return None
+
+    return byte_range.range_for_length(length) or 'unsatisfiable'
 
 
 @media_file_blueprint.route('<int:public_id>', methods=['DELETE'])
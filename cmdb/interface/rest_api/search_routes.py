@@ -23,6 +23,7 @@
 from cmdb.interface.route_utils import make_response, insert_request_user, login_required
 from cmdb.search import Search
 from cmdb.search.params import SearchParam
+from cmdb.search.search_query import SearchQuery
 from cmdb.search.query import Pipeline
 from cmdb.search.searchers import SearcherFramework, SearchPipelineBuilder, QuickSearchPipelineBuilder
 from cmdb.user_management.models.user import UserModel
@@ -87,14 +88,16 @@ def search_framework(request_user: UserModel):
     try:
         searcher = SearcherFramework(manager=object_manager)
         builder = SearchPipelineBuilder()
+        search_query = SearchQuery.parse(search_parameters)
 
         query: Pipeline = builder.build(search_parameters, object_manager,
                                         user=request_user,
-                                        permission=AccessControlPermission.READ, active_flag=only_active)
+                                        permission=AccessControlPermission.READ, active_flag=only_active,
+                                        search_query=search_query)
 
         result = searcher.aggregate(pipeline=query, request_user=request_user, limit=limit, skip=skip,
                                     resolve=resolve_object_references, permission=AccessControlPermission.READ,
-                                    active=only_active)
+                                    active=only_active, search_query=search_query)
 
     except Exception as err:
         LOGGER.error('[Search Framework Rest]: %s',err)
@@ -20,6 +20,7 @@
 
 from cmdb.interface.route_utils import make_response
 from cmdb.interface.blueprint import APIBlueprint
+from cmdb.interface.response_cache import response_cache
 
 from cmdb.settings.date.date_settings import DateSettingsDAO
 from cmdb.utils.system_reader import SystemSettingsReader
@@ -35,6 +36,7 @@
 
 
 @date_blueprint.route('/', methods=['GET'])
+@response_cache.cached(SystemSettingsWriter.COLLECTION)
 def get_date_settings():
     """TODO: document"""
     date_settings = system_settings_reader.get_all_values_from_section('date',
@@ -0,0 +1,78 @@
+# DATAGERRY - OpenSource Enterprise CMDB
+# Copyright (C) 2024 becon GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""Routes of the log retention settings"""
+import logging
+
+from flask import request, current_app, abort
+
+from cmdb.interface.route_utils import make_response
+from cmdb.interface.blueprint import APIBlueprint
+
+from cmdb.event_management.event import Event
+from cmdb.log_retention.log_retention_job import REPORT_IDENTIFIER
+from cmdb.settings.log_retention.log_retention_settings import LogRetentionSettingsDAO
+from cmdb.utils.system_reader import SystemSettingsReader
+from cmdb.utils.system_writer import SystemSettingsWriter
+# -------------------------------------------------------------------------------------------------------------------- #
+
+log_retention_blueprint = APIBlueprint('log_retention', __name__)
+LOGGER = logging.getLogger(__name__)
+
+with current_app.app_context():
+    system_settings_reader: SystemSettingsReader = SystemSettingsReader(current_app.database_manager)
+    system_setting_writer: SystemSettingsWriter = SystemSettingsWriter(current_app.database_manager)
+
+
+@log_retention_blueprint.route('/', methods=['GET'])
+@log_retention_blueprint.protect(auth=True, right='base.system.view')
+def get_log_retention_settings():
+    """Returns the retention policies of the logs"""
+    retention_settings = system_settings_reader.get_all_values_from_section(
+        'log_retention', default=LogRetentionSettingsDAO.__DEFAULT_SETTINGS__)
+    return make_response(LogRetentionSettingsDAO(**retention_settings))
+
+
+@log_retention_blueprint.route('/', methods=['POST', 'PUT'])
+@log_retention_blueprint.protect(auth=True, right='base.system.edit')
+def update_log_retention_settings():
+    """Updates the retention policies of the logs"""
+    new_retention_settings_values = request.get_json()
+    if not new_retention_settings_values:
+        return abort(400, 'No new data was provided')
+    try:
+        new_retention_settings = LogRetentionSettingsDAO(**new_retention_settings_values)
+    except Exception as err:
+        return abort(400, err)
+    update_result = system_setting_writer.write(_id='log_retention', data=new_retention_settings.__dict__)
+    if update_result.acknowledged:
+        return make_response(system_settings_reader.get_section('log_retention'))
+    return abort(400, 'Could not update log retention settings')
+
+
+@log_retention_blueprint.route('/report', methods=['GET'])
+@log_retention_blueprint.protect(auth=True, right='base.system.view')
+def get_log_retention_report():
+    """Returns the report of the last retention run with the deleted logs and the reclaimed bytes"""
+    report = system_settings_reader.get_all_values_from_section(REPORT_IDENTIFIER, default={'_id': None})
+    return make_response(report if report.get('_id') else None)
+
+
+@log_retention_blueprint.route('/run', methods=['POST'])
+@log_retention_blueprint.protect(auth=True, right='base.system.edit')
+def run_log_retention():
+    """Requests an immediate run of the log retention in the background"""
+    current_app.event_queue.put(Event("cmdb.log_retention.run"))
+    return make_response(True, 202)
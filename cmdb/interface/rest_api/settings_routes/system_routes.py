@@ -24,6 +24,8 @@
 from cmdb.interface.route_utils import make_response, login_required, right_required, \
     insert_request_user
 from cmdb.interface.blueprint import NestedBlueprint
+from cmdb.interface.response_cache import response_cache
+from cmdb.manager.count_strategy import count_cache
 from cmdb.user_management import UserModel
 from cmdb.utils.system_config import SystemConfigReader
 from cmdb.utils.system_reader import SystemSettingsReader
@@ -98,3 +100,29 @@ def get_system_information(request_user: UserModel):
         }
     }
     return make_response(system_infos)
+
+
+@system_blueprint.route('/cache/', methods=['GET'])
+@system_blueprint.route('/cache', methods=['GET'])
+@login_required
+@insert_request_user
+@right_required('base.system.view')
+def get_cache_information(request_user: UserModel):
+    """
+    Returns the hit rates of the response cache and the count cache of this worker process
+
+    Args:
+        request_user (UserModel): User requesting the information
+    """
+    count_requests = count_cache.hits + count_cache.misses
+
+    cache_infos = {
+        'responses': response_cache.statistics(),
+        'counts': {
+            'entries': len(count_cache),
+            'hits': count_cache.hits,
+            'misses': count_cache.misses,
+            'hit_rate': round(count_cache.hits / count_requests, 4) if count_requests else 0.0
+        }
+    }
+    return make_response(cache_infos)
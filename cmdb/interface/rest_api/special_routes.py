@@ -18,10 +18,15 @@
 
 from flask import request, abort, current_app
 
+from cmdb.framework.cmdb_object import CmdbObject
 from cmdb.framework.cmdb_object_manager import CmdbObjectManager
+from cmdb.framework.models.category import CategoryModel
+from cmdb.framework.models.type import TypeModel
 
 from cmdb.interface.route_utils import make_response, login_required
 from cmdb.interface.blueprint import RootBlueprint
+from cmdb.interface.response_cache import response_cache
+from cmdb.manager.collection_counters import collection_counters
 from cmdb.utils.error import CMDBError
 from cmdb.framework.datagerry_assistant.profile_assistant import ProfileAssistant
 from cmdb.errors.manager import ManagerInsertError
@@ -37,6 +42,7 @@
 @special_blueprint.route('intro', methods=['GET'])
 @special_blueprint.route('/intro', methods=['GET'])
 @login_required
+@response_cache.cached(CategoryModel.COLLECTION, TypeModel.COLLECTION, CmdbObject.COLLECTION)
 def get_intro_starter():
     """
     Creates steps for intro and checks if there are any objects, categories or types in the DB
@@ -46,17 +52,12 @@ def get_intro_starter():
     """
     try:
         steps = []
-        categories_total = len(object_manager.get_categories())
-        types_total = object_manager.count_types()
-        objects_total = object_manager.count_objects()
+        categories_total, types_total, objects_total = _count_framework_documents()
 
         if _fetch_only_active_objs():
-            result = []
-
-            cursor = object_manager.group_objects_by_value('active', {'active': {"$eq": True}})
-            for document in cursor:
-                result.append(document)
-            objects_total = result[0]['count'] if result else 0
+            # only the existence of an active object is relevant for the intro
+            objects_total = collection_counters.count(object_manager.dbm, CmdbObject.COLLECTION,
+                                                      {'active': True}, limit=1)
 
         steps.append({'step': 1, 'label': 'Category', 'icon': 'check-circle',
                       'link': '/framework/category/add', 'state': categories_total > 0})
@@ -92,9 +93,7 @@ def create_initial_profiles(data: str):
     """
     profiles = data['data'].split('#')
 
-    categories_total = len(object_manager.get_categories())
-    types_total = object_manager.count_types()
-    objects_total = object_manager.count_objects()
+    categories_total, types_total, objects_total = _count_framework_documents()
 
     # Only execute if there are no categories, types and objects in the database
     if categories_total > 0 or types_total > 0 or objects_total > 0:
@@ -109,6 +108,17 @@ def create_initial_profiles(data: str):
     return make_response(created_ids)
 
 
+def _count_framework_documents() -> tuple[int, int, int]:
+    """
+    Returns the totals of the categories, types and objects from the collection counters
+
+    Returns:
+        tuple[int, int, int]: Number of categories, types and objects
+    """
+    return tuple(collection_counters.total(object_manager.dbm, collection) for collection in
+                 (CategoryModel.COLLECTION, TypeModel.COLLECTION, CmdbObject.COLLECTION))
+
+
 def _fetch_only_active_objs():
     """
     Checking if request have cookie parameter for object active state
@@ -16,11 +16,13 @@
 """TODO: document"""
 import base64
 import functools
-import json
+import hashlib
 from functools import wraps
 from datetime import datetime
 
 from werkzeug._internal import _wsgi_decoding_dance
+from werkzeug.http import is_resource_modified
+from werkzeug.wrappers import Response
 from flask import request, abort, current_app
 
 from cmdb.errors.manager import ManagerGetError
@@ -50,23 +52,82 @@ def default(obj):
 
 
 #@deprecated
-def make_response(instance, status_code=200, indent=2):
+def make_response(instance, status_code=200, indent=None):
     """
     make json http response with indent settings and auto encoding
     Args:
         instance: instance of a cmdbDao instance or instance of the subclass
         status_code: optional status code
-        indent: indent of json response
+        indent: indent of json response, responses are only indented in debug mode by default
     Returns:
         http valid response
     """
     from flask import make_response as flask_response
 
+    if indent is None and current_app.debug:
+        indent = 2
+
     # encode the dict data from the object to json data
-    resp = flask_response(json.dumps(instance, default=json_encoding.default, indent=indent), status_code)
+    resp = flask_response(json_encoding.dumps(instance, indent=indent), status_code)
     # add header information
     resp.mimetype = DEFAULT_MIME_TYPE
-    return resp
+    return make_conditional(resp)
+
+
+def body_etag(body: bytes) -> str:
+    """Strong ETag of a response body"""
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+def make_conditional(response: Response, etag: str = None, last_modified: datetime = None) -> Response:
+    """
+    Adds validators to the response of a GET request and turns it into a `304 Not Modified` response
+    if the client already has the current version (`If-None-Match`, `If-Modified-Since`)
+
+    Args:
+        response (Response): The complete response
+        etag (str, optional): Strong ETag of the response, a hash of the body if not set
+        last_modified (datetime, optional): Time of the last change of the returned resource
+
+    Returns:
+        Response: The passed response with the validators or a 304 response without a body
+    """
+    if request.method != 'GET' or response.status_code != 200 or response.is_streamed:
+        return response
+
+    response.set_etag(etag or body_etag(response.get_data()))
+    if last_modified:
+        response.last_modified = last_modified
+    # the responses depend on the user, clients have to revalidate them on every use
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+
+    return response.make_conditional(request)
+
+
+def not_modified(etag: str = None, last_modified: datetime = None):
+    """
+    Checks the conditional headers of a GET request before the response is built
+
+    Args:
+        etag (str, optional): Strong ETag of the current version of the resource
+        last_modified (datetime, optional): Time of the last change of the resource
+
+    Returns:
+        Response: A `304 Not Modified` response if the client has the current version, otherwise None
+    """
+    if request.method != 'GET' or is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        return None
+
+    response = Response(status=304)
+    if etag:
+        response.set_etag(etag)
+    if last_modified:
+        response.last_modified = last_modified
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+
+    return response
 
 
 #@deprecated
@@ -0,0 +1,273 @@
+# DATAGERRY - OpenSource Enterprise CMDB
+# Copyright (C) 2024 becon GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+Retention job of the logs
+
+Each policy of the `LogRetentionSettingsDAO` is applied to the collection of its log type. All logs up to the
+newest log exceeding the age or count limit are archived and deleted in batches of ascending public_ids, the
+pauses between the batches keep the locks of each delete short. Object logs store deltas to snapshots, before
+they are deleted every delta chain which starts in the deleted logs gets a new snapshot in its first remaining log.
+"""
+import gzip
+import logging
+from datetime import datetime, timedelta, timezone
+from threading import Event
+
+from bson import encode, json_util
+
+from cmdb.database.database_gridfs import DatabaseGridFS
+from cmdb.database.database_manager_mongo import DatabaseManagerMongo
+from cmdb.exportd.exportd_logs.exportd_log import ExportdMetaLog, ExportdJobLog
+from cmdb.framework.models.log import CmdbMetaLog, CmdbObjectLog
+from cmdb.manager.base_manager import BaseManager
+from cmdb.manager.logs_manager import LogsManager
+from cmdb.settings.log_retention.log_retention_settings import LogRetentionSettingsDAO
+from cmdb.utils.system_writer import SystemSettingsWriter
+
+from cmdb.errors.manager import ManagerDeleteError, ManagerGetError, ManagerIterationError, ManagerUpdateError
+# -------------------------------------------------------------------------------------------------------------------- #
+
+LOGGER = logging.getLogger(__name__)
+
+# Collection of each log type which can be limited by a policy
+LOG_COLLECTIONS = {
+    CmdbObjectLog.__name__: CmdbMetaLog.COLLECTION,
+    ExportdJobLog.__name__: ExportdMetaLog.COLLECTION,
+}
+
+# Settings document of the report of the last run
+REPORT_IDENTIFIER = 'log_retention_report'
+
+
+class GridFSLogArchive:
+    """Archives the logs of one run of a policy as a single gzip compressed json lines file in GridFS"""
+
+    COLLECTION = 'log.archive'
+
+    def __init__(self, database_manager: DatabaseManagerMongo, collection: str, log_type: str):
+        self.fs = DatabaseGridFS(database_manager.connector.database, self.COLLECTION)
+        self.collection = collection
+        self.log_type = log_type
+        self.__grid_file = None
+        self.__gzip_file = None
+        self.__count = 0
+
+
+    def write(self, logs: list[dict]) -> None:
+        """Appends logs to the bundle, the bundle file is created with the first logs"""
+        if not self.__grid_file:
+            self.__grid_file = self.fs.new_file(
+                filename=f'{self.collection}-{datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")}.jsonl.gz',
+                content_type='application/gzip',
+                log_type=self.log_type
+            )
+            self.__gzip_file = gzip.GzipFile(fileobj=self.__grid_file, mode='wb')
+
+        self.__gzip_file.write(''.join(json_util.dumps(log) + '\n' for log in logs).encode('utf-8'))
+        self.__count += len(logs)
+
+
+    def close(self) -> int:
+        """
+        Finishes the bundle
+
+        Returns:
+            int: Compressed size of the bundle in bytes
+        """
+        if not self.__grid_file:
+            return 0
+
+        self.__gzip_file.close()
+        self.__grid_file.count = self.__count
+        self.__grid_file.close()
+
+        return self.__grid_file.length
+
+
+class CappedLogArchive:
+    """Archives logs in a capped collection per log collection, the oldest archived logs are overwritten"""
+
+    def __init__(self, database_manager: DatabaseManagerMongo, collection: str, log_type: str, size: int):
+        database = database_manager.connector.database
+        name = f'{collection}.archive'
+
+        if name not in database.list_collection_names():
+            database.create_collection(name, capped=True, size=size)
+
+        self.archive = database[name]
+        self.log_type = log_type
+        self.__size = 0
+
+
+    def write(self, logs: list[dict]) -> None:
+        """Inserts the logs into the capped collection"""
+        self.archive.insert_many([dict(log) for log in logs], ordered=False)
+        self.__size += sum(len(encode(log)) for log in logs)
+
+
+    def close(self) -> int:
+        """
+        Returns:
+            int: Size of the archived logs in bytes
+        """
+        return self.__size
+
+
+class LogRetentionJob:
+    """Applies the retention policies to the log collections"""
+
+    def __init__(self, database_manager: DatabaseManagerMongo, settings: LogRetentionSettingsDAO,
+                 shutdown: Event = None):
+        """
+        Args:
+            database_manager (DatabaseManagerMongo): Database connection
+            settings (LogRetentionSettingsDAO): Policies and batch settings
+            shutdown (Event, optional): Stops the job after the current batch if it is set
+        """
+        self.dbm = database_manager
+        self.settings = settings
+        self.shutdown = shutdown or Event()
+
+
+    def execute(self) -> dict:
+        """
+        Runs all policies and stores the report of the run
+
+        Returns:
+            dict: The report with the number of deleted logs, the reclaimed and the archived bytes of each policy
+        """
+        report = {
+            'start_time': datetime.now(timezone.utc),
+            'end_time': None,
+            'deleted': 0,
+            'reclaimed_bytes': 0,
+            'policies': []
+        }
+
+        for policy in self.settings.policies:
+            if self.shutdown.is_set():
+                break
+
+            if policy['log_type'] not in LOG_COLLECTIONS:
+                LOGGER.warning("Log retention: unknown log type %s", policy['log_type'])
+                continue
+
+            try:
+                policy_report = self.apply_policy(policy)
+            except (ManagerGetError, ManagerIterationError, ManagerUpdateError, ManagerDeleteError) as err:
+                LOGGER.error("Log retention of %s failed: %s", policy['log_type'], err)
+                policy_report = {'log_type': policy['log_type'], 'error': str(err)}
+
+            report['policies'].append(policy_report)
+            report['deleted'] += policy_report.get('deleted', 0)
+            report['reclaimed_bytes'] += policy_report.get('reclaimed_bytes', 0)
+
+        report['end_time'] = datetime.now(timezone.utc)
+        LOGGER.info("Log retention deleted %s logs and reclaimed %s bytes", report['deleted'],
+                    report['reclaimed_bytes'])
+
+        SystemSettingsWriter(self.dbm).write(_id=REPORT_IDENTIFIER, data=report)
+
+        return report
+
+
+    def apply_policy(self, policy: dict) -> dict:
+        """
+        Archives and deletes the logs of a log type which exceed the limits of the policy
+
+        Args:
+            policy (dict): `log_type`, `max_age` and `max_count` of the policy
+
+        Returns:
+            dict: Report of the policy
+        """
+        log_type = policy['log_type']
+        collection = LOG_COLLECTIONS[log_type]
+        report = {'log_type': log_type, 'deleted': 0, 'reclaimed_bytes': 0, 'archived_bytes': 0, 'snapshots': 0}
+
+        manager = LogsManager(self.dbm) if log_type == CmdbObjectLog.__name__ else BaseManager(collection, self.dbm)
+        last_public_id = self.get_last_public_id(manager, policy)
+
+        if last_public_id is None:
+            return report
+
+        if isinstance(manager, LogsManager):
+            report['snapshots'] = manager.compact_snapshots(last_public_id)
+
+        archive = self.__get_archive(collection, log_type)
+        criteria = {'log_type': log_type, 'public_id': {'$lte': last_public_id}}
+
+        try:
+            while not self.shutdown.is_set():
+                logs = list(manager.get(criteria, sort=[('public_id', 1)], limit=self.settings.batch_size))
+
+                if not logs:
+                    break
+
+                if archive:
+                    archive.write(logs)
+
+                public_ids = [log['public_id'] for log in logs]
+                report['deleted'] += manager.delete_many({'public_id': {'$in': public_ids}})
+                report['reclaimed_bytes'] += sum(len(encode(log)) for log in logs)
+
+                self.shutdown.wait(self.settings.batch_pause)
+        finally:
+            if archive:
+                report['archived_bytes'] = archive.close()
+
+        return report
+
+
+    @staticmethod
+    def get_last_public_id(manager: BaseManager, policy: dict):
+        """
+        Returns the public_id of the newest log which exceeds the age or the count limit of the policy,
+        the public_ids of the logs increase with their log time
+
+        Args:
+            manager (BaseManager): Manager of the log collection
+            policy (dict): `log_type`, `max_age` and `max_count` of the policy
+
+        Returns:
+            int: public_id of the last deleted log or None if no log exceeds the limits
+        """
+        last_public_ids = []
+        newest_first = [('public_id', -1)]
+
+        if policy['max_age'] > 0:
+            cutoff = datetime.now(timezone.utc) - timedelta(days=policy['max_age'])
+            last_public_ids.extend(log['public_id'] for log in manager.get(
+                {'log_type': policy['log_type'], 'log_time': {'$lt': cutoff}},
+                projection={'_id': 0, 'public_id': 1}, sort=newest_first, limit=1))
+
+        if policy['max_count'] > 0:
+            last_public_ids.extend(log['public_id'] for log in manager.get(
+                {'log_type': policy['log_type']},
+                projection={'_id': 0, 'public_id': 1}, sort=newest_first, skip=policy['max_count'], limit=1))
+
+        return max(last_public_ids, default=None)
+
+
+    def __get_archive(self, collection: str, log_type: str):
+        """Returns the archive of the configured archive mode, None if the logs are not archived"""
+        if self.settings.archive == 'gridfs':
+            return GridFSLogArchive(self.dbm, collection, log_type)
+
+        if self.settings.archive == 'capped':
+            return CappedLogArchive(self.dbm, collection, log_type, self.settings.capped_size)
+
+        return None
@@ -0,0 +1,88 @@
+# DATAGERRY - OpenSource Enterprise CMDB
+# Copyright (C) 2024 becon GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""Background service which runs the log retention job"""
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+
+import cmdb.process_management.service
+from cmdb.database.database_manager_mongo import DatabaseManagerMongo
+from cmdb.event_management.event import Event
+from cmdb.log_retention.log_retention_job import LogRetentionJob, REPORT_IDENTIFIER
+from cmdb.settings.log_retention.log_retention_settings import LogRetentionSettingsDAO
+from cmdb.utils.system_config import SystemConfigReader
+from cmdb.utils.system_reader import SystemSettingsReader
+# -------------------------------------------------------------------------------------------------------------------- #
+
+LOGGER = logging.getLogger(__name__)
+
+
+class LogRetentionService(cmdb.process_management.service.AbstractCmdbService):
+    """Runs the log retention in the configured interval or when a run is requested"""
+
+    # Seconds between two checks of the settings
+    CHECK_INTERVAL = 60
+
+    def __init__(self):
+        super().__init__()
+        self._name = "log_retention"
+        self._eventtypes = ["cmdb.log_retention.#"]
+        self.__run_requested = threading.Event()
+
+
+    def _run(self):
+        LOGGER.info("%s: start run", self._name)
+        database_manager = DatabaseManagerMongo(**SystemConfigReader().get_all_values_from_section('Database'))
+        settings_reader = SystemSettingsReader(database_manager)
+
+        while not self._event_shutdown.is_set():
+            try:
+                settings = LogRetentionSettingsDAO(**settings_reader.get_all_values_from_section(
+                    'log_retention', default=LogRetentionSettingsDAO.__DEFAULT_SETTINGS__))
+                last_run = settings_reader.get_all_values_from_section(REPORT_IDENTIFIER, default={'_id': None})
+
+                if self.__run_requested.is_set() or self.__is_due(settings, last_run.get('start_time')):
+                    self.__run_requested.clear()
+                    LogRetentionJob(database_manager, settings, self._event_shutdown).execute()
+            except Exception as err:
+                LOGGER.error("%s: run failed: %s", self._name, err)
+
+            for _ in range(self.CHECK_INTERVAL):
+                if self._event_shutdown.is_set() or self.__run_requested.is_set():
+                    break
+                self._event_shutdown.wait(1)
+        LOGGER.info("%s: end run", self._name)
+
+
+    def _handle_event(self, event: Event):
+        LOGGER.debug("event received:%s", event.get_type())
+        if event.get_type() == "cmdb.log_retention.run":
+            self.__run_requested.set()
+
+
+    @staticmethod
+    def __is_due(settings: LogRetentionSettingsDAO, last_start: datetime) -> bool:
+        """Checks if the retention is active and the interval passed since the last run"""
+        if not settings.active:
+            return False
+
+        if not last_start:
+            return True
+
+        if last_start.tzinfo is None:
+            last_start = last_start.replace(tzinfo=timezone.utc)
+
+        return datetime.now(timezone.utc) - last_start >= timedelta(hours=settings.interval)
@@ -18,8 +18,11 @@
 
 from typing import Any
 
+from pymongo.errors import BulkWriteError
+
 from cmdb.database.database_manager_mongo import DatabaseManagerMongo
 from cmdb.framework.utils import Collection
+from cmdb.manager.count_strategy import count_cache
 
 from cmdb.errors.manager import ManagerGetError,\
                                 ManagerInsertError,\
@@ -64,7 +67,9 @@ def _insert(self, collection: Collection, resource: Any, skip_public: bool = Fal
             skip_public (bool): Skip the public id creation and counter increment.
         """
         try:
-            return self._database_manager.insert(collection, data=resource, skip_public=skip_public)
+            result = self._database_manager.insert(collection, data=resource, skip_public=skip_public)
+            count_cache.invalidate(collection)
+            return result
         except Exception as err:
             raise ManagerInsertError(err) from err
 
@@ -99,7 +104,9 @@ def _update(self, collection: Collection, filter: dict, resource: Any, *args, **
             - An instance of :class:`~pymongo.results.UpdateResult`.
         """
         try:
-            return self._database_manager.update(collection, filter=filter, data=resource, *args, **kwargs)
+            result = self._database_manager.update(collection, filter=filter, data=resource, *args, **kwargs)
+            count_cache.invalidate(collection)
+            return result
         except Exception as err:
             raise ManagerUpdateError(err) from err
 
@@ -116,10 +123,34 @@ def _update_many(self, collection: Collection, query: dict, update: dict, add_to
             acknowledgment of database
         """
         try:
-            return self._database_manager.update_many(collection=collection,
-                                                      query=query,
-                                                      update=update,
-                                                      add_to_set=add_to_set)
+            result = self._database_manager.update_many(collection=collection,
+                                                        query=query,
+                                                        update=update,
+                                                        add_to_set=add_to_set)
+            count_cache.invalidate(collection)
+            return result
+        except Exception as err:
+            raise ManagerUpdateError(err) from err
+
+
+    def _bulk_write(self, collection: Collection, requests: list, ordered: bool = False):
+        """
+        Calls a mongodb bulk write
+        Args:
+            collection (str): name of the database collection
+            requests (list): write operations
+            ordered (bool): Stop at the first failed operation
+
+        Returns:
+            - An instance of :class:`~pymongo.results.BulkWriteResult`.
+        """
+        try:
+            result = self._database_manager.bulk_write(collection, requests, ordered=ordered)
+            count_cache.invalidate(collection)
+            return result
+        except BulkWriteError:
+            count_cache.invalidate(collection)
+            raise
         except Exception as err:
             raise ManagerUpdateError(err) from err
 
@@ -132,7 +163,27 @@ def _delete(self, collection: Collection, filter: dict, *args, **kwargs):
             filter: Matching resource dict.
         """
         try:
-            return self._database_manager.delete(collection, filter=filter, *args, **kwargs)
+            result = self._database_manager.delete(collection, filter=filter, *args, **kwargs)
+            count_cache.invalidate(collection)
+            return result
+        except Exception as err:
+            raise ManagerDeleteError(err) from err
+
+
+    def _delete_many(self, collection: Collection, filter: dict):
+        """
+        Calls a mongodb delete operation for all documents matching the filter
+        Args:
+            collection: Name of the collection
+            filter: Matching resource dict.
+
+        Returns:
+            - An instance of :class:`~pymongo.results.DeleteResult`.
+        """
+        try:
+            result = self._database_manager.delete_many(collection, **filter)
+            count_cache.invalidate(collection)
+            return result
         except Exception as err:
             raise ManagerDeleteError(err) from err
 
@@ -16,9 +16,12 @@
 """Contains implementation of BaseManager"""
 import logging
 
+from pymongo.errors import BulkWriteError
+
 from cmdb.database.mongo_database_manager import MongoDatabaseManager
 
 from cmdb.framework.utils import Collection
+from cmdb.manager.count_strategy import CountStrategy, CountResult, count_cache
 from cmdb.errors.manager import ManagerInsertError,\
                                 ManagerGetError,\
                                 ManagerUpdateError,\
@@ -54,7 +57,42 @@ def insert(self, data: dict, skip_public: bool = False) -> int:
             None: If anything goes wrong
         """
         try:
-            return self.dbm.insert(self.collection, data, skip_public)
+            result = self.dbm.insert(self.collection, data, skip_public)
+            count_cache.invalidate(self.collection)
+            return result
+        except Exception as err:
+            raise ManagerInsertError(err) from err
+
+
+    def insert_many(self, data: list[dict]) -> list[int]:
+        """
+        Insert several documents with a single database call, missing public_ids are reserved at once
+
+        Args:
+            data (list[dict]): Documents which should be inserted
+        Returns:
+            list[int]: public_ids of the inserted documents
+        """
+        if not data:
+            return []
+
+        try:
+            without_public_id = [document for document in data if document.get('public_id') is None]
+
+            if without_public_id:
+                next_public_id = self.dbm.reserve_public_ids(self.collection, len(without_public_id))
+
+                for offset, document in enumerate(without_public_id):
+                    document['public_id'] = next_public_id + offset
+
+            self.dbm.insert_many(self.collection, data)
+            count_cache.invalidate(self.collection)
+
+            return [document['public_id'] for document in data]
+        except BulkWriteError as err:
+            # the documents without a write error were inserted
+            count_cache.invalidate(self.collection)
+            raise ManagerInsertError(err) from err
         except Exception as err:
             raise ManagerInsertError(err) from err
 
@@ -141,6 +179,26 @@ def aggregate(self, *args, **kwargs):
             raise ManagerIterationError(err) from err
 
 
+    def count_total(self, criteria, count_query: list[dict] = None) -> CountResult:
+        """
+        Counts the total number of documents of a list request with the cheapest strategy
+
+        Args:
+            criteria (Union[dict, list[dict]]): Filter or pipeline stages of the request
+            count_query (list[dict], optional): Count pipeline if the criteria can not be used as a filter
+
+        Raises:
+            ManagerIterationError: When something goes wrong while counting the documents
+
+        Returns:
+            CountResult: Total of the request and whether it is exact
+        """
+        try:
+            return CountStrategy(self.dbm, self.collection).count(criteria, pipeline=count_query)
+        except Exception as err:
+            raise ManagerIterationError(err) from err
+
+
     def get_next_public_id(self):
         """
         Retrieves next public_id for the collection
@@ -163,7 +221,9 @@ def update(self, criteria: dict, data: dict, *args, **kwargs):
             UpdateResult
         """
         try:
-            return self.dbm.update(self.collection, criteria, data, *args, **kwargs)
+            result = self.dbm.update(self.collection, criteria, data, *args, **kwargs)
+            count_cache.invalidate(self.collection)
+            return result
         except Exception as err:
             raise ManagerUpdateError(err) from err
 
@@ -179,7 +239,9 @@ def update_many(self, criteria: dict, update: dict, add_to_set: bool = False):
             Acknowledgment of database
         """
         try:
-            return self.dbm.update_many(self.collection, criteria, update, add_to_set)
+            result = self.dbm.update_many(self.collection, criteria, update, add_to_set)
+            count_cache.invalidate(self.collection)
+            return result
         except Exception as err:
             raise ManagerUpdateError(err) from err
 
@@ -198,6 +260,28 @@ def delete(self, criteria: dict) -> bool:
             bool: True if deletion is successful
         """
         try:
-            return self.dbm.delete(self.collection, criteria).acknowledged
+            result = self.dbm.delete(self.collection, criteria).acknowledged
+            count_cache.invalidate(self.collection)
+            return result
+        except Exception as err:
+            raise ManagerDeleteError(err) from err
+
+
+    def delete_many(self, criteria: dict) -> int:
+        """
+        Deletes all documents matching the filter with a single database call
+
+        Args:
+            criteria (dict): Filter to match the documents
+        Raises:
+            ManagerDeleteError: Something went wrong while trying to delete the documents
+
+        Returns:
+            int: Number of deleted documents
+        """
+        try:
+            result = self.dbm.delete_many(self.collection, **criteria)
+            count_cache.invalidate(self.collection)
+            return result.deleted_count
         except Exception as err:
             raise ManagerDeleteError(err) from err
@@ -36,6 +36,7 @@
                                 ManagerUpdateError
 
 from .base_manager import BaseManager
+from .tree_cache import tree_cache
 from .query_builder.base_query_builder import BaseQueryBuilder
 from . query_builder.builder_parameters import BuilderParameters
 # -------------------------------------------------------------------------------------------------------------------- #
@@ -77,6 +78,16 @@ def tree(self) -> CategoryTree:
 
         return CategoryTree(categories, types)
 
+
+    def get_tree_json(self) -> list[dict]:
+        """
+        Get the serialised category tree, served from the tree cache until a category or type is changed
+
+        Returns:
+            list[dict]: The root nodes of the category tree as json
+        """
+        return tree_cache.get(self.collection, 'tree', lambda: CategoryTree.to_json(self.tree))
+
 # --------------------------------------------------- CRUD - CREATE -------------------------------------------------- #
 
     def insert_category(self, category: dict) -> int:
@@ -121,17 +132,15 @@ def iterate(self,
             count_query: list[dict] = self.query_builder.count(builder_params.get_criteria())
 
             aggregation_result = list(self.aggregate(query))
-            total_cursor = self.aggregate(count_query)
-
-            total = 0
-            while total_cursor.alive:
-                total = next(total_cursor)['total']
+            count_result = self.count_total(builder_params.get_criteria(), count_query)
 
         except ManagerGetError as err:
             raise ManagerIterationError(err) from err
 
         try:
-            iteration_result: IterationResult[CategoryModel] = IterationResult(aggregation_result, total)
+            iteration_result: IterationResult[CategoryModel] = IterationResult(aggregation_result,
+                                                                               count_result.total,
+                                                                               count_result.exact)
             iteration_result.convert_to(CategoryModel)
         except Exception as err:
             raise ManagerIterationError(err) from err
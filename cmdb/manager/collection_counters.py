@@ -0,0 +1,116 @@
+# DATAGERRY - OpenSource Enterprise CMDB
+# Copyright (C) 2024 becon GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+Counters of whole collections for statistics (intro, dashboard)
+
+The total of a collection is taken from the collection metadata (`estimated_document_count`) which does not scan
+any document. Counts with a filter can be limited (e.g. `limit=1` to check if a matching document exists), so
+they stop at the first matching documents. The counters are kept for a short time and are removed by the
+invalidations of the `CountCache`, a write of this process is therefore visible with the next request.
+"""
+import json
+import logging
+import threading
+import time
+
+from cmdb.manager.count_strategy import count_cache
+# -------------------------------------------------------------------------------------------------------------------- #
+
+LOGGER = logging.getLogger(__name__)
+
+
+class CollectionCounters:
+    """Thread safe counters of collections which expire after a short time"""
+
+    def __init__(self, ttl: int = 10):
+        """
+        Args:
+            ttl (int): Seconds after which a counter is read again from the database
+        """
+        self.ttl = ttl
+        self.__counters: dict[tuple, tuple] = {}
+        self.__lock = threading.Lock()
+
+
+    def total(self, database_manager, collection: str) -> int:
+        """
+        Returns the number of documents of a collection
+
+        Args:
+            database_manager: Database manager used to read the collection metadata
+            collection (str): Name of the collection
+
+        Returns:
+            int: Estimated number of documents
+        """
+        return self.__cached((collection, None, None), lambda: database_manager.estimated_count(collection))
+
+
+    def count(self, database_manager, collection: str, criteria: dict, limit: int = None) -> int:
+        """
+        Returns the number of documents of a collection which match the criteria
+
+        Args:
+            database_manager: Database manager used to count the documents
+            collection (str): Name of the collection
+            criteria (dict): Filter of the documents
+            limit (int, optional): Maximum number of counted documents
+
+        Returns:
+            int: Number of matching documents, at most `limit`
+        """
+        key = (collection, json.dumps(criteria, sort_keys=True, default=str), limit)
+        options = {'limit': limit} if limit else {}
+
+        return self.__cached(key, lambda: database_manager.count(collection, criteria, **options))
+
+
+    def invalidate(self, collection: str = None) -> None:
+        """
+        Removes the counters of a collection
+
+        Args:
+            collection (str, optional): Name of the collection, all counters are removed if not set
+        """
+        with self.__lock:
+            if collection is None:
+                self.__counters.clear()
+                return
+
+            for key in [key for key in self.__counters if key[0] == collection]:
+                del self.__counters[key]
+
+# ------------------------------------------------- HELPER FUNCTIONS ------------------------------------------------- #
+
+    def __cached(self, key: tuple, counter) -> int:
+        """Returns a valid counter or reads and stores it"""
+        with self.__lock:
+            entry = self.__counters.get(key)
+
+            if entry and entry[1] > time.monotonic():
+                return entry[0]
+
+        value = counter()
+
+        with self.__lock:
+            self.__counters[key] = (value, time.monotonic() + self.ttl)
+
+        return value
+
+
+collection_counters = CollectionCounters()
+
+count_cache.add_listener(collection_counters.invalidate)
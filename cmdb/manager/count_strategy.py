@@ -0,0 +1,401 @@
+# DATAGERRY - OpenSource Enterprise CMDB
+# Copyright (C) 2024 becon GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+Strategies for counting the total number of documents of list requests
+
+The total of a list request is calculated in one of the following ways:
+    - ESTIMATED:  No filter at all, the number is taken from the collection metadata
+    - INDEXED:    The filter only consists of `$match` conditions on indexed fields and is counted exactly
+    - AGGREGATED: Expensive counts (lookups, unindexed fields) are counted exactly and stored in the `CountCache`
+    - CACHED:     The total was taken from the `CountCache`
+
+Cached totals are invalidated when a write to the collection happens in this process or a matching
+`cmdb.core.*` event is sent. Other worker processes can not invalidate the cache of this process, therefore
+cached totals are flagged as not exact and expire after a short time.
+"""
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from enum import Enum
+from typing import Union, Optional
+
+from cmdb.event_management.event import Event
+from cmdb.event_management.event_dispatcher import local_event_dispatcher
+# -------------------------------------------------------------------------------------------------------------------- #
+
+LOGGER = logging.getLogger(__name__)
+
+# Operators which can not be used with `count_documents`
+UNSUPPORTED_COUNT_OPERATORS = ('$where', '$near', '$nearSphere')
+
+# Collections whose cached counts are invalidated by the event types
+INVALIDATION_EVENTS = {
+    'cmdb.core.object.#': 'framework.objects',
+    'cmdb.core.objects.#': 'framework.objects',
+    'cmdb.core.objecttype.#': 'framework.types',
+}
+
+
+class CountMode(Enum):
+    """How the total of a request was calculated"""
+    ESTIMATED = 'estimated'
+    INDEXED = 'indexed'
+    AGGREGATED = 'aggregated'
+    CACHED = 'cached'
+
+
+class CountResult:
+    """Total number of documents together with the information how it was calculated"""
+
+    def __init__(self, total: int, mode: CountMode):
+        self.total: int = total
+        self.mode: CountMode = mode
+
+
+    @property
+    def exact(self) -> bool:
+        """True if the total was counted for this request"""
+        return self.mode in (CountMode.INDEXED, CountMode.AGGREGATED)
+
+# -------------------------------------------------------------------------------------------------------------------- #
+#                                                  CountCache - CLASS                                                  #
+# -------------------------------------------------------------------------------------------------------------------- #
+
+class CountCache:
+    """Thread safe LRU cache for the totals of expensive count queries"""
+
+    def __init__(self, ttl: int = 30, max_entries: int = 1024):
+        """
+        Args:
+            ttl (int): Seconds after which a cached total expires
+            max_entries (int): Maximum number of cached totals
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.__entries: OrderedDict = OrderedDict()
+        self.__listeners: list = []
+        self.__lock = threading.Lock()
+
+
+    def __len__(self):
+        return len(self.__entries)
+
+
+    @staticmethod
+    def make_key(collection: str, query: Union[dict, list]) -> tuple:
+        """
+        Generates the cache key of a count query
+
+        Args:
+            collection (str): Name of the collection
+            query (Union[dict, list]): Filter or pipeline of the count
+
+        Returns:
+            tuple: key of the query
+        """
+        return collection, json.dumps(query, sort_keys=True, default=str)
+
+
+    def get(self, key: tuple) -> Optional[int]:
+        """
+        Returns the cached total of a key
+
+        Args:
+            key (tuple): Key generated by `make_key`
+
+        Returns:
+            Optional[int]: The cached total or None if there is no valid entry
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+
+            if entry is None or entry[1] < time.monotonic():
+                if entry is not None:
+                    del self.__entries[key]
+                self.misses += 1
+                return None
+
+            self.__entries.move_to_end(key)
+            self.hits += 1
+
+            return entry[0]
+
+
+    def set(self, key: tuple, total: int) -> None:
+        """
+        Stores a total in the cache
+
+        Args:
+            key (tuple): Key generated by `make_key`
+            total (int): Counted total of the query
+        """
+        with self.__lock:
+            self.__entries[key] = (total, time.monotonic() + self.ttl)
+            self.__entries.move_to_end(key)
+
+            while len(self.__entries) > self.max_entries:
+                self.__entries.popitem(last=False)
+
+
+    def add_listener(self, listener) -> None:
+        """
+        Registers a callable which is called with the collection name on every invalidation,
+        used by other caches which depend on the same writes
+
+        Args:
+            listener: Callable accepting the name of the collection or None
+        """
+        self.__listeners.append(listener)
+
+
+    def invalidate(self, collection: str = None) -> None:
+        """
+        Removes the cached totals of a collection
+
+        Args:
+            collection (str, optional): Name of the collection, all totals are removed if not set
+        """
+        with self.__lock:
+            if collection is None:
+                self.__entries.clear()
+            else:
+                for key in [key for key in self.__entries if key[0] == collection]:
+                    del self.__entries[key]
+
+        for listener in self.__listeners:
+            listener(collection)
+
+
+    def handle_event(self, event: Event) -> None:
+        """Invalidates the totals of the collection which was changed by the event"""
+        for event_type, collection in INVALIDATION_EVENTS.items():
+            if local_event_dispatcher.matches(event_type, event.get_type()):
+                self.invalidate(collection)
+
+
+count_cache = CountCache()
+
+for _event_type in INVALIDATION_EVENTS:
+    local_event_dispatcher.subscribe(_event_type, count_cache.handle_event)
+
+# -------------------------------------------------------------------------------------------------------------------- #
+#                                                 CountStrategy - CLASS                                                #
+# -------------------------------------------------------------------------------------------------------------------- #
+
+class CountStrategy:
+    """Selects the cheapest way to count the total of a list request"""
+
+    # Key fields of each index of the collections, cleared by `invalidate_indexes` when indexes change
+    __index_keys: dict = {}
+    # Seconds after which the indexes are loaded again, indexes created by other processes are seen afterwards
+    INDEX_TTL = 300
+
+    def __init__(self, database_manager, collection: str, lookup_fields: tuple = (), cache: CountCache = None):
+        """
+        Args:
+            database_manager: Database manager of the calling manager
+            collection (str): Name of the counted collection
+            lookup_fields (tuple): Fields which only exist after a `$lookup` of the list pipeline
+            cache (CountCache, optional): Cache for expensive counts
+        """
+        self.database_manager = database_manager
+        self.collection = collection
+        self.lookup_fields = set(lookup_fields)
+        self.cache: CountCache = cache or count_cache
+
+
+    def count(self, criteria: Union[dict, list[dict]], restriction: dict = None, pipeline: list[dict] = None,
+              use_cache: bool = True) -> CountResult:
+        """
+        Counts the documents which match the criteria
+
+        Args:
+            criteria (Union[dict, list[dict]]): Filter or list of pipeline stages of the request
+            restriction (dict, optional): Additional filter (e.g. access control) which is always applied
+            pipeline (list[dict], optional): Fallback count pipeline ending with a `$count` stage named 'total',
+                                             used if the criteria can not be expressed as a filter
+            use_cache (bool): If False expensive counts are always executed and not stored in the cache
+
+        Returns:
+            CountResult: The total of the request
+        """
+        query_filter = self.to_filter(criteria)
+
+        if query_filter is not None and restriction:
+            query_filter = {'$and': [query_filter, restriction]} if query_filter else restriction
+
+        if query_filter is None:
+            if not use_cache:
+                return CountResult(self.__aggregate_count(pipeline), CountMode.AGGREGATED)
+            return self.__cached(pipeline, lambda: self.__aggregate_count(pipeline))
+
+        if not query_filter:
+            return CountResult(self.database_manager.estimated_count(self.collection), CountMode.ESTIMATED)
+
+        if self.is_indexed(query_filter):
+            return CountResult(self.database_manager.count(self.collection, query_filter), CountMode.INDEXED)
+
+        if not use_cache:
+            return CountResult(self.database_manager.count(self.collection, query_filter), CountMode.AGGREGATED)
+
+        return self.__cached(query_filter, lambda: self.database_manager.count(self.collection, query_filter))
+
+
+    def to_filter(self, criteria: Union[dict, list[dict]]) -> Optional[dict]:
+        """
+        Converts the criteria of a request into a filter for `count_documents`
+
+        Args:
+            criteria (Union[dict, list[dict]]): Filter or list of pipeline stages
+
+        Returns:
+            Optional[dict]: The filter or None if the criteria contains other stages than `$match`,
+                            operators which can not be counted or fields created by lookups
+        """
+        if not criteria:
+            return {}
+
+        if isinstance(criteria, dict):
+            conditions = [criteria]
+        else:
+            conditions = []
+
+            for stage in criteria:
+                if not isinstance(stage, dict) or list(stage.keys()) != ['$match']:
+                    return None
+                conditions.append(stage['$match'])
+
+        conditions = [condition for condition in conditions if condition]
+
+        for condition in conditions:
+            for field in self.__fields(condition):
+                if field in UNSUPPORTED_COUNT_OPERATORS or field.split('.')[0] in self.lookup_fields:
+                    return None
+
+        if not conditions:
+            return {}
+
+        return conditions[0] if len(conditions) == 1 else {'$and': conditions}
+
+
+    def is_indexed(self, query_filter: dict) -> bool:
+        """
+        Checks if all fields of the filter can be used to walk an index of the collection. A field is usable if it
+        is a key of an index whose preceding keys are also part of the filter (the leading key of an index or
+        a prefix of a compound index)
+
+        Args:
+            query_filter (dict): Filter for `count_documents`
+
+        Returns:
+            bool: True if every field of the filter is indexed
+        """
+        index_keys = self.__get_index_keys()
+
+        if index_keys is None:
+            return False
+
+        fields = self.__fields(query_filter)
+
+        return all(
+            any(field in keys and set(keys[:keys.index(field)]) <= fields for keys in index_keys)
+            for field in fields
+        )
+
+
+    @classmethod
+    def invalidate_indexes(cls, collection: str = None) -> None:
+        """
+        Removes the cached indexes of a collection, must be called after indexes were created or dropped
+
+        Args:
+            collection (str, optional): Name of the collection, the indexes of all collections are removed if not set
+        """
+        if collection is None:
+            cls.__index_keys.clear()
+        else:
+            cls.__index_keys.pop(collection, None)
+
+# ------------------------------------------------- HELPER FUNCTIONS ------------------------------------------------- #
+
+    def __get_index_keys(self) -> Optional[list[tuple]]:
+        """Returns the key fields of each index of the collection, None if the indexes could not be loaded"""
+        entry = CountStrategy.__index_keys.get(self.collection)
+
+        if entry is None or entry[1] < time.monotonic():
+            try:
+                index_info = self.database_manager.get_index_info(self.collection)
+            except Exception as err:
+                LOGGER.debug("Could not load the indexes of '%s': %s", self.collection, err)
+                return None
+
+            entry = ([tuple(key[0] for key in index.get('key', [])) for index in index_info.values()],
+                     time.monotonic() + self.INDEX_TTL)
+            CountStrategy.__index_keys[self.collection] = entry
+
+        return entry[0]
+
+
+    def __cached(self, query: Union[dict, list], counter) -> CountResult:
+        """Returns the total from the cache or counts and stores it"""
+        key = self.cache.make_key(self.collection, query)
+        total = self.cache.get(key)
+
+        if total is not None:
+            return CountResult(total, CountMode.CACHED)
+
+        total = counter()
+        self.cache.set(key, total)
+
+        return CountResult(total, CountMode.AGGREGATED)
+
+
+    def __aggregate_count(self, pipeline: list[dict]) -> int:
+        """Executes a count pipeline and returns the total"""
+        total = 0
+
+        for result in self.database_manager.aggregate(self.collection, pipeline):
+            total = result['total']
+
+        return total
+
+
+    @staticmethod
+    def __fields(condition) -> set:
+        """Collects all field names and operators of a filter"""
+        fields = set()
+
+        if isinstance(condition, dict):
+            for key, value in condition.items():
+                if key.startswith('$'):
+                    if key in UNSUPPORTED_COUNT_OPERATORS:
+                        fields.add(key)
+                    if key in ('$and', '$or', '$nor'):
+                        for sub_condition in value:
+                            fields |= CountStrategy.__fields(sub_condition)
+                    elif key == '$expr':
+                        fields.add(key)
+                else:
+                    fields.add(key)
+        elif isinstance(condition, list):
+            for sub_condition in condition:
+                fields |= CountStrategy.__fields(sub_condition)
+
+        return fields
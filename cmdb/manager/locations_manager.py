@@ -16,23 +16,29 @@
 """
 This module contains the implementation of the LocationsManager
 """
+import json
 import logging
 
 from queue import Queue
 from typing import Union
 
+from pymongo import UpdateOne
+
 from cmdb.database.mongo_database_manager import MongoDatabaseManager
 from cmdb.framework.managers.type_manager import TypeManager
 
 from cmdb.event_management.event import Event
-from cmdb.framework import CmdbLocation
+from cmdb.framework import CmdbLocation, TypeModel
+from cmdb.framework.models.location_node import LocationNode
 from cmdb.framework.results.iteration import IterationResult
 from cmdb.security.acl.permission import AccessControlPermission
 from cmdb.user_management import UserModel
 
-from cmdb.errors.manager import ManagerInsertError, ManagerGetError, ManagerIterationError
+from cmdb.errors.manager import ManagerInsertError, ManagerGetError, ManagerIterationError, ManagerUpdateError
 
 from .base_manager import BaseManager
+from .count_strategy import count_cache
+from .tree_cache import tree_cache
 from .query_builder.base_query_builder import BaseQueryBuilder
 from .query_builder.builder_parameters import BuilderParameters
 # -------------------------------------------------------------------------------------------------------------------- #
@@ -69,6 +75,7 @@ def insert_location(self, data: dict) -> int:
             Public ID of the new object in database
         """
         try:
+            data['path'] = self.get_ancestor_path(data.get('parent'))
             ack = self.insert(data)
         except Exception as err:
             raise ManagerInsertError(err) from err
@@ -98,17 +105,15 @@ def iterate(self,
             count_query: list[dict] = self.query_builder.count(builder_params.get_criteria())
 
             aggregation_result = list(self.aggregate(query))
-            total_cursor = self.aggregate(count_query)
-
-            total = 0
-            while total_cursor.alive:
-                total = next(total_cursor)['total']
+            count_result = self.count_total(builder_params.get_criteria(), count_query)
 
         except ManagerGetError as err:
             raise ManagerIterationError(err) from err
 
         try:
-            iteration_result: IterationResult[CmdbLocation] = IterationResult(aggregation_result, total)
+            iteration_result: IterationResult[CmdbLocation] = IterationResult(aggregation_result,
+                                                                              count_result.total,
+                                                                              count_result.exact)
             iteration_result.convert_to(CmdbLocation)
         except Exception as err:
             raise ManagerIterationError(err) from err
@@ -116,6 +121,33 @@ def iterate(self,
         return iteration_result
 
 
+    def get_tree(self, builder_params: BuilderParameters) -> tuple[list[dict], int, bool]:
+        """
+        Returns the serialised location tree below the root location, the tree is served from the
+        tree cache until a location is changed
+
+        Args:
+            builder_params (BuilderParameters): Contains input to identify the target of action
+
+        Raises:
+            ManagerIterationError: If the locations could not be loaded
+
+        Returns:
+            tuple[list[dict], int, bool]: The top level nodes, the total of the locations and if the total is exact
+        """
+        key = json.dumps([builder_params.get_criteria(), builder_params.get_limit(), builder_params.get_skip(),
+                          builder_params.get_sort(), builder_params.get_order()], sort_keys=True, default=str)
+
+        def build_tree() -> tuple[list[dict], int, bool]:
+            iteration_result: IterationResult[CmdbLocation] = self.iterate(builder_params)
+            root_nodes = LocationNode.build_tree([location.__dict__ for location in iteration_result.results])
+
+            return ([LocationNode.to_json(node) for node in root_nodes], iteration_result.total,
+                    iteration_result.total_exact)
+
+        return tree_cache.get(self.collection, key, build_tree)
+
+
     def get_location(self, public_id: int) -> CmdbLocation:
         """
         Retrives a location with the given public_id
@@ -181,34 +213,194 @@ def get_locations_by(self, **requirements):
 
         return locations_list
 
+    def get_descendants(self, public_id: int) -> list[CmdbLocation]:
+        """
+        Retrieves all locations below a location with a single indexed query on the materialised path
+
+        Args:
+            public_id (int): public_id of the location
+
+        Returns:
+            list[CmdbLocation]: All locations of the subtree without the location itself
+        """
+        return self.get_locations_by(path=public_id)
+
+# --------------------------------------------------- CRUD - UPDATE -------------------------------------------------- #
+
+    def update_location_for_object(self, object_id: int, data: dict):
+        """
+        Updates the location of an object, if the parent changed the location is moved together with its subtree
+
+        Args:
+            object_id (int): public_id of the object
+            data (dict): new values of the location
+
+        Raises:
+            ManagerUpdateError: If the location does not exist or would be moved below itself
+
+        Returns:
+            UpdateResult: Acknowledgment of the database for the location
+        """
+        try:
+            location = self.get_location_for_object(object_id)
+        except ManagerGetError as err:
+            raise ManagerUpdateError(err) from err
+
+        if not location:
+            raise ManagerUpdateError(f'No location for object with ID: {object_id}')
+
+        if 'parent' not in data or data['parent'] == location.parent:
+            return self.update({'public_id': location.public_id}, data)
+
+        try:
+            new_path = self.get_ancestor_path(data['parent'])
+        except ManagerGetError as err:
+            raise ManagerUpdateError(err) from err
+
+        if location.public_id in new_path:
+            raise ManagerUpdateError('A location can not be moved below itself!')
+
+        result = self.update({'public_id': location.public_id}, {**data, 'path': new_path})
+        self.move_descendants(location.public_id, new_path)
+
+        return result
+
+
+    def move_descendants(self, public_id: int, new_path: list[int]) -> None:
+        """
+        Replaces the ancestors above a location in the paths of its whole subtree with one pipeline update
+
+        Args:
+            public_id (int): public_id of the moved location
+            new_path (list[int]): new path of the moved location
+        """
+        # the path of a descendant is the path of the moved location followed by the part starting at it
+        relative_path = {
+            '$slice': [
+                '$path',
+                {'$indexOfArray': ['$path', public_id]},
+                {'$size': '$path'}
+            ]
+        }
+
+        try:
+            self.dbm.update_with_pipeline(self.collection, {'path': public_id},
+                                          [{'$set': {'path': {'$concatArrays': [{'$literal': new_path},
+                                                                                relative_path]}}}])
+            count_cache.invalidate(self.collection)
+        except Exception as err:
+            raise ManagerUpdateError(err) from err
+
+
+    def rebuild_paths(self) -> int:
+        """
+        Regenerates the materialised paths of all locations from their parents
+
+        Returns:
+            int: Number of updated locations
+        """
+        parents = {location['public_id']: location.get('parent')
+                   for location in self.get({}, projection={'_id': 0, 'public_id': 1, 'parent': 1})}
+        paths: dict[int, list[int]] = {}
+
+        def build_path(public_id: int) -> list[int]:
+            path = []
+            current = parents.get(public_id)
+
+            # walk up until a location whose path is known or the root, cycles are cut off
+            while current in parents and current not in path and current not in paths:
+                path.insert(0, current)
+                current = parents.get(current)
+
+            if current in paths:
+                path = paths[current] + [current] + path
+
+            return path
+
+        for public_id in parents:
+            paths[public_id] = build_path(public_id)
+
+        requests = [UpdateOne({'public_id': public_id}, {'$set': {'path': path}}) for public_id, path in paths.items()]
+
+        if requests:
+            try:
+                self.dbm.bulk_write(self.collection, requests)
+                count_cache.invalidate(self.collection)
+            except Exception as err:
+                raise ManagerUpdateError(err) from err
+
+        return len(requests)
+
+
+    def update_type_data(self, type_: TypeModel):
+        """
+        Copies the label, icon and parent selectability of a type into all locations of its objects
+        with a single update keyed on the type_id
+
+        Args:
+            type_ (TypeModel): The updated type
+
+        Raises:
+            ManagerUpdateError: If the locations could not be updated
+
+        Returns:
+            UpdateResult: Acknowledgment of the database
+        """
+        return self.update_many({'type_id': type_.public_id}, self.get_type_data(type_))
+
+# --------------------------------------------------- CRUD - DELETE -------------------------------------------------- #
+
+    def delete_descendants(self, public_id: int) -> int:
+        """
+        Deletes all locations below a location with a single query on the materialised path
+
+        Args:
+            public_id (int): public_id of the location
+
+        Returns:
+            int: Number of deleted locations
+        """
+        return self.delete_many({'path': public_id})
+
 # ------------------------------------------------- HELPER FUNCTIONS ------------------------------------------------- #
 
-    def get_all_children(self, public_id: int, all_locations: dict):
+    @staticmethod
+    def get_type_data(type_: TypeModel) -> dict:
         """
-        Retrieves all children for a given location with the public_id
+        Returns the data of a type which is stored in the locations of its objects
 
         Args:
-            public_id (int): public_id of the parent location
-            all_locations (dict): all locations from db
+            type_ (TypeModel): The type of the located objects
 
         Returns:
-            (list[dict]): Returns all child locations
+            dict: type_label, type_icon and type_selectable of the locations
+        """
+        return {
+            'type_label': type_.label,
+            'type_icon': type_.render_meta.icon,
+            'type_selectable': type_.selectable_as_parent
+        }
+
+
+    def get_ancestor_path(self, parent: int) -> list[int]:
         """
-        found_children: list[dict] = []
-        recursive_children: list[dict] = []
+        Returns the materialised path of a new child of a location
 
-        # add direct children
-        for location in all_locations:
-            if location['parent'] == public_id:
-                found_children.append(location)
+        Args:
+            parent (int): public_id of the parent location
+
+        Raises:
+            ManagerGetError: If the parent location does not exist
+
+        Returns:
+            list[int]: public_ids of all ancestors of the child, starting with the root location
+        """
+        if not parent:
+            return []
 
-        # search recursive for all children
-        if len(found_children) > 0:
-            for child in found_children:
-                recursive_children = self.get_all_children(child['public_id'], all_locations)
+        parent_location = self.get_one_by({'public_id': parent})
 
-                # add recursive children to found_children
-                if len(recursive_children) > 0:
-                    found_children += recursive_children
+        if not parent_location:
+            raise ManagerGetError(f'Parent location with ID: {parent} not found!')
 
-        return found_children
+        return parent_location.get('path', []) + [parent]
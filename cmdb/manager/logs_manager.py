@@ -27,11 +27,12 @@
 from cmdb.event_management.event import Event
 from cmdb.framework import CmdbMetaLog, CmdbLog
 from cmdb.framework.models.log import CmdbObjectLog, LogAction
+from cmdb.framework.object_states import apply_delta, object_delta
 from cmdb.framework.results.iteration import IterationResult
 from cmdb.security.acl.permission import AccessControlPermission
 from cmdb.user_management import UserModel
 
-from cmdb.errors.manager import ManagerGetError, ManagerIterationError, ManagerInsertError
+from cmdb.errors.manager import ManagerGetError, ManagerIterationError, ManagerInsertError, ManagerUpdateError
 
 from .base_manager import BaseManager
 from .query_builder.base_query_builder import BaseQueryBuilder
@@ -67,6 +68,7 @@ def insert_log(self, action: LogAction, log_type: str, *args, **kwargs) -> int:
         Args:
             action (LogAction): The action of the log
             log_type (str): The log type
+            object_state (dict, optional): Raw state of the object after the action (see `object_state`)
 
         Returns:
             int: New public_id
@@ -80,6 +82,8 @@ def insert_log(self, action: LogAction, log_type: str, *args, **kwargs) -> int:
         log_init['log_type'] = log_type
         log_init['log_time'] = datetime.now(timezone.utc)
         log_data = {**log_init, **kwargs}
+        self.__store_states([log_data])
+        self.__set_existence(action, [log_data])
 
         try:
             new_log = CmdbLog(**log_data)
@@ -89,6 +93,42 @@ def insert_log(self, action: LogAction, log_type: str, *args, **kwargs) -> int:
 
         return ack
 
+
+    def insert_logs(self, action: LogAction, log_type: str, logs: list[dict]) -> list[int]:
+        """
+        Creates several logs of the same action with a single database call
+
+        Args:
+            action (LogAction): The action of the logs
+            log_type (str): The log type
+            logs (list[dict]): Data of each log (same keyword arguments as `insert_log`)
+
+        Returns:
+            list[int]: New public_ids
+        """
+        if not logs:
+            return []
+
+        log_time = datetime.now(timezone.utc)
+        next_public_id = self.dbm.reserve_public_ids(self.collection, len(logs))
+        logs_data = [{
+            'public_id': next_public_id + offset,
+            'action': action.value,
+            'action_name': action.name,
+            'log_type': log_type,
+            'log_time': log_time,
+            **log
+        } for offset, log in enumerate(logs)]
+
+        self.__store_states(logs_data)
+        self.__set_existence(action, logs_data)
+        new_logs = [CmdbObjectLog.to_json(CmdbLog(**log_data)) for log_data in logs_data]
+
+        try:
+            return self.insert_many(new_logs)
+        except ManagerInsertError as err:
+            raise ManagerInsertError(err) from err
+
 # ---------------------------------------------------- CRUD - READ --------------------------------------------------- #
 
     def iterate(self,
@@ -112,19 +152,243 @@ def iterate(self,
             count_query: list[dict] = self.query_builder.count(builder_params.get_criteria())
 
             aggregation_result = list(self.aggregate(query))
-            total_cursor = self.aggregate(count_query)
-
-            total = 0
-            while total_cursor.alive:
-                total = next(total_cursor)['total']
+            count_result = self.count_total(builder_params.get_criteria(), count_query)
 
         except ManagerGetError as err:
             raise ManagerIterationError(err) from err
 
         try:
-            iteration_result: IterationResult[CmdbMetaLog] = IterationResult(aggregation_result, total)
+            iteration_result: IterationResult[CmdbMetaLog] = IterationResult(aggregation_result,
+                                                                             count_result.total,
+                                                                             count_result.exact)
             iteration_result.convert_to(CmdbObjectLog)
         except Exception as err:
             raise ManagerIterationError(err) from err
 
         return iteration_result
+
+
+    def get_object_states(self, logs: list[dict]) -> dict[int, dict]:
+        """
+        Reconstructs the state of the objects at several logs, the logs of each object are loaded with one query
+        from the first required snapshot on
+
+        Args:
+            logs (list[dict]): Logs as json (see `CmdbObjectLog.to_json`)
+
+        Raises:
+            ManagerGetError: If the logs of an object could not be loaded
+
+        Returns:
+            dict[int, dict]: State of the object by the public_id of the log, logs without a state
+                             (logs with a `render_state`, logs whose snapshot was deleted) are missing
+        """
+        states: dict[int, dict] = {}
+        logs_by_object: dict[int, list[dict]] = {}
+
+        for log in logs:
+            if log.get('snapshot') is not None:
+                states[log['public_id']] = log['snapshot']
+            elif log.get('snapshot_id') is not None:
+                logs_by_object.setdefault(log['object_id'], []).append(log)
+
+        for object_id, object_logs in logs_by_object.items():
+            requested = {log['public_id'] for log in object_logs}
+            criteria = {
+                'object_id': object_id,
+                'public_id': {'$gte': min(log['snapshot_id'] for log in object_logs), '$lte': max(requested)}
+            }
+            state = None
+
+            for log in self.get(criteria, sort=[('public_id', 1)],
+                                projection={'_id': 0, 'public_id': 1, 'snapshot': 1, 'delta': 1}):
+                if log.get('snapshot') is not None:
+                    state = log['snapshot']
+                elif state is not None and log.get('delta') is not None:
+                    state = apply_delta(state, log['delta'])
+
+                if state is not None and log['public_id'] in requested:
+                    states[log['public_id']] = state
+
+        return states
+
+# --------------------------------------------------- CRUD - UPDATE -------------------------------------------------- #
+
+    def set_objects_exist(self, object_ids: list[int], object_exists: bool) -> None:
+        """
+        Sets the `object_exists` flag of all logs of the objects
+
+        Args:
+            object_ids (list[int]): public_ids of the objects
+            object_exists (bool): False if the objects were deleted, True if they were created again
+
+        Raises:
+            ManagerUpdateError: If the logs could not be updated
+        """
+        if not object_ids:
+            return
+
+        self.update_many({'object_exists': not object_exists, 'object_id': {'$in': list(object_ids)}},
+                         {'object_exists': object_exists})
+
+
+    def compact_snapshots(self, last_public_id: int) -> int:
+        """
+        Prepares the deletion of all object logs up to `last_public_id`. Objects whose first remaining log is a
+        delta based on a snapshot which is deleted get a new snapshot in this log, the following deltas of the
+        chain are moved to the new snapshot.
+
+        Args:
+            last_public_id (int): public_id of the last log which is deleted
+
+        Raises:
+            ManagerIterationError: If the first remaining logs could not be loaded
+            ManagerGetError: If the states of the logs could not be reconstructed
+            ManagerUpdateError: If a snapshot could not be stored
+
+        Returns:
+            int: Number of new snapshots
+        """
+        first_logs = [entry['log'] for entry in self.aggregate([
+            {'$match': {'log_type': CmdbObjectLog.__name__,
+                        'public_id': {'$gt': last_public_id},
+                        'snapshot_id': {'$lte': last_public_id}}},
+            {'$sort': {'public_id': 1}},
+            {'$group': {'_id': '$object_id', 'log': {'$first': '$$ROOT'}}}
+        ])]
+        states = self.get_object_states(first_logs)
+        snapshots = 0
+
+        for log in first_logs:
+            state = states.get(log['public_id'])
+
+            if state is None:
+                LOGGER.warning("The state of log %s could not be reconstructed", log['public_id'])
+                continue
+
+            self.update({'public_id': log['public_id']},
+                        {'snapshot': state, 'delta': None, 'snapshot_id': log['public_id'], 'snapshot_distance': 0})
+            # the distances of the following deltas stay an upper bound, their next snapshot is stored earlier
+            self.update_many({'object_id': log['object_id'],
+                              'snapshot_id': log['snapshot_id'],
+                              'public_id': {'$gt': log['public_id']}},
+                             {'snapshot_id': log['public_id']})
+            snapshots += 1
+
+        return snapshots
+
+# ------------------------------------------------- HELPER FUNCTIONS ------------------------------------------------- #
+
+    def __set_existence(self, action: LogAction, logs: list[dict]) -> None:
+        """
+        Sets the `object_exists` flag of new object logs. If objects are created with the public_id of a deleted
+        object, the older logs of the public_id are marked as existing again.
+
+        Args:
+            action (LogAction): The action of the logs
+            logs (list[dict]): Data of the new logs
+        """
+        object_logs = [log for log in logs if log.get('object_id') is not None]
+
+        for log in object_logs:
+            log.setdefault('object_exists', action != LogAction.DELETE)
+
+        if action == LogAction.CREATE and object_logs:
+            try:
+                self.set_objects_exist([log['object_id'] for log in object_logs], True)
+            except ManagerUpdateError as err:
+                LOGGER.warning("Could not mark the logs of the recreated objects as existing: %s", err)
+
+
+    def __store_states(self, logs: list[dict]) -> None:
+        """
+        Decides for each log if the state of its object is stored as a snapshot or as a delta to the previous
+        log of the object. Creates and deletes always store a snapshot, otherwise a snapshot is stored after
+        `SNAPSHOT_INTERVAL` deltas.
+
+        The delta is calculated against the state reconstructed from the previous logs and not against the
+        object before the action, so writes which do not create a log (e.g. migrations of the type, cleared
+        references) are part of the next delta instead of being lost in the reconstructed history.
+
+        Args:
+            logs (list[dict]): Data of the logs in the order of their public_ids, `object_state` is replaced
+                               by the stored `snapshot` or `delta`
+        """
+        stateful = [log for log in logs if log.get('object_state') is not None]
+
+        if not stateful:
+            return
+
+        positions = self.__get_snapshot_positions(list({log['object_id'] for log in stateful}))
+        logged_states = self.__get_logged_states(positions)
+
+        for log in stateful:
+            state = log.pop('object_state')
+            position = positions.get(log['object_id'])
+            logged_state = logged_states.get(log['object_id'])
+
+            if position is None or logged_state is None \
+                or log['action'] in (LogAction.CREATE.value, LogAction.DELETE.value) \
+                or position[1] + 1 >= CmdbObjectLog.SNAPSHOT_INTERVAL:
+                log['snapshot'] = state
+                log['snapshot_id'] = log['public_id']
+                log['snapshot_distance'] = 0
+            else:
+                log['delta'] = object_delta(logged_state, state)
+                log['snapshot_id'] = position[0]
+                log['snapshot_distance'] = position[1] + 1
+
+            positions[log['object_id']] = (log['snapshot_id'], log['snapshot_distance'])
+            logged_states[log['object_id']] = state
+
+
+    def __get_logged_states(self, positions: dict[int, tuple[int, int]]) -> dict[int, dict]:
+        """
+        Reconstructs the state of the latest log of each object with one query, starting at its snapshot
+
+        Args:
+            positions (dict[int, tuple[int, int]]): snapshot_id and snapshot_distance of the latest log by object
+
+        Returns:
+            dict[int, dict]: State of the latest log by object_id, objects whose state could not be
+                             reconstructed are missing
+        """
+        if not positions:
+            return {}
+
+        states: dict[int, dict] = {}
+
+        try:
+            chains = self.get({'$or': [{'object_id': object_id, 'public_id': {'$gte': snapshot_id}}
+                                       for object_id, (snapshot_id, _) in positions.items()]},
+                              sort=[('object_id', 1), ('public_id', 1)],
+                              projection={'_id': 0, 'object_id': 1, 'snapshot': 1, 'delta': 1})
+
+            for log in chains:
+                if log.get('snapshot') is not None:
+                    states[log['object_id']] = log['snapshot']
+                elif log['object_id'] in states and log.get('delta') is not None:
+                    states[log['object_id']] = apply_delta(states[log['object_id']], log['delta'])
+        except Exception as err:
+            LOGGER.warning("Could not reconstruct the latest states of the objects, snapshots are stored: %s", err)
+            return {}
+
+        return states
+
+
+    def __get_snapshot_positions(self, object_ids: list[int]) -> dict[int, tuple[int, int]]:
+        """Returns the snapshot_id and the snapshot_distance of the latest log of each object"""
+        try:
+            latest_logs = self.aggregate([
+                {'$match': {'object_id': {'$in': object_ids}}},
+                {'$sort': {'object_id': 1, 'public_id': -1}},
+                {'$group': {'_id': '$object_id',
+                            'snapshot_id': {'$first': '$snapshot_id'},
+                            'snapshot_distance': {'$first': '$snapshot_distance'}}}
+            ])
+        except ManagerIterationError as err:
+            LOGGER.warning("Could not load the latest logs of the objects, snapshots are stored: %s", err)
+            return {}
+
+        return {log['_id']: (log['snapshot_id'], log['snapshot_distance']) for log in latest_logs
+                if log.get('snapshot_id') is not None}
@@ -20,7 +20,8 @@
 from cmdb.framework.results import IterationResult
 from cmdb.framework.results.list import ListResult
 from cmdb.framework.utils import Collection, PublicID
-from cmdb.manager import AbstractManagerBase
+from cmdb.manager import AbstractManagerBase, ManagerIterationError
+from cmdb.manager.count_strategy import CountStrategy, CountResult
 from cmdb.search import Query, Pipeline
 from cmdb.manager.query_builder.builder import Builder
 # -------------------------------------------------------------------------------------------------------------------- #
@@ -129,6 +130,23 @@ def iterate(self, filter: dict, limit: int, skip: int, sort: str, order: int, *a
         raise NotImplementedError
 
 
+    def count_total(self, filter: Union[List[dict], dict], count_query: Pipeline, *args, **kwargs) -> CountResult:
+        """
+        Counts the total number of documents of a list request with the cheapest strategy
+
+        Args:
+            filter: dict or list of dict query/queries which the elements have to match
+            count_query: Count pipeline which is used if the filter can not be counted directly
+
+        Returns:
+            CountResult: Total of the request and whether it is exact
+        """
+        try:
+            return CountStrategy(self._database_manager, self.collection).count(filter, pipeline=count_query)
+        except Exception as err:
+            raise ManagerIterationError(err) from err
+
+
     def find(self, filter: dict, *args, **kwargs) -> ListResult:
         """TODO: document"""
         raise NotImplementedError
@@ -21,11 +21,14 @@
 from typing import Union
 from datetime import datetime, timezone
 
+from pymongo.errors import BulkWriteError
+
 from cmdb.database.mongo_database_manager import MongoDatabaseManager
-from cmdb.framework.cmdb_object_manager import CmdbObjectManager
+from cmdb.framework.cmdb_object_manager import CmdbObjectManager, verify_access
+from cmdb.framework.managers.type_manager import TypeManager
 
 from cmdb.event_management.event import Event
-from cmdb.framework import ObjectLinkModel
+from cmdb.framework import CmdbObject, ObjectLinkModel
 from cmdb.security.acl.permission import AccessControlPermission
 from cmdb.user_management import UserModel
 from cmdb.framework.results import IterationResult
@@ -38,6 +41,9 @@
 # -------------------------------------------------------------------------------------------------------------------- #
 LOGGER = logging.getLogger(__name__)
 
+# Error code of a write which violates the unique index on primary and secondary
+DUPLICATE_KEY_ERROR = 11000
+
 
 class ObjectLinksManager(BaseManager):
     """
@@ -56,6 +62,7 @@ def __init__(self, dbm: MongoDatabaseManager, event_queue: Union[Queue, Event] =
         self.event_queue = event_queue
         self.query_builder = BaseQueryBuilder()
         self.object_manager = CmdbObjectManager(dbm)  # TODO: Replace when object api is updated
+        self.type_manager = TypeManager(dbm)
         super().__init__(ObjectLinkModel.COLLECTION, dbm)
 
 
@@ -93,6 +100,73 @@ def insert_object_link(self,
 
         return new_public_id
 
+
+    def insert_object_links(self,
+                            links: list[dict],
+                            user: UserModel = None,
+                            permission: AccessControlPermission = AccessControlPermission.CREATE
+                            ) -> tuple[list[int], list[dict]]:
+        """
+        Insert several object links with a single database call. Links which occur twice in the request or
+        already exist are skipped, existing links are detected by the unique index on primary and secondary
+
+        Args:
+            links (list[dict]): Raw data of the links
+            user: User requesting this operation
+            permission: acl permission
+        Raises:
+            ManagerInsertError: If a link is invalid or the links could not be inserted
+            ManagerGetError: If an object of the links does not exist
+            AccessDeniedError: If the user has no access to an object of the links
+        Returns:
+            tuple[list[int], list[dict]]: The public_ids of the new inserted links and the skipped links
+        """
+        creation_time = datetime.now(timezone.utc)
+        new_links: dict[tuple, dict] = {}
+        skipped: list[dict] = []
+
+        for link in links:
+            try:
+                primary, secondary = int(link['primary']), int(link['secondary'])
+            except (KeyError, TypeError, ValueError) as err:
+                raise ManagerInsertError(f'Invalid object link: {link}') from err
+
+            if primary == secondary:
+                raise ManagerInsertError(f'Same link IDs: {primary}/{secondary}')
+
+            if (primary, secondary) in new_links:
+                skipped.append({'primary': primary, 'secondary': secondary})
+                continue
+
+            new_links[(primary, secondary)] = {'primary': primary,
+                                               'secondary': secondary,
+                                               'creation_time': creation_time}
+
+        if not new_links:
+            return [], skipped
+
+        if user and permission:
+            self.verify_objects_access({public_id for pair in new_links for public_id in pair}, user, permission)
+
+        documents = list(new_links.values())
+
+        try:
+            return self.insert_many(documents), skipped
+        except ManagerInsertError as err:
+            if not isinstance(err.__cause__, BulkWriteError):
+                raise
+
+            write_errors = err.__cause__.details.get('writeErrors', [])
+
+            if not write_errors or any(error.get('code') != DUPLICATE_KEY_ERROR for error in write_errors):
+                raise
+
+            failed = {error['index'] for error in write_errors}
+            skipped += [{'primary': documents[index]['primary'], 'secondary': documents[index]['secondary']}
+                        for index in sorted(failed)]
+
+            return [document['public_id'] for index, document in enumerate(documents) if index not in failed], skipped
+
 # ---------------------------------------------------- CRUD - READ --------------------------------------------------- #
 
     def iterate(self,
@@ -108,17 +182,15 @@ def iterate(self,
 
             aggregation_result = list(self.aggregate(query))
 
-            total_cursor = self.aggregate(count_query)
-
-            total = 0
-            while total_cursor.alive:
-                total = next(total_cursor)['total']
+            count_result = self.count_total(builder_params.get_criteria(), count_query)
 
         except ManagerGetError as err:
             raise ManagerIterationError(err) from err
 
         try:
-            iteration_result: IterationResult[ObjectLinkModel] = IterationResult(aggregation_result, total)
+            iteration_result: IterationResult[ObjectLinkModel] = IterationResult(aggregation_result,
+                                                                                 count_result.total,
+                                                                                 count_result.exact)
             iteration_result.convert_to(ObjectLinkModel)
         except Exception as err:
             raise ManagerIterationError(err) from err
@@ -182,3 +254,57 @@ def delete_object_link(self,
             return link
         except Exception as err:
             raise ManagerDeleteError(err) from err
+
+
+    def delete_links_of_objects(self,
+                                public_ids: list[int],
+                                user: UserModel = None,
+                                permission: AccessControlPermission = AccessControlPermission.DELETE) -> int:
+        """
+        Delete all object links touching one of the objects with a single query
+
+        Args:
+            public_ids (list[int]): public_ids of the objects
+            user: User requesting this operation
+            permission: acl permission
+        Raises:
+            ManagerGetError: If one of the objects does not exist
+            AccessDeniedError: If the user has no access to one of the objects
+            ManagerDeleteError: If the links could not be deleted
+        Returns:
+            int: Number of deleted links
+        """
+        if not public_ids:
+            return 0
+
+        if user and permission:
+            self.verify_objects_access(set(public_ids), user, permission)
+
+        return self.delete_many({'$or': [{'primary': {'$in': public_ids}}, {'secondary': {'$in': public_ids}}]})
+
+# ------------------------------------------------- HELPER FUNCTIONS ------------------------------------------------- #
+
+    def verify_objects_access(self, public_ids: set[int], user: UserModel, permission: AccessControlPermission):
+        """
+        Checks the access to several objects by loading them and their types once
+
+        Args:
+            public_ids (set[int]): public_ids of the objects
+            user: User requesting this operation
+            permission: acl permission
+        Raises:
+            ManagerGetError: If one of the objects does not exist
+            AccessDeniedError: If the user has no access to one of the objects
+        """
+        objects = list(self.dbm.find(CmdbObject.COLLECTION,
+                                     {'public_id': {'$in': list(public_ids)}},
+                                     projection={'_id': 0, 'public_id': 1, 'type_id': 1}))
+        missing = public_ids - {object_['public_id'] for object_ in objects}
+
+        if missing:
+            raise ManagerGetError(f'Objects with IDs: {sorted(missing)} not found!')
+
+        type_ids = list({object_['type_id'] for object_ in objects})
+
+        for type_ in self.type_manager.find({'public_id': {'$in': type_ids}}).results:
+            verify_access(type_, user, permission)
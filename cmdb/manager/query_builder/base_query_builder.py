@@ -123,7 +123,7 @@ def __init_query(self, criteria: Union[dict, list[dict]]) -> list[dict]:
         return query
 
 
-    def prepare_log_query(self, object_exists: bool = True) -> list[dict]:
+    def prepare_log_query(self, object_exists: bool = True) -> dict:
         """
         Prepares the query for logs
 
@@ -131,25 +131,12 @@ def prepare_log_query(self, object_exists: bool = True) -> list[dict]:
             object_exists (bool): If the referenced object of the log still exists
 
         Returns:
-            list[dict]: the prepared query for object logs
+            dict: the filter for object logs, served by the `object_exists` index of the logs
         """
-        query = []
-
-        query.append({'$match': {
+        return {
             'log_type': CmdbObjectLog.__name__,
             'action': {
                 '$ne': LogAction.DELETE.value
-            }
-        }})
-
-        query.append({"$lookup": {
-            "from": "framework.objects",
-            "let": {"ref_id": "$object_id"},
-            "pipeline": [{'$match': {'$expr': {'$eq': ["$public_id", '$$ref_id']}}}],
-            "as": "object"
-        }})
-
-        query.append({'$unwind': {'path': '$object', 'preserveNullAndEmptyArrays': True}})
-        query.append({'$match': {'object': {'$exists': object_exists}}})
-
-        return query
+            },
+            'object_exists': object_exists
+        }
@@ -19,7 +19,6 @@
 import logging
 from queue import Queue
 from typing import Union
-from deepdiff import DeepDiff
 
 from cmdb.database.mongo_database_manager import MongoDatabaseManager
 from cmdb.framework.managers.type_manager import TypeManager
@@ -31,14 +30,16 @@
 from cmdb.framework.models.type_model import TypeFieldSection
 from cmdb.framework import CmdbSectionTemplate
 from cmdb.framework.cmdb_object import CmdbObject
+from cmdb.framework.field_diff import diff_fields
 from cmdb.framework.results import IterationResult
 from cmdb.framework.results.list import ListResult
 from cmdb.security.acl.permission import AccessControlPermission
 from cmdb.user_management import UserModel
 
-from cmdb.errors.manager import ManagerGetError, ManagerIterationError, ManagerInsertError
+from cmdb.errors.manager import ManagerGetError, ManagerIterationError, ManagerInsertError, ManagerUpdateError
 
 from .base_manager import BaseManager
+from .count_strategy import count_cache
 from .query_builder.base_query_builder import BaseQueryBuilder
 from .query_builder.builder_parameters import BuilderParameters
 # -------------------------------------------------------------------------------------------------------------------- #
@@ -119,17 +120,15 @@ def iterate(self,
             count_query: list[dict] = self.query_builder.count(builder_params.get_criteria())
 
             aggregation_result = list(self.aggregate(query))
-            total_cursor = self.aggregate(count_query)
-
-            total = 0
-            while total_cursor.alive:
-                total = next(total_cursor)['total']
+            count_result = self.count_total(builder_params.get_criteria(), count_query)
 
         except ManagerGetError as err:
             raise ManagerIterationError(err) from err
 
         try:
-            iteration_result: IterationResult[CmdbSectionTemplate] = IterationResult(aggregation_result, total)
+            iteration_result: IterationResult[CmdbSectionTemplate] = IterationResult(aggregation_result,
+                                                                                     count_result.total,
+                                                                                     count_result.exact)
             iteration_result.convert_to(CmdbSectionTemplate)
         except Exception as err:
             raise ManagerIterationError(err) from err
@@ -182,21 +181,13 @@ def get_global_template_usage_count(self, template_name: str, is_global: bool) -
             "global_template_ids":template_name
         }
 
-        found_types: ListResult = self.type_manager.find(type_filter)
+        type_ids = [a_type.public_id for a_type in self.type_manager.find(type_filter).results]
 
-        if len(found_types.results) == 0:
+        if len(type_ids) == 0:
             return counts
 
-        counts['types'] = len(found_types.results)
-
-        objects_count: int = 0
-
-        a_type: TypeModel
-        for a_type in found_types.results:
-            objects: list = self.cmdb_object_manager.get_objects_by_type(a_type.public_id)
-            objects_count += len(objects)
-
-        counts['objects'] = objects_count
+        counts['types'] = len(type_ids)
+        counts['objects'] = self.dbm.count(CmdbObject.COLLECTION, {'type_id': {'$in': type_ids}})
 
         return counts
 
@@ -219,6 +210,8 @@ def handle_section_template_changes(self, new_params: dict, current_template: Cm
         new_section_label: str = self.get_section_label_diff(new_params, CmdbSectionTemplate.to_json(current_template))
         field_diffs = self.get_fields_diff(new_params, CmdbSectionTemplate.to_json(current_template))
 
+        new_field_names: list[str] = [new_field['name'] for new_field in field_diffs['added']]
+
         types_to_change = self.get_types_using_template(new_params['name'])
 
         a_type: TypeModel
@@ -256,20 +249,19 @@ def handle_section_template_changes(self, new_params: dict, current_template: Cm
             for new_field in new_params['fields']:
                 a_type.fields.append(new_field)
 
-            # Delete all deleted fields from objects
-            self.cleanup_global_section_objects(a_type.public_id, field_diffs['deleted'])
-
-            # Add all new created fields to objects
-            new_field_names: list[str] = []
-
-            for new_field in field_diffs['added']:
-                new_field_names.append(new_field['name'])
-
-            self.set_new_global_template_fields(a_type.public_id, new_field_names)
-
             #Update the type changes for the type
             self.type_manager.update(a_type.public_id, a_type)
 
+        # Delete all deleted fields and add all new created fields to the objects of all types at once
+        self.update_global_section_objects([a_type.public_id for a_type in types_to_change],
+                                           field_diffs['deleted'],
+                                           new_field_names)
+
+        # Regenerate the sort keys of sortable fields which were deleted or added
+        for a_type in types_to_change:
+            if set(a_type.sortable_fields) & set(field_diffs['deleted'] + new_field_names):
+                self.type_manager.sync_sort_keys(a_type)
+
 
     def get_section_label_diff(self, new_params: dict, current_params: dict) -> str:
         """
@@ -300,56 +292,12 @@ def get_fields_diff(self, new_params: dict, current_params: dict) -> dict:
         Returns:
             dict: All added, deleted and changed fields
         """
-        deleted_fields: list[str] = []
-        added_fields: list = []
-        changed_fields: list = []
-
-        processed_field_names: list[str] = []
-        # Check for deleted fields
-        for old_field in current_params['fields']:
-            found: bool = False
-
-            for new_field in new_params['fields']:
-
-                if old_field['name'] == new_field['name']:
-                    found = True
-                    break
-
-            # The old field is not found in new params, so it has to be deleted
-            if not found:
-                processed_field_names.append(old_field['name'])
-                deleted_fields.append(old_field['name'])
-
-
-        # Check for added fields
-        for new_field in new_params['fields']:
-            found: bool = False
-
-            for old_field in current_params['fields']:
-
-                if old_field['name'] == new_field['name']:
-                    found = True
-                    break
-
-            if not found:
-                processed_field_names.append(new_field['name'])
-                added_fields.append(new_field)
-
-        # Check remaining fields if there are any changes
-        remaining_fields: list = [field for field in new_params['fields'] if field['name'] not in processed_field_names]
-
-        for remaining_field in remaining_fields:
-            for old_field in current_params['fields']:
-                # Find the changes
-                if remaining_field['name'] == old_field['name']:
-                    difference = DeepDiff(old_field, remaining_field)
-                    if len(difference) > 0:
-                        changed_fields.append(remaining_field)
+        change_set = diff_fields(current_params['fields'], new_params['fields'])
 
         return {
-            'added': added_fields,
-            'deleted': deleted_fields,
-            'changed': changed_fields
+            'added': change_set.added,
+            'deleted': [field['name'] for field in change_set.removed],
+            'changed': [change.new for change in change_set.changed]
         }
 
 
@@ -374,20 +322,13 @@ def get_types_using_template(self, template_name: str) -> list:
 
     def cleanup_global_section_objects(self, type_id: int, section_field_names: list[str]) -> None:
         """
-        Retrives all objects with the given type_id and deletes all fields provided
+        Deletes all provided fields from the objects with the given type_id
 
         Args:
             type_id (int): ID of the type for which the objects should be cleaned
             section_field_names (list[str]): List of all fields which should be deleted 
         """
-        section_objects: list = self.cmdb_object_manager.get_objects_by_type(type_id)
-
-        # remove section fields and update the objects
-        an_object: CmdbObject
-        for an_object in section_objects:
-            an_object.fields = [field for field in an_object.fields if field['name'] not in section_field_names]
-
-            self.object_manager.update(an_object.public_id, an_object)
+        self.update_global_section_objects([type_id], section_field_names, [])
 
 
     def set_new_global_template_fields(self, type_id: int, new_field_names: list[str]) -> None:
@@ -398,18 +339,48 @@ def set_new_global_template_fields(self, type_id: int, new_field_names: list[str
             type_id (int): ID of the TypeModel
             new_field_names (list[str]): List of names of new fields
         """
-        section_objects: list = self.cmdb_object_manager.get_objects_by_type(type_id)
+        self.update_global_section_objects([type_id], [], new_field_names)
 
-        an_object: CmdbObject
-        for an_object in section_objects:
 
-            for a_field_name in new_field_names:
-                an_object.fields.append({
-                    'name': a_field_name,
-                    'value': None
-                })
+    def update_global_section_objects(self, type_ids: list[int], deleted_field_names: list[str],
+                                      new_field_names: list[str]) -> None:
+        """
+        Removes the deleted fields and appends empty new fields to the objects of the types
+        with a single pipeline update, new fields which an object already has are not added again
 
-            self.object_manager.update(an_object.public_id, an_object)
+        Args:
+            type_ids (list[int]): IDs of the types whose objects should be updated
+            deleted_field_names (list[str]): List of names of deleted fields
+            new_field_names (list[str]): List of names of new fields
+
+        Raises:
+            ManagerUpdateError: If the objects could not be updated
+        """
+        if not type_ids or not (deleted_field_names or new_field_names):
+            return
+
+        kept_fields = {
+            '$filter': {
+                'input': {'$ifNull': ['$fields', []]},
+                'as': 'field',
+                'cond': {'$not': [{'$in': ['$$field.name', {'$literal': deleted_field_names}]}]}
+            }
+        }
+        missing_fields = {
+            '$filter': {
+                'input': {'$literal': [{'name': field_name, 'value': None} for field_name in new_field_names]},
+                'as': 'new_field',
+                'cond': {'$not': [{'$in': ['$$new_field.name', {'$ifNull': ['$fields.name', []]}]}]}
+            }
+        }
+
+        try:
+            self.dbm.update_with_pipeline(CmdbObject.COLLECTION,
+                                          {'type_id': {'$in': type_ids}},
+                                          [{'$set': {'fields': {'$concatArrays': [kept_fields, missing_fields]}}}])
+            count_cache.invalidate(CmdbObject.COLLECTION)
+        except Exception as err:
+            raise ManagerUpdateError(err) from err
 
 
     def cleanup_global_section_templates(self, template_name: str) -> None:
@@ -0,0 +1,145 @@
+# DATAGERRY - OpenSource Enterprise CMDB
+# Copyright (C) 2024 becon GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+Cache of serialised trees (location tree, category tree) and other data derived from a whole collection
+(e.g. the access control lists of the types)
+
+Every collection has a version which is increased on each write to it. A tree is stored together with the
+version of its collection at the time it was loaded and is only returned while that version is current, so a
+tree which was built while a write happened is never served. The versions are increased by the invalidations
+of the `CountCache`, which are triggered by all manager writes and the `cmdb.core.*` events. Writes of other
+worker processes are not seen by this process, therefore trees expire after a few seconds if the web server
+runs several workers.
+"""
+import logging
+import threading
+import time
+from typing import Any, Callable, Hashable
+
+from cmdb.manager.count_strategy import count_cache
+# -------------------------------------------------------------------------------------------------------------------- #
+
+LOGGER = logging.getLogger(__name__)
+
+# Trees which contain data of other collections, e.g. the category tree contains the types of each category
+DEPENDENT_TREES = {
+    'framework.types': ('framework.categories',),
+}
+
+
+class TreeCache:
+    """Thread safe cache for serialised trees with a version per collection"""
+
+    # Seconds after which a tree expires if this process is the only one writing
+    DEFAULT_TTL = 60
+    # Seconds after which a tree expires if other processes write, writes of them are not seen before
+    SHARED_TTL = 5
+
+    def __init__(self, ttl: int = DEFAULT_TTL):
+        """
+        Args:
+            ttl (int): Seconds after which a cached tree expires
+        """
+        self.ttl = ttl
+        self.__generation = 0
+        self.__versions: dict[str, int] = {}
+        self.__entries: dict[tuple, tuple] = {}
+        self.__lock = threading.Lock()
+
+
+    def version(self, collection: str) -> int:
+        """
+        Returns the current version of a collection
+
+        Args:
+            collection (str): Name of the collection
+
+        Returns:
+            int: Number of invalidations of the collection in this process
+        """
+        with self.__lock:
+            return self.__version(collection)
+
+
+    def get(self, collection: str, key: Hashable, build: Callable[[], Any]) -> Any:
+        """
+        Returns the cached tree of a collection, the tree is built if there is no valid entry
+
+        Args:
+            collection (str): Name of the collection the tree is built from
+            key (Hashable): Identifies the tree inside the collection (e.g. the request parameters)
+            build (Callable[[], Any]): Loads and serialises the tree
+
+        Returns:
+            Any: The serialised tree
+        """
+        cache_key = (collection, key)
+
+        with self.__lock:
+            version = self.__version(collection)
+            entry = self.__entries.get(cache_key)
+
+            if entry and entry[0] == version and entry[1] > time.monotonic():
+                return entry[2]
+
+        tree = build()
+
+        with self.__lock:
+            # a write during the build increased the version, the outdated tree is not stored
+            if self.__version(collection) == version:
+                self.__entries[cache_key] = (version, time.monotonic() + self.ttl, tree)
+
+        return tree
+
+
+    def configure(self, workers: int) -> None:
+        """
+        Sets the ttl of the trees depending on the number of processes which serve requests
+
+        Args:
+            workers (int): Number of worker processes of the web server
+        """
+        self.ttl = self.DEFAULT_TTL if workers <= 1 else self.SHARED_TTL
+
+
+    def invalidate(self, collection: str = None) -> None:
+        """
+        Increases the version of a collection and removes its cached trees
+
+        Args:
+            collection (str, optional): Name of the collection, all trees are removed if not set
+        """
+        with self.__lock:
+            if collection is None:
+                self.__generation += 1
+                self.__entries.clear()
+                return
+
+            for name in (collection, ) + DEPENDENT_TREES.get(collection, ()):
+                self.__versions[name] = self.__versions.get(name, 0) + 1
+
+                for key in [key for key in self.__entries if key[0] == name]:
+                    del self.__entries[key]
+
+
+    def __version(self, collection: str) -> int:
+        """Version of a collection, increased by its own invalidations and by the invalidations of all trees"""
+        return self.__generation + self.__versions.get(collection, 0)
+
+
+tree_cache = TreeCache()
+
+count_cache.add_listener(tree_cache.invalidate)
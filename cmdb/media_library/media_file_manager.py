@@ -15,6 +15,7 @@
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 """TODO: document"""
 import logging
+from typing import Iterator
 
 from datetime import datetime, timezone
 from gridfs.grid_file import GridOutCursor, GridOut
@@ -55,6 +56,58 @@ def get_file(self, metadata: dict, blob: bool = False) -> GridOut:
         return result.read() if blob else result._file
 
 
+    def open_file(self, metadata: dict) -> GridOut:
+        """
+        Opens the last version of a file without reading its content
+
+        Args:
+            metadata (dict): Filter of the file (filename, metadata)
+
+        Raises:
+            MediaFileManagerGetError: If the file could not be found
+
+        Returns:
+            GridOut: Readable and seekable file, its metadata is loaded
+        """
+        try:
+            return self.fs.get_last_version(**metadata)
+        except Exception as err:
+            LOGGER.error(err)
+            raise MediaFileManagerGetError(err=err) from err
+
+
+    @staticmethod
+    def stream_file(grid_out: GridOut, start: int = 0, end: int = None) -> Iterator[bytes]:
+        """
+        Yields the content of a file chunk by chunk, at most one chunk is held in memory
+
+        Args:
+            grid_out (GridOut): File opened by `open_file`
+            start (int): Position of the first byte
+            end (int, optional): Position after the last byte, the end of the file if not set
+
+        Returns:
+            Iterator[bytes]: The chunks of the requested range
+        """
+        end = grid_out.length if end is None else min(end, grid_out.length)
+        remaining = end - start
+
+        try:
+            grid_out.seek(start)
+
+            while remaining > 0:
+                # the first read ends at a chunk border, all following reads cover exactly one chunk
+                data = grid_out.read(min(remaining, grid_out.chunk_size - grid_out.tell() % grid_out.chunk_size))
+
+                if not data:
+                    break
+
+                remaining -= len(data)
+                yield data
+        finally:
+            grid_out.close()
+
+
     def get_many(self, metadata, **params: dict):
         """TODO: document"""
         try:
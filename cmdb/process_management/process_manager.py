@@ -39,6 +39,9 @@ def __init__(self):
         # service definitions (in correct order)
         self.__service_defs = []
         self.__service_defs.append(CmdbProcess("exportd", "cmdb.exportd.service.ExportdService"))
+        self.__service_defs.append(CmdbProcess("log_retention", "cmdb.log_retention.service.LogRetentionService"))
+        self.__service_defs.append(CmdbProcess("type_migration",
+                                               "cmdb.framework.type_migration_service.TypeMigrationService"))
         self.__service_defs.append(CmdbProcess("webapp", "cmdb.interface.gunicorn.WebCmdbService"))
 
         # processlist
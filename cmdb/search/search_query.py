@@ -0,0 +1,159 @@
+# DATAGERRY - OpenSource Enterprise CMDB
+# Copyright (C) 2024 becon GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+Parsed search query
+
+The search parameters of a request are parsed once into a `SearchQuery` which holds the regex terms of
+the text and regex parameters together with their compiled Python patterns. The pipeline builder and the
+match highlighting of the search results use this object instead of walking the pipeline again.
+Parsed queries are memoised by their normalised parameters, so repeated searches reuse the compiled patterns.
+"""
+import re
+import json
+import logging
+from functools import lru_cache
+from typing import List, Pattern
+
+from cmdb.search.params import SearchParam
+# -------------------------------------------------------------------------------------------------------------------- #
+
+LOGGER = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=512)
+def compile_patterns(regex_terms: tuple) -> tuple:
+    """
+    Compiles regex terms with the options of the database search ('ims')
+
+    Args:
+        regex_terms (tuple): Regex terms of a search or already compiled patterns
+
+    Returns:
+        tuple: Compiled patterns, terms which are no valid Python regex are skipped
+    """
+    patterns = []
+
+    for term in regex_terms:
+        if isinstance(term, re.Pattern):
+            patterns.append(term)
+            continue
+
+        try:
+            patterns.append(re.compile(term, re.IGNORECASE | re.MULTILINE | re.DOTALL))
+        except (re.error, TypeError) as err:
+            LOGGER.debug('Search term %s can not be compiled: %s', term, err)
+
+    return tuple(patterns)
+
+
+class SearchQuery:
+    """Search parameters of a request together with their precompiled regex terms"""
+
+    REGEX_FORMS = ('text', 'regex')
+
+    def __init__(self, params: List[SearchParam]):
+        """
+        Args:
+            params (List[SearchParam]): Search parameters of the request
+        """
+        self.params: tuple = tuple(params)
+        self.regex_terms: tuple = tuple(str(param.search_text) for param in self.params
+                                        if param.search_form in self.REGEX_FORMS)
+        self.patterns: tuple[Pattern] = compile_patterns(self.regex_terms)
+
+
+    def __len__(self):
+        return len(self.params)
+
+
+    def params_of(self, *search_forms: str) -> List[SearchParam]:
+        """
+        Returns the parameters of the given search forms
+
+        Args:
+            *search_forms (str): Forms of the parameters (e.g. 'type')
+
+        Returns:
+            List[SearchParam]: Matching parameters in the order of the request
+        """
+        return [param for param in self.params if param.search_form in search_forms]
+
+
+    def matches(self, value) -> bool:
+        """
+        Checks if a field value matches any regex term of the query
+
+        Args:
+            value: Value of a field
+
+        Returns:
+            bool: True if at least one term matches
+        """
+        text = str(value)
+        return any(pattern.search(text) for pattern in self.patterns)
+
+
+    @staticmethod
+    def normalise(params: List[SearchParam]) -> str:
+        """
+        Generates the normalised string representation of search parameters
+
+        Args:
+            params (List[SearchParam]): Search parameters
+
+        Returns:
+            str: Normalised parameters, equal searches generate the same string
+        """
+        return json.dumps([
+            [param.search_text, param.search_form, param.settings or {}, bool(param.disjunction)]
+            for param in params
+        ], sort_keys=True, default=str)
+
+
+    @classmethod
+    def parse(cls, params: List[SearchParam]) -> "SearchQuery":
+        """
+        Returns the parsed query of the search parameters, memoised across requests
+
+        Args:
+            params (List[SearchParam]): Search parameters of the request
+
+        Returns:
+            SearchQuery: Parsed query, instances are shared and must not be changed
+        """
+        return cls.__parse_normalised(cls.normalise(params))
+
+
+    @classmethod
+    @lru_cache(maxsize=256)
+    def __parse_normalised(cls, normalised: str) -> "SearchQuery":
+        """Parses a normalised query string"""
+        return cls([SearchParam(text, form, settings, disjunction)
+                    for text, form, settings, disjunction in json.loads(normalised)])
+
+
+    @classmethod
+    def from_regex_terms(cls, regex_terms: List[str]) -> "SearchQuery":
+        """
+        Creates a query from plain regex terms
+
+        Args:
+            regex_terms (List[str]): Regex terms
+
+        Returns:
+            SearchQuery: Query containing one regex parameter per term
+        """
+        return cls.parse([SearchParam(term, 'regex') for term in regex_terms])
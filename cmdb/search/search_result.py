@@ -17,7 +17,7 @@
 import logging
 from typing import TypeVar, Generic, List
 
-from bson import Regex
+from cmdb.search.search_query import compile_patterns
 # -------------------------------------------------------------------------------------------------------------------- #
 
 LOGGER = logging.getLogger(__name__)
@@ -59,15 +59,16 @@ def __init__(self,
             alive: flag if spliced search result has more data in database
             limit: max number of results to return
             skip: start of index value for the search
-            matches_regex: list of text regex values
+            matches_regex: list of text regex values or their compiled patterns
         """
         self.limit: int = limit
         self.skip: int = skip
         self.total_results: int = total_results
         self.alive = alive
         self.groups = groups
+        patterns = compile_patterns(tuple(matches_regex or ()))
         self.results: List[SearchResultMap] = [
-            SearchResultMap[R](result=result, matches=self.find_match_fields(result, matches_regex)) for result in
+            SearchResultMap[R](result=result, matches=self.find_match_fields(result, patterns)) for result in
             results]
 
 
@@ -86,7 +87,7 @@ def find_match_fields(result: R, possible_regex_list=None):
         Get list of matched fields inside the searchresult
         Args:
             result: Generic search result
-            possible_regex_list: list of text regex from the pipeline builder
+            possible_regex_list: list of compiled regex patterns of the search query
 
         Returns:
             list of fields where the regex matched
@@ -107,15 +108,10 @@ def inner_match_fields(_fields, _matched_fields, _reference=None):
             Returns:
                 list of fields where the regex matched
             """
-            for regex_ in possible_regex_list:
-                try:
-                    runtime_regex = Regex(regex_, 'ims').try_compile()
-                except Exception:
-                    runtime_regex = regex_
+            for runtime_regex in possible_regex_list:
                 for field in _fields:
                     try:
-                        res = runtime_regex.findall(str(field.get('value')))
-                        if len(res) > 0:
+                        if runtime_regex.search(str(field.get('value'))):
                             inner_value = _reference if _reference else field
                             # removing duplicated from list
                             if inner_value not in _matched_fields:
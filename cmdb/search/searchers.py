@@ -23,6 +23,7 @@
 from cmdb.framework.cmdb_render import RenderResult, RenderList
 from cmdb.search import Search
 from cmdb.search.params import SearchParam
+from cmdb.search.search_query import SearchQuery
 from cmdb.search.query import Query, Pipeline
 from cmdb.search.query.pipe_builder import PipelineBuilder
 from cmdb.search.search_result import SearchResult
@@ -190,10 +191,11 @@ def gen_dict_extract(key, var) -> str:
     def build(self, params: List[SearchParam],
               obj_manager: CmdbObjectManager = None,
               user: UserModel = None, permission: AccessControlPermission = None,
-              active_flag: bool = False, *args, **kwargs) -> Pipeline:
+              active_flag: bool = False, search_query: SearchQuery = None, *args, **kwargs) -> Pipeline:
         """Build a pipeline query out of frontend params"""
         # clear pipeline
         self.clear()
+        search_query = search_query or SearchQuery.parse(params)
 
         # load reference fields in runtime.
         self.pipeline = SearchReferencesPipelineBuilder().build()
@@ -203,14 +205,13 @@ def build(self, params: List[SearchParam],
             self.add_pipe(self.match_({'active': {"$eq": True}}))
 
         # text builds
-        text_params = [_ for _ in params if _.search_form in ('text','regex')]
-        for param in text_params:
-            regex = self.regex_('fields.value', param.search_text, 'ims')
+        for regex_term in search_query.regex_terms:
+            regex = self.regex_('fields.value', regex_term, 'ims')
             self.add_pipe(self.match_(regex))
 
         # type builds
         disjunction_query = []
-        type_params = [_ for _ in params if _.search_form == 'type']
+        type_params = search_query.params_of('type')
         for param in type_params:
             if param.settings and len(param.settings.get('types', [])) > 0:
                 type_id_in = self.in_('type_id', param.settings['types'])
@@ -222,7 +223,7 @@ def build(self, params: List[SearchParam],
             self.add_pipe(self.match_(self.or_(disjunction_query)))
 
         # category builds
-        category_params = [_ for _ in params if _.search_form == 'category']
+        category_params = search_query.params_of('category')
         for param in category_params:
             if param.settings and len(param.settings.get('categories', [])) > 0:
                 categories = obj_manager.get_categories_by(**self.regex_('label', param.search_text))
@@ -231,7 +232,7 @@ def build(self, params: List[SearchParam],
                     self.add_pipe(self.match_(type_id_in))
 
         # public builds
-        id_params = [_ for _ in params if _.search_form == 'publicID']
+        id_params = search_query.params_of('publicID')
         for param in id_params:
             self.add_pipe(self.match_({'public_id': int(param.search_text)}))
 
@@ -252,7 +253,8 @@ def __init__(self, manager: CmdbObjectManager):
 
     def aggregate(self, pipeline: Pipeline, request_user: UserModel = None, permission: AccessControlPermission = None,
                   limit: int = Search.DEFAULT_LIMIT,
-                  skip: int = Search.DEFAULT_SKIP, **kwargs) -> SearchResult[RenderResult]:
+                  skip: int = Search.DEFAULT_SKIP, search_query: SearchQuery = None,
+                  **kwargs) -> SearchResult[RenderResult]:
         """
         Use mongodb aggregation system with pipeline queries
         Args:
@@ -261,6 +263,8 @@ def aggregate(self, pipeline: Pipeline, request_user: UserModel = None, permissi
             permission (AccessControlPermission) : Permission enum for possible ACL operations..
             limit (int): max number of documents to return
             skip (int): number of documents to be skipped
+            search_query (SearchQuery): parsed query of the pipeline, the regex terms are extracted
+                                        from the pipeline if not set
             **kwargs:
         Returns:
             SearchResult with generic list of RenderResults
@@ -300,11 +304,12 @@ def aggregate(self, pipeline: Pipeline, request_user: UserModel = None, permissi
         raw_search_result = self.manager.aggregate(collection=CmdbObject.COLLECTION, pipeline=plb.pipeline)
         raw_search_result_list = list(raw_search_result)
 
-        try:
-            matches_regex = plb.get_regex_pipes_values()
-        except Exception as err:
-            LOGGER.error('Extract regex pipes: %s',err)
-            matches_regex = []
+        if search_query is None:
+            try:
+                search_query = SearchQuery.from_regex_terms(plb.get_regex_pipes_values())
+            except Exception as err:
+                LOGGER.error('Extract regex pipes: %s',err)
+                search_query = SearchQuery([])
 
         if len(raw_search_result_list[0]['data']) > 0:
             raw_search_result_list_entry = raw_search_result_list[0]
@@ -326,7 +331,7 @@ def aggregate(self, pipeline: Pipeline, request_user: UserModel = None, permissi
             total_results=total_results,
             groups=group_result_list,
             alive=raw_search_result.alive,
-            matches_regex=matches_regex,
+            matches_regex=search_query.patterns,
             limit=limit,
             skip=skip
         )
@@ -0,0 +1,77 @@
+# DATAGERRY - OpenSource Enterprise CMDB
+# Copyright (C) 2024 becon GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""Settings of the log retention"""
+
+class LogRetentionSettingsDAO:
+    """
+    Retention settings of the logs
+
+    Every policy limits the logs of one log type by age (`max_age` in days) and/or by number (`max_count`),
+    a limit of 0 is disabled. Removed logs are archived to a compressed GridFS bundle (`gridfs`), to a capped
+    collection (`capped`) or are not archived (`none`).
+    """
+
+    __DOCUMENT_IDENTIFIER = 'log_retention'
+    ARCHIVE_MODES = ('gridfs', 'capped', 'none')
+    __DEFAULT_SETTINGS__ = {
+            'active': False,
+            'interval': 24,
+            'batch_size': 1000,
+            'batch_pause': 0.1,
+            'archive': 'gridfs',
+            'capped_size': 512 * 1024 * 1024,
+            'policies': [
+                {'log_type': 'CmdbObjectLog', 'max_age': 365, 'max_count': 0},
+                {'log_type': 'ExportdJobLog', 'max_age': 90, 'max_count': 0},
+            ],
+        }
+
+    def __init__(self, active: bool, interval: int, batch_size: int, batch_pause: float, archive: str,
+                 capped_size: int, policies: list[dict], **kwargs):
+        """
+        Args:
+            active (bool): If the retention runs in the background
+            interval (int): Hours between two runs
+            batch_size (int): Number of logs archived and deleted with one database call
+            batch_pause (float): Seconds between two batches, other writers get the locks in between
+            archive (str): One of `ARCHIVE_MODES`
+            capped_size (int): Size in bytes of the capped archive collections
+            policies (list[dict]): `log_type`, `max_age` and `max_count` of each limited log type
+
+        Raises:
+            ValueError: If a setting has an invalid value
+        """
+        if archive not in self.ARCHIVE_MODES:
+            raise ValueError(f'Unknown archive mode: {archive}')
+
+        if int(interval) < 1 or int(batch_size) < 1 or int(capped_size) < 4096:
+            raise ValueError('Interval, batch size and capped size must be positive')
+
+        self._id: str = LogRetentionSettingsDAO.__DOCUMENT_IDENTIFIER
+        self.active = bool(active)
+        self.interval = int(interval)
+        self.batch_size = int(batch_size)
+        self.batch_pause = float(batch_pause)
+        self.archive = archive
+        self.capped_size = int(capped_size)
+        self.policies = [{'log_type': policy['log_type'],
+                          'max_age': int(policy.get('max_age') or 0),
+                          'max_count': int(policy.get('max_count') or 0)} for policy in policies]
+
+
+    def get_id(self) -> str:
+        """Get the database document identifier"""
+        return self._id
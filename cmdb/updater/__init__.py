@@ -26,7 +26,8 @@ class UpdaterModule:
         'version': 0,
     }
 
-    __UPDATER_VERSIONS_POOL__ = [20200214, 20200226, 20200408, 20200512, 20200513, 20240603]
+    __UPDATER_VERSIONS_POOL__ = [20200214, 20200226, 20200408, 20200512, 20200513, 20240603, 20261019, 20261020,
+                                 20261021, 20261022]
 
     def __init__(self, system_settings_reader: SystemSettingsReader):
         auth_settings_values = system_settings_reader.\
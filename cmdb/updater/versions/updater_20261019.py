@@ -0,0 +1,44 @@
+# DATAGERRY - OpenSource Enterprise CMDB
+# Copyright (C) 2024 becon GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""Updater which generates the flattened multi data section references of all objects"""
+import logging
+
+from cmdb.updater.updater import Updater
+from cmdb.framework.mds_references import get_mds_ref_fields
+# -------------------------------------------------------------------------------------------------------------------- #
+LOGGER = logging.getLogger(__name__)
+
+class Update20261019(Updater):
+    """Generates the `mds_refs` of all objects with reference fields inside multi data sections"""
+
+    def creation_date(self):
+        return '20261019'
+
+
+    def description(self):
+        return """
+                Add the indexed property 'mds_refs' to all objects with references inside multi data sections
+               """
+
+
+    def start_update(self):
+        """Syncs the `mds_refs` of each type with one pipeline update"""
+        for type_ in self.type_manager.find({}).results:
+            if get_mds_ref_fields(type_):
+                self.type_manager.sync_mds_refs(type_)
+                LOGGER.info("Updated 'mds_refs' for objects of type ID: %s", type_.public_id)
+
+        super().increase_updater_version(20261019)
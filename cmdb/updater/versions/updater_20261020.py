@@ -0,0 +1,42 @@
+# DATAGERRY - OpenSource Enterprise CMDB
+# Copyright (C) 2024 becon GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""Updater which generates the materialised ancestor paths of all locations"""
+import logging
+
+from cmdb.updater.updater import Updater
+from cmdb.manager.locations_manager import LocationsManager
+# -------------------------------------------------------------------------------------------------------------------- #
+LOGGER = logging.getLogger(__name__)
+
+class Update20261020(Updater):
+    """Generates the materialised ancestor `path` of all locations"""
+
+    def creation_date(self):
+        return '20261020'
+
+
+    def description(self):
+        return """
+                Add the indexed property 'path' with all ancestor locations to every location
+               """
+
+
+    def start_update(self):
+        """Builds the paths from the parents of the locations and writes them with one bulk write"""
+        updated = LocationsManager(self.database_manager).rebuild_paths()
+        LOGGER.info("Updated 'path' of %s locations", updated)
+
+        super().increase_updater_version(20261020)
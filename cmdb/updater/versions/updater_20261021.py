@@ -0,0 +1,58 @@
+# DATAGERRY - OpenSource Enterprise CMDB
+# Copyright (C) 2024 becon GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""Updater which removes duplicate object links and creates the unique link index"""
+import logging
+
+from cmdb.updater.updater import Updater
+from cmdb.manager.count_strategy import CountStrategy
+from cmdb.framework import ObjectLinkModel
+from cmdb.manager.object_links_manager import ObjectLinksManager
+# -------------------------------------------------------------------------------------------------------------------- #
+LOGGER = logging.getLogger(__name__)
+
+class Update20261021(Updater):
+    """Removes duplicate object links and creates the unique index on `primary` and `secondary`"""
+
+    def creation_date(self):
+        return '20261021'
+
+
+    def description(self):
+        return """
+                Remove duplicate object links and add a unique index on 'primary' and 'secondary'
+               """
+
+
+    def start_update(self):
+        """Keeps the oldest link of each pair, the duplicates are deleted with one query"""
+        object_links_manager = ObjectLinksManager(self.database_manager)
+
+        duplicates = object_links_manager.aggregate([
+            {'$group': {'_id': {'primary': '$primary', 'secondary': '$secondary'},
+                        'public_ids': {'$push': '$public_id'},
+                        'count': {'$sum': 1}}},
+            {'$match': {'count': {'$gt': 1}}}
+        ])
+        duplicate_ids = [public_id for group in duplicates for public_id in sorted(group['public_ids'])[1:]]
+
+        if duplicate_ids:
+            deleted = object_links_manager.delete_many({'public_id': {'$in': duplicate_ids}})
+            LOGGER.info("Deleted %s duplicate object links", deleted)
+
+        self.database_manager.create_indexes(ObjectLinkModel.COLLECTION, ObjectLinkModel.get_index_keys())
+        CountStrategy.invalidate_indexes(ObjectLinkModel.COLLECTION)
+
+        super().increase_updater_version(20261021)
@@ -0,0 +1,62 @@
+# DATAGERRY - OpenSource Enterprise CMDB
+# Copyright (C) 2024 becon GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""Updater which sets the existence flag of the object logs"""
+import logging
+
+from cmdb.updater.updater import Updater
+from cmdb.manager.count_strategy import CountStrategy
+from cmdb.framework import CmdbMetaLog
+from cmdb.manager.logs_manager import LogsManager
+# -------------------------------------------------------------------------------------------------------------------- #
+LOGGER = logging.getLogger(__name__)
+
+class Update20261022(Updater):
+    """Sets `object_exists` on all object logs and creates the index of the flag"""
+
+    def creation_date(self):
+        return '20261022'
+
+
+    def description(self):
+        return """
+                Set the 'object_exists' flag of all object logs and add an index on 'object_exists' and 'object_id'
+               """
+
+
+    def start_update(self):
+        """The deleted objects are determined once for each logged object_id instead of for each log"""
+        logs_manager = LogsManager(self.database_manager)
+
+        logs_manager.update_many({'object_id': {'$exists': True}, 'object_exists': {'$exists': False}},
+                                 {'object_exists': True})
+
+        deleted_objects = logs_manager.aggregate([
+            {'$match': {'object_id': {'$exists': True}}},
+            {'$group': {'_id': '$object_id'}},
+            {'$lookup': {'from': 'framework.objects', 'localField': '_id', 'foreignField': 'public_id',
+                         'as': 'object'}},
+            {'$match': {'object': {'$size': 0}}},
+            {'$project': {'_id': 1}}
+        ])
+        deleted_ids = [log['_id'] for log in deleted_objects]
+
+        logs_manager.set_objects_exist(deleted_ids, False)
+        LOGGER.info("Marked the logs of %s deleted objects", len(deleted_ids))
+
+        self.database_manager.create_indexes(CmdbMetaLog.COLLECTION, CmdbMetaLog.get_index_keys())
+        CountStrategy.invalidate_indexes(CmdbMetaLog.COLLECTION)
+
+        super().increase_updater_version(20261022)
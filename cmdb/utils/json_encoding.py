@@ -13,10 +13,22 @@
 #
 # You should have received a copy of the GNU Affero General Public License
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
-"""TODO: document"""
+"""
+Json encoding of the responses
+
+Values which are not natively serialisable are converted by an encoder which is looked up by the type of the
+value. The table of the encoders is built once and the encoder of each concrete type is cached, so a value costs
+a single dictionary lookup instead of an `isinstance` chain. If `orjson` is installed it serialises the responses,
+bodies it can not serialise (e.g. integers above 64 bit) fall back to the standard library. Unlike the standard
+library, `orjson` writes UUIDs as plain strings.
+"""
 import calendar
 import datetime
+import json
+import logging
 import re
+import uuid
+from typing import Any, Callable, Optional, Union
 
 from bson.dbref import DBRef
 from bson.max_key import MaxKey
@@ -31,80 +43,121 @@
 from cmdb.security.auth.provider_config import AuthProviderConfig
 from cmdb.settings.date.date_settings import DateSettingsDAO
 
-# TODO: try just import and remove handling if not uuid
 try:
-    import uuid
-
-    _use_uuid = True
+    import orjson
 except ImportError:
-    _use_uuid = False
+    orjson = None
 # -------------------------------------------------------------------------------------------------------------------- #
 
+LOGGER = logging.getLogger(__name__)
+
 _RE_TYPE = type(re.compile("foo"))
 
+# Encoders by type, built with the first encoded value because some of the models import this module
+_ENCODERS: dict[type, Callable[[Any], Any]] = {}
+# Encoders resolved for concrete types (subclasses of the types in `_ENCODERS`), None if there is no encoder
+_RESOLVED_ENCODERS: dict[type, Optional[Callable[[Any], Any]]] = {}
 
-def default(obj):
-    """Helper function for converting cmdb objects to json"""
+if orjson:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+
+def _encode_datetime(obj: datetime.datetime) -> dict:
+    if obj.utcoffset() is not None:
+        obj = obj - obj.utcoffset()
+    millis = int(calendar.timegm(obj.timetuple()) * 1000 +
+                 obj.microsecond / 1000)
+    return {"$date": millis}
+
+
+def _encode_regex(obj) -> dict:
+    flags = ""
+    if obj.flags & re.IGNORECASE:
+        flags += "i"
+    if obj.flags & re.MULTILINE:
+        flags += "m"
+    return {"$regex": obj.pattern, "$options": flags}
+
+
+def _build_encoders() -> dict[type, Callable[[Any], Any]]:
+    """Creates the table of the encoders"""
     from cmdb.framework import CmdbDAO
     from cmdb.user_management.models.right import BaseRight
     from cmdb.exportd.exportd_job.exportd_job_base import JobManagementBase
     from cmdb.media_library.media_file_base import MediaFileManagementBase
     from cmdb.docapi.docapi_template.docapi_template_base import TemplateManagementBase
 
-    if isinstance(obj, (CmdbDAO,
-                        JobManagementBase,
-                        MediaFileManagementBase,
-                        TemplateManagementBase,
-                        BaseRight,
-                        RenderVisualization,
-                        BaseImporterResponse,
-                        ImportMessage,
-                        AuthSettingsDAO,
-                        AuthenticationProvider,
-                        AuthProviderConfig,
-                        DateSettingsDAO)):
-        return obj.__dict__
-
-    if isinstance(obj, (SearchResult,SearchResultMap)):
-        return obj.to_json()
-
-    if isinstance(obj, bytes):
-        return obj.decode("utf-8")
-
-    if isinstance(obj, ObjectId):
-        return {"$oid": str(obj)}
-
-    if isinstance(obj, DBRef):
-        return obj.as_doc()
-
-    if isinstance(obj, datetime.datetime):
-        if obj.utcoffset() is not None:
-            obj = obj - obj.utcoffset()
-        millis = int(calendar.timegm(obj.timetuple()) * 1000 +
-                     obj.microsecond / 1000)
-        return {"$date": millis}
-
-    if isinstance(obj, _RE_TYPE):
-        flags = ""
-        if obj.flags & re.IGNORECASE:
-            flags += "i"
-        if obj.flags & re.MULTILINE:
-            flags += "m"
-        return {"$regex": obj.pattern, "$options": flags}
-
-    if isinstance(obj, MinKey):
-        return {"$minKey": 1}
-
-    if isinstance(obj, MaxKey):
-        return {"$maxKey": 1}
-
-    if isinstance(obj, dict):
-        return obj
-
-    if isinstance(obj, Timestamp):
-        return {"t": obj.time, "i": obj.inc}
-
-    if _use_uuid and isinstance(obj, uuid.UUID):
-        return {"$uuid": obj.hex}
-
-    raise TypeError(f"{obj} is not JSON serializable - type: {type(obj)}")
+    encoders = {model: vars for model in (CmdbDAO,
+                                          JobManagementBase,
+                                          MediaFileManagementBase,
+                                          TemplateManagementBase,
+                                          BaseRight,
+                                          RenderVisualization,
+                                          BaseImporterResponse,
+                                          ImportMessage,
+                                          AuthSettingsDAO,
+                                          AuthenticationProvider,
+                                          AuthProviderConfig,
+                                          DateSettingsDAO)}
+    encoders.update({
+        SearchResult: lambda obj: obj.to_json(),
+        SearchResultMap: lambda obj: obj.to_json(),
+        bytes: lambda obj: obj.decode("utf-8"),
+        ObjectId: lambda obj: {"$oid": str(obj)},
+        DBRef: lambda obj: obj.as_doc(),
+        datetime.datetime: _encode_datetime,
+        _RE_TYPE: _encode_regex,
+        MinKey: lambda obj: {"$minKey": 1},
+        MaxKey: lambda obj: {"$maxKey": 1},
+        dict: lambda obj: obj,
+        Timestamp: lambda obj: {"t": obj.time, "i": obj.inc},
+        uuid.UUID: lambda obj: {"$uuid": obj.hex},
+    })
+
+    return encoders
+
+
+def _resolve_encoder(obj_type: type) -> Optional[Callable[[Any], Any]]:
+    """Returns the encoder of the nearest base class of a type"""
+    if not _ENCODERS:
+        _ENCODERS.update(_build_encoders())
+
+    encoder = next((_ENCODERS[base] for base in obj_type.__mro__ if base in _ENCODERS), None)
+    _RESOLVED_ENCODERS[obj_type] = encoder
+
+    return encoder
+
+
+def default(obj):
+    """Helper function for converting cmdb objects to json"""
+    try:
+        encoder = _RESOLVED_ENCODERS[type(obj)]
+    except KeyError:
+        encoder = _resolve_encoder(type(obj))
+
+    if encoder is None:
+        raise TypeError(f"{obj} is not JSON serializable - type: {type(obj)}")
+
+    return encoder(obj)
+
+
+def dumps(instance, default: Callable[[Any], Any] = default, indent: int = None) -> Union[str, bytes]:
+    """
+    Serialises a response body
+
+    Args:
+        instance: The body of the response
+        default (Callable, optional): Converts values which are not natively serialisable
+        indent (int, optional): Indent of the json, None for a compact response
+
+    Returns:
+        Union[str, bytes]: The json of the body, bytes if it was serialised by `orjson`
+    """
+    if orjson and indent in (None, 2):
+        try:
+            return orjson.dumps(instance, default=default,
+                                option=(_ORJSON_OPTIONS | orjson.OPT_INDENT_2) if indent else _ORJSON_OPTIONS)
+        except (orjson.JSONEncodeError, TypeError) as err:
+            LOGGER.debug("Response is serialised by the standard library: %s", err)
+
+    return json.dumps(instance, default=default, indent=indent)
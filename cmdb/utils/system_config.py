@@ -207,7 +207,8 @@ def get_all_values_from_section(self, section):
                 try:
                     if self.config.has_section(section):
                         section_conffile = dict(self.config.items(section))
-                    else:
+                    elif not section_envvars:
+                        # a section which is only set by environment variables is valid
                         raise SectionError(section)
                 except KeyError as err:
                     raise KeySectionError(section) from err
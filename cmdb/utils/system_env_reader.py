@@ -28,7 +28,8 @@ class SystemEnvironmentReader(SystemReader):
     def __init__(self):
         # get all environment variables and store them in config dict
         self.__config = {}
-        pattern = re.compile("DATAGERRY_(.*)_(.*)")
+        # section names do not contain underscores, option names may (e.g. DATAGERRY_Compression_brotli_level)
+        pattern = re.compile("DATAGERRY_([^_]+)_(.+)")
         for key in os.environ.keys():
             match = pattern.fullmatch(key)
 
@@ -40,7 +41,7 @@ def __init__(self):
                 # save value in config dict
                 if section not in self.__config:
                     self.__config[section] = {}
-                    self.__config[section][name] = value
+                self.__config[section][name] = value
         super().__init__()
 
 
@@ -19,6 +19,7 @@
 import logging
 
 from cmdb.database.database_manager_mongo import DatabaseManagerMongo
+from cmdb.manager.count_strategy import count_cache
 from cmdb.utils.error import CMDBError
 # -------------------------------------------------------------------------------------------------------------------- #
 
@@ -81,7 +82,10 @@ def write(self, _id: str, data: dict):
         """
         Write new settings in database
         """
-        return self.writer.update(collection=self.COLLECTION, filter={'_id': _id}, data=data, upsert=True)
+        result = self.writer.update(collection=self.COLLECTION, filter={'_id': _id}, data=data, upsert=True)
+        count_cache.invalidate(self.COLLECTION)
+
+        return result
 
 
     def verify(self, _id: str, data: dict = None) -> bool:
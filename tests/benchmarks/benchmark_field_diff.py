@@ -0,0 +1,64 @@
+# DATAGERRY - OpenSource Enterprise CMDB
+# Copyright (C) 2024 becon GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+Benchmark of the field diff engine
+
+Compares the list membership diff which was used for the change logs before the diff engine with
+`cmdb.framework.field_diff.diff_fields` on an object with many fields where every tenth value changed.
+
+Run with `python -m tests.benchmarks.benchmark_field_diff [number of fields]`.
+"""
+import sys
+import timeit
+
+from cmdb.framework.field_diff import diff_fields
+# -------------------------------------------------------------------------------------------------------------------- #
+
+def legacy_diff(old_fields: list, new_fields: list) -> dict:
+    """The list membership diff which was used before the diff engine"""
+    return {'old': [i for i in old_fields if i not in new_fields],
+            'new': [j for j in new_fields if j not in old_fields]}
+
+
+def create_fields(amount: int) -> tuple:
+    """Old and new fields of an object where every tenth value changed"""
+    old_fields = [{'name': f'field-{idx}', 'value': f'value-{idx}'} for idx in range(amount)]
+    new_fields = [{'name': f'field-{idx}', 'value': f'value-{idx}' if idx % 10 else 'changed'}
+                  for idx in range(amount)]
+
+    return old_fields, new_fields
+
+
+def main(amount: int = 1000, number: int = 5, repeat: int = 3):
+    """Prints the best time of both diffs"""
+    old_fields, new_fields = create_fields(amount)
+    changes = diff_fields(old_fields, new_fields).to_log_changes()
+    legacy_changes = legacy_diff(old_fields, new_fields)
+
+    for key in ('old', 'new'):
+        if sorted(changes[key], key=str) != sorted(legacy_changes[key], key=str):
+            raise AssertionError('The diffs differ')
+
+    indexed = min(timeit.repeat(lambda: diff_fields(old_fields, new_fields), number=number, repeat=repeat))
+    legacy = min(timeit.repeat(lambda: legacy_diff(old_fields, new_fields), number=number, repeat=repeat))
+
+    print(f'diff of {amount} fields')
+    print(f'  list membership: {legacy / number * 1000:8.3f} ms')
+    print(f'  diff engine:     {indexed / number * 1000:8.3f} ms  ({legacy / indexed:.1f}x)')
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:2]])
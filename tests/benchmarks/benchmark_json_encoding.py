@@ -0,0 +1,134 @@
+
+# DATAGERRY - OpenSource Enterprise CMDB
+# Copyright (C) 2024 becon GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+"""
+Benchmark of the response serialisation
+
+Compares the previous serialisation of the responses (indented `json.dumps` with the `isinstance` chain of the
+old `default`) with `cmdb.utils.json_encoding.dumps` on a list of objects as it is returned by the object routes.
+
+Run with `python -m tests.benchmarks.benchmark_json_encoding [number of objects]`.
+"""
+import calendar
+import datetime
+import json
+import re
+import sys
+import timeit
+import uuid
+
+from bson.dbref import DBRef
+from bson.max_key import MaxKey
+from bson.min_key import MinKey
+from bson.objectid import ObjectId
+from bson.timestamp import Timestamp
+
+from cmdb.framework import CmdbObject
+from cmdb.framework.cmdb_render import RenderVisualization
+from cmdb.importer.importer_response import ImportMessage, BaseImporterResponse
+from cmdb.search.search_result import SearchResult, SearchResultMap
+from cmdb.security.auth import AuthSettingsDAO, AuthenticationProvider
+from cmdb.security.auth.provider_config import AuthProviderConfig
+from cmdb.settings.date.date_settings import DateSettingsDAO
+from cmdb.utils import json_encoding
+# -------------------------------------------------------------------------------------------------------------------- #
+
+_RE_TYPE = type(re.compile("foo"))
+
+
+def legacy_default(obj):
+    """The `default` of the responses before the dispatch table"""
+    from cmdb.framework import CmdbDAO
+    from cmdb.user_management.models.right import BaseRight
+    from cmdb.exportd.exportd_job.exportd_job_base import JobManagementBase
+    from cmdb.media_library.media_file_base import MediaFileManagementBase
+    from cmdb.docapi.docapi_template.docapi_template_base import TemplateManagementBase
+
+    if isinstance(obj, (CmdbDAO, JobManagementBase, MediaFileManagementBase, TemplateManagementBase, BaseRight,
+                        RenderVisualization, BaseImporterResponse, ImportMessage, AuthSettingsDAO,
+                        AuthenticationProvider, AuthProviderConfig, DateSettingsDAO)):
+        return obj.__dict__
+    if isinstance(obj, (SearchResult, SearchResultMap)):
+        return obj.to_json()
+    if isinstance(obj, bytes):
+        return obj.decode("utf-8")
+    if isinstance(obj, ObjectId):
+        return {"$oid": str(obj)}
+    if isinstance(obj, DBRef):
+        return obj.as_doc()
+    if isinstance(obj, datetime.datetime):
+        if obj.utcoffset() is not None:
+            obj = obj - obj.utcoffset()
+        return {"$date": int(calendar.timegm(obj.timetuple()) * 1000 + obj.microsecond / 1000)}
+    if isinstance(obj, _RE_TYPE):
+        return {"$regex": obj.pattern, "$options": ""}
+    if isinstance(obj, MinKey):
+        return {"$minKey": 1}
+    if isinstance(obj, MaxKey):
+        return {"$maxKey": 1}
+    if isinstance(obj, dict):
+        return obj
+    if isinstance(obj, Timestamp):
+        return {"t": obj.time, "i": obj.inc}
+    if isinstance(obj, uuid.UUID):
+        return {"$uuid": obj.hex}
+    raise TypeError(f"{obj} is not JSON serializable - type: {type(obj)}")
+
+
+def create_objects(amount: int) -> list:
+    """Objects with 20 fields, every second object is a model instance, the others are raw documents"""
+    now = datetime.datetime.now(datetime.timezone.utc)
+    objects = []
+
+    for public_id in range(1, amount + 1):
+        data = {
+            '_id': ObjectId(),
+            'public_id': public_id,
+            'type_id': 1,
+            'version': '1.0.0',
+            'author_id': 1,
+            'creation_time': now,
+            'last_edit_time': now,
+            'active': True,
+            'fields': [{'name': f'field-{index}', 'value': f'value {public_id} {index}'} for index in range(20)],
+            'multi_data_sections': []
+        }
+        objects.append(CmdbObject(**data) if public_id % 2 else data)
+
+    return objects
+
+
+def main(amount: int = 5000, repeat: int = 5):
+    """Prints the best time of both serialisations"""
+    objects = create_objects(amount)
+    old_result = json.loads(json.dumps(objects, default=legacy_default, indent=2))
+    new_result = json.loads(json_encoding.dumps(objects))
+
+    if old_result != new_result:
+        raise AssertionError('The serialisations differ')
+
+    old_time = min(timeit.repeat(lambda: json.dumps(objects, default=legacy_default, indent=2),
+                                 number=1, repeat=repeat))
+    new_time = min(timeit.repeat(lambda: json_encoding.dumps(objects), number=1, repeat=repeat))
+    new_indented_time = min(timeit.repeat(lambda: json_encoding.dumps(objects, indent=2), number=1, repeat=repeat))
+
+    print(f'{amount} objects, orjson: {"yes" if json_encoding.orjson else "no"}')
+    print(f'  previous (indented, isinstance chain): {old_time * 1000:8.1f} ms')
+    print(f'  dispatch table (indented):             {new_indented_time * 1000:8.1f} ms')
+    print(f'  dispatch table (compact):              {new_time * 1000:8.1f} ms  ({old_time / new_time:.1f}x)')
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:2]])
@@ -0,0 +1,169 @@
+# DATAGERRY - OpenSource Enterprise CMDB
+# Copyright (C) 2024 becon GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+Load test of the worker classes of the web service
+
+Without arguments the `HTTPServer` is started with every available worker class and an app whose requests wait
+for I/O (like a request waiting for MongoDB, LDAP or a PDF rendering), then all servers are loaded with the same
+number of concurrent requests. A running instance can be tested with `--url`, e.g. an endpoint of the REST API.
+
+Run with `python -m tests.benchmarks.loadtest_webserver [--requests 400] [--concurrency 50] [--io-wait 0.05]`
+or `python -m tests.benchmarks.loadtest_webserver --url http://127.0.0.1:4000/rest/types/ --token <token>`.
+"""
+import argparse
+import http.client
+import importlib.util
+import multiprocessing
+import socket
+import statistics
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+from cmdb.interface.gunicorn import HTTPServer
+# -------------------------------------------------------------------------------------------------------------------- #
+
+
+def create_io_bound_app(io_wait: float):
+    """WSGI app which waits for `io_wait` seconds in every request"""
+
+    def app(environ, start_response):
+        time.sleep(io_wait)
+        start_response('200 OK', [('Content-Type', 'application/json'), ('Content-Length', '2')])
+        return [b'{}']
+
+    return app
+
+
+def free_port() -> int:
+    """Returns a free port of the loopback interface"""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port: int, timeout: float = 15.0) -> None:
+    """Waits until the server accepts connections"""
+    deadline = time.monotonic() + timeout
+
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+
+    raise TimeoutError(f'Server on port {port} did not start')
+
+
+def load(url: str, requests: int, concurrency: int, headers: dict = None) -> dict:
+    """
+    Sends the requests with the given number of concurrent connections
+
+    Returns:
+        dict: Requests per second, latencies and number of failed requests
+    """
+    parsed = urllib.parse.urlsplit(url)
+    path = parsed.path + (f'?{parsed.query}' if parsed.query else '')
+    connection_class = http.client.HTTPSConnection if parsed.scheme == 'https' else http.client.HTTPConnection
+
+    def request(_):
+        start = time.perf_counter()
+        connection = connection_class(parsed.hostname, parsed.port, timeout=120)
+
+        try:
+            connection.request('GET', path, headers=headers or {})
+            response = connection.getresponse()
+            response.read()
+            failed = response.status >= 400
+        except OSError:
+            failed = True
+        finally:
+            connection.close()
+
+        return time.perf_counter() - start, failed
+
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(request, range(requests)))
+
+    duration = time.perf_counter() - start
+    latencies = sorted(latency for latency, _ in results)
+
+    return {
+        'requests_per_second': requests / duration,
+        'p50': statistics.median(latencies) * 1000,
+        'p95': latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        'failed': sum(1 for _, failed in results if failed),
+    }
+
+
+def print_result(name: str, result: dict) -> None:
+    """Prints one line of the results"""
+    print(f'  {name:<28} {result["requests_per_second"]:8.1f} req/s   p50 {result["p50"]:8.1f} ms   '
+          f'p95 {result["p95"]:8.1f} ms   failed {result["failed"]}')
+
+
+def compare_worker_classes(requests: int, concurrency: int, io_wait: float, workers: int) -> None:
+    """Starts the server with every available worker class and loads it"""
+    worker_classes = ['sync', 'gthread']
+
+    if importlib.util.find_spec('gevent') is not None:
+        worker_classes.append('gevent')
+
+    print(f'{requests} requests, {concurrency} concurrent, {io_wait * 1000:.0f} ms I/O wait, {workers} workers')
+
+    for worker_class in worker_classes:
+        port = free_port()
+        server = HTTPServer(options={'host': '127.0.0.1', 'port': port, 'workers': workers,
+                                     'worker_class': worker_class, 'daemon': False},
+                            app_factory=lambda: create_io_bound_app(io_wait))
+        process = multiprocessing.Process(target=server.run)
+        process.start()
+
+        try:
+            wait_for_port(port)
+            result = load(f'http://127.0.0.1:{port}/', requests, concurrency)
+        finally:
+            process.terminate()
+            process.join()
+
+        print_result(f'{worker_class} ({server.options.get("threads", 1)} threads)'
+                     if worker_class == 'gthread' else worker_class, result)
+
+
+def main():
+    """Parses the arguments and runs the load test"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help='endpoint of a running instance, the worker classes are compared if not set')
+    parser.add_argument('--token', help='bearer token for the requests to the REST API')
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--io-wait', type=float, default=0.05, help='seconds every request waits for I/O')
+    parser.add_argument('--workers', type=int, default=2)
+    args = parser.parse_args()
+
+    if args.url:
+        headers = {'Authorization': f'Bearer {args.token}'} if args.token else {}
+        print(f'{args.requests} requests, {args.concurrency} concurrent')
+        print_result(args.url, load(args.url, args.requests, args.concurrency, headers))
+    else:
+        compare_worker_classes(args.requests, args.concurrency, args.io_wait, args.workers)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+# DATAGERRY - OpenSource Enterprise CMDB
+# Copyright (C) 2024 becon GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""Unit tests of the field diff engine"""
+from pytest import fixture
+
+from cmdb.framework.field_diff import diff_fields, diff_names
+# -------------------------------------------------------------------------------------------------------------------- #
+
+FIELD_COUNT = 1000
+
+
+def legacy_diff(old_fields: list, new_fields: list) -> dict:
+    """The list membership diff which was used before the diff engine"""
+    return {'old': [i for i in old_fields if i not in new_fields],
+            'new': [j for j in new_fields if j not in old_fields]}
+
+
+@fixture(scope='module', name="large_fields")
+def fixture_large_fields() -> tuple:
+    """Old and new fields of an object with many fields where every tenth value changed"""
+    old_fields = [{'name': f'field-{idx}', 'value': f'value-{idx}'} for idx in range(FIELD_COUNT)]
+    new_fields = [{'name': f'field-{idx}', 'value': f'value-{idx}' if idx % 10 else 'changed'}
+                  for idx in range(FIELD_COUNT)]
+
+    return old_fields, new_fields
+
+
+def test_diff_fields():
+    """Added, removed and changed fields are detected"""
+    old_fields = [{'name': 'a', 'value': 1}, {'name': 'b', 'value': 2}, {'name': 'c', 'value': 3}]
+    new_fields = [{'name': 'a', 'value': 1}, {'name': 'b', 'value': 5}, {'name': 'd', 'value': 4}]
+
+    change_set = diff_fields(old_fields, new_fields)
+
+    assert change_set.added == [{'name': 'd', 'value': 4}]
+    assert change_set.removed == [{'name': 'c', 'value': 3}]
+    assert [(change.name, change.old_value, change.new_value) for change in change_set.changed] == [('b', 2, 5)]
+    assert len(change_set) == 3
+    assert not diff_fields(old_fields, old_fields)
+
+
+def test_diff_names():
+    """Added and removed names keep the order of the lists"""
+    assert diff_names(['a', 'b', 'c'], ['c', 'd', 'a', 'e']) == (['d', 'e'], ['b'])
+
+
+def test_log_changes_match_legacy_diff(large_fields):
+    """The log changes contain the same fields as the legacy diff"""
+    old_fields, new_fields = large_fields
+    changes = diff_fields(old_fields, new_fields).to_log_changes()
+    legacy_changes = legacy_diff(old_fields, new_fields)
+
+    assert sorted(changes['old'], key=str) == sorted(legacy_changes['old'], key=str)
+    assert sorted(changes['new'], key=str) == sorted(legacy_changes['new'], key=str)
+
@@ -0,0 +1,126 @@
+# DATAGERRY - OpenSource Enterprise CMDB
+# Copyright (C) 2024 becon GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""Unit tests of the duplicate handling of the bulk insert of object links"""
+from pymongo.errors import BulkWriteError
+from pytest import fixture, raises
+
+from cmdb.database.mongo_database_manager import MongoDatabaseManager
+from cmdb.errors.manager import ManagerInsertError
+from cmdb.manager.object_links_manager import ObjectLinksManager, DUPLICATE_KEY_ERROR
+# -------------------------------------------------------------------------------------------------------------------- #
+
+FIRST_PUBLIC_ID = 10
+
+
+def bulk_write_error(*write_errors: tuple) -> BulkWriteError:
+    """Error of `insert_many` with the passed (index, code) pairs as write errors"""
+    return BulkWriteError({
+        'writeErrors': [{'index': index, 'code': code, 'errmsg': 'E11000 duplicate key error'}
+                        for index, code in write_errors],
+        'nInserted': 0,
+    })
+
+
+@fixture(name="manager")
+def fixture_manager(monkeypatch):
+    """
+    Manager whose `insert_many` reserves the public_ids of the documents and raises the error
+    stored in `manager.error` like a failed bulk write. The database manager does not connect until it is used
+    """
+    manager = ObjectLinksManager(MongoDatabaseManager('localhost', 27017, 'cmdb-test'))
+    manager.error = None
+    manager.inserted = []
+
+    def insert_many(data: list[dict]) -> list[int]:
+        for offset, document in enumerate(data):
+            document['public_id'] = FIRST_PUBLIC_ID + offset
+        manager.inserted.append(data)
+
+        if manager.error is not None:
+            raise ManagerInsertError(manager.error) from manager.error
+
+        return [document['public_id'] for document in data]
+
+    monkeypatch.setattr(manager, 'insert_many', insert_many)
+
+    return manager
+
+
+def test_duplicates_in_request(manager):
+    """Links which occur twice in the request are inserted once"""
+    public_ids, skipped = manager.insert_object_links([
+        {'primary': 1, 'secondary': 2},
+        {'primary': '1', 'secondary': '2'},
+        {'primary': 2, 'secondary': 3},
+    ])
+
+    assert public_ids == [10, 11]
+    assert skipped == [{'primary': 1, 'secondary': 2}]
+    assert [(link['primary'], link['secondary']) for link in manager.inserted[0]] == [(1, 2), (2, 3)]
+
+
+def test_existing_links_are_skipped(manager):
+    """Links rejected by the unique index are mapped back to the skipped links by their index"""
+    manager.error = bulk_write_error((0, DUPLICATE_KEY_ERROR), (2, DUPLICATE_KEY_ERROR))
+
+    public_ids, skipped = manager.insert_object_links([
+        {'primary': 1, 'secondary': 2},
+        {'primary': 2, 'secondary': 3},
+        {'primary': 3, 'secondary': 4},
+        {'primary': 4, 'secondary': 5},
+    ])
+
+    assert public_ids == [11, 13]
+    assert skipped == [{'primary': 1, 'secondary': 2}, {'primary': 3, 'secondary': 4}]
+
+
+def test_duplicates_in_request_and_database(manager):
+    """The indexes of the write errors refer to the deduplicated documents"""
+    manager.error = bulk_write_error((1, DUPLICATE_KEY_ERROR))
+
+    public_ids, skipped = manager.insert_object_links([
+        {'primary': 1, 'secondary': 2},
+        {'primary': 1, 'secondary': 2},
+        {'primary': 2, 'secondary': 3},
+    ])
+
+    assert public_ids == [10]
+    assert skipped == [{'primary': 1, 'secondary': 2}, {'primary': 2, 'secondary': 3}]
+
+
+def test_other_write_errors_are_raised(manager):
+    """Write errors which are not duplicates are not skipped"""
+    manager.error = bulk_write_error((0, DUPLICATE_KEY_ERROR), (1, 121))
+
+    with raises(ManagerInsertError):
+        manager.insert_object_links([{'primary': 1, 'secondary': 2}, {'primary': 2, 'secondary': 3}])
+
+
+def test_other_errors_are_raised(manager):
+    """Errors which are not caused by a bulk write are not handled"""
+    manager.error = ValueError('connection lost')
+
+    with raises(ManagerInsertError):
+        manager.insert_object_links([{'primary': 1, 'secondary': 2}])
+
+
+def test_invalid_links(manager):
+    """Links without valid or with equal ids are rejected before anything is inserted"""
+    for link in ({'primary': 1}, {'primary': 'a', 'secondary': 2}, {'primary': 3, 'secondary': 3}):
+        with raises(ManagerInsertError):
+            manager.insert_object_links([{'primary': 1, 'secondary': 2}, link])
+
+    assert not manager.inserted
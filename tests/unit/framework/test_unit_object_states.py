@@ -0,0 +1,93 @@
+# DATAGERRY - OpenSource Enterprise CMDB
+# Copyright (C) 2024 becon GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""Unit tests of the object states stored in the object logs"""
+import copy
+from datetime import datetime, timezone
+
+from pytest import fixture
+
+from cmdb.framework.object_states import apply_delta, object_delta, object_state
+# -------------------------------------------------------------------------------------------------------------------- #
+
+@fixture(name="old_state")
+def fixture_old_state() -> dict:
+    """State of an object with three fields"""
+    return object_state({
+        'public_id': 1,
+        'type_id': 1,
+        'version': '1.0.0',
+        'creation_time': datetime(2024, 1, 1, tzinfo=timezone.utc),
+        'author_id': 1,
+        'active': True,
+        'fields': [{'name': 'a', 'value': 1}, {'name': 'b', 'value': 2}, {'name': 'c', 'value': 3}],
+        'multi_data_sections': []
+    })
+
+
+def test_object_state_keeps_name_and_value(old_state):
+    """Only the name and the value of a field are part of the state"""
+    state = object_state({**old_state, 'fields': [{'name': 'a', 'value': 1, 'label': 'A'}],
+                          'multi_data_sections': None})
+
+    assert state['fields'] == [{'name': 'a', 'value': 1}]
+    assert state['multi_data_sections'] == []
+
+
+def test_object_delta(old_state):
+    """Changed top level values, changed, added and removed fields are part of the delta"""
+    new_state = copy.deepcopy(old_state)
+    new_state['version'] = '1.0.1'
+    new_state['fields'] = [{'name': 'a', 'value': 1}, {'name': 'b', 'value': 5}, {'name': 'd', 'value': 4}]
+
+    delta = object_delta(old_state, new_state)
+
+    assert delta['set'] == {'version': '1.0.1'}
+    assert delta['fields']['set'] == [{'name': 'b', 'value': 5}, {'name': 'd', 'value': 4}]
+    assert delta['fields']['unset'] == ['c']
+    assert object_delta(old_state, old_state) == {'set': {}, 'fields': {'set': [], 'unset': []}}
+
+
+def test_apply_delta_restores_new_state(old_state):
+    """Applying the delta to the old state results in the new state without modifying the old state"""
+    new_state = copy.deepcopy(old_state)
+    new_state['active'] = False
+    new_state['multi_data_sections'] = [{'section_id': 's', 'values': []}]
+    new_state['fields'] = [{'name': 'c', 'value': None}, {'name': 'a', 'value': 'x'}, {'name': 'e', 'value': 5}]
+    unchanged = copy.deepcopy(old_state)
+
+    restored = apply_delta(old_state, object_delta(old_state, new_state))
+
+    assert restored == {**new_state, 'fields': restored['fields']}
+    assert sorted(restored['fields'], key=lambda field: field['name']) == \
+        sorted(new_state['fields'], key=lambda field: field['name'])
+    assert old_state == unchanged
+
+
+def test_apply_delta_chain(old_state):
+    """A chain of deltas reconstructs the last state"""
+    states = [old_state]
+
+    for value in range(3):
+        state = copy.deepcopy(states[-1])
+        state['fields'] = state['fields'][1:] + [{'name': f'new-{value}', 'value': value}]
+        states.append(state)
+
+    reconstructed = old_state
+
+    for previous, current in zip(states, states[1:]):
+        reconstructed = apply_delta(reconstructed, object_delta(previous, current))
+
+    assert reconstructed == states[-1]
@@ -0,0 +1,155 @@
+# DATAGERRY - OpenSource Enterprise CMDB
+# Copyright (C) 2024 becon GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""Unit tests of the compression middleware of the REST API"""
+import gzip
+import json
+
+from flask import Flask, Response
+from pytest import fixture, mark
+
+from cmdb.interface import compression
+from cmdb.interface.compression import CompressionMiddleware
+from cmdb.interface.route_utils import make_conditional
+# -------------------------------------------------------------------------------------------------------------------- #
+
+THRESHOLD = 100
+LARGE_BODY = json.dumps([{'public_id': idx, 'name': f'object-{idx}'} for idx in range(100)])
+
+
+@fixture(name="client")
+def fixture_client(monkeypatch):
+    """Test client of an app whose responses are compressed with gzip"""
+    monkeypatch.setattr(compression, 'brotli', None)
+    app = Flask(__name__)
+
+    @app.route('/large')
+    def large():
+        return Response(LARGE_BODY, mimetype='application/json')
+
+    @app.route('/small')
+    def small():
+        return Response('{"small": true}', mimetype='application/json')
+
+    @app.route('/status/<int:status>')
+    def status(status: int):
+        return Response(LARGE_BODY if status != 204 else None, status=status, mimetype='application/json')
+
+    @app.route('/stream')
+    def stream():
+        return Response((f'{{"chunk": {idx}}}\n' for idx in range(50)), mimetype='application/json')
+
+    @app.route('/conditional')
+    def conditional():
+        return make_conditional(Response(LARGE_BODY, mimetype='application/json'))
+
+    app.wsgi_app = CompressionMiddleware(app.wsgi_app, threshold=THRESHOLD)
+
+    return app.test_client()
+
+
+@mark.parametrize('accept_encoding, expected', [
+    ('gzip, deflate', 'gzip'),
+    ('deflate;q=1.0, gzip;q=0.5', 'gzip'),
+    ('*', 'gzip'),
+    ('gzip;q=0', None),
+    ('gzip;q=0, *;q=0.5', None),
+    ('identity', None),
+    ('', None),
+])
+def test_negotiate_without_brotli(monkeypatch, accept_encoding, expected):
+    """Only gzip is selected if brotli is not installed, q-values of 0 refuse an encoding"""
+    monkeypatch.setattr(compression, 'brotli', None)
+
+    assert CompressionMiddleware.negotiate(accept_encoding) == expected
+
+
+@mark.parametrize('accept_encoding, expected', [
+    ('br, gzip', 'br'),
+    ('br;q=0.5, gzip;q=0.8', 'gzip'),
+    ('br;q=0, *', 'gzip'),
+    ('*;q=0.3', 'br'),
+])
+def test_negotiate_with_brotli(monkeypatch, accept_encoding, expected):
+    """The encoding with the highest q-value is selected, brotli is preferred on equal values"""
+    monkeypatch.setattr(compression, 'brotli', object())
+
+    assert CompressionMiddleware.negotiate(accept_encoding) == expected
+
+
+def test_compressed_response(client):
+    """Large responses are compressed and the length is replaced"""
+    response = client.get('/large', headers={'Accept-Encoding': 'gzip'})
+
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert int(response.headers['Content-Length']) == len(response.data)
+    assert gzip.decompress(response.data).decode() == LARGE_BODY
+
+
+def test_pass_through_without_accepted_encoding(client):
+    """Responses are sent unchanged if the client accepts no supported encoding"""
+    response = client.get('/large', headers={'Accept-Encoding': 'identity'})
+
+    assert 'Content-Encoding' not in response.headers
+    assert response.get_data(as_text=True) == LARGE_BODY
+
+
+def test_pass_through_below_threshold(client):
+    """Responses below the threshold are sent unchanged"""
+    response = client.get('/small', headers={'Accept-Encoding': 'gzip'})
+
+    assert 'Content-Encoding' not in response.headers
+    assert response.get_data(as_text=True) == '{"small": true}'
+
+
+def test_pass_through_head(client):
+    """HEAD responses are not compressed"""
+    response = client.head('/large', headers={'Accept-Encoding': 'gzip'})
+
+    assert 'Content-Encoding' not in response.headers
+    assert int(response.headers['Content-Length']) == len(LARGE_BODY)
+
+
+@mark.parametrize('status', [204, 206, 304])
+def test_pass_through_status(client, status):
+    """Responses without a body or with a partial body are not compressed"""
+    response = client.get(f'/status/{status}', headers={'Accept-Encoding': 'gzip'})
+
+    assert response.status_code == status
+    assert 'Content-Encoding' not in response.headers
+
+
+def test_streamed_response(client):
+    """Streamed responses are compressed chunk by chunk into a valid gzip stream"""
+    response = client.get('/stream', headers={'Accept-Encoding': 'gzip'})
+
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Content-Length' not in response.headers
+    assert gzip.decompress(response.data).decode() == ''.join(f'{{"chunk": {idx}}}\n' for idx in range(50))
+
+
+def test_weak_etag_not_modified(client):
+    """The ETag of a compressed response is weakened and still matches the If-None-Match of the client"""
+    response = client.get('/conditional', headers={'Accept-Encoding': 'gzip'})
+    etag = response.headers['ETag']
+
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert etag.startswith('W/')
+
+    response = client.get('/conditional', headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+
+    assert response.status_code == 304
+    assert not response.data
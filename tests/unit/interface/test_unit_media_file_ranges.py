@@ -0,0 +1,150 @@
+# DATAGERRY - OpenSource Enterprise CMDB
+# Copyright (C) 2024 becon GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""Unit tests of the range requests of the media file downloads"""
+import importlib
+from datetime import datetime, timedelta, timezone
+
+from flask import Flask
+from pytest import fixture, mark
+from werkzeug.http import http_date
+
+from cmdb.database.database_manager_mongo import DatabaseManagerMongo
+from cmdb.media_library.media_file_manager import MediaFileManagement
+# -------------------------------------------------------------------------------------------------------------------- #
+
+LENGTH = 1000
+ETAG = 'f1c9645dbc14efddc7d8a322685f26eb'
+UPLOAD_DATE = datetime(2024, 5, 17, 10, 30, 15, 123000, tzinfo=timezone.utc)
+
+
+@fixture(name="app")
+def fixture_app():
+    """App with a database manager, the manager does not connect until it is used"""
+    app = Flask(__name__)
+    app.database_manager = DatabaseManagerMongo('localhost', 27017, 'cmdb-test')
+
+    return app
+
+
+@fixture(name="requested_range")
+def fixture_requested_range(app):
+    """Returns the byte range of a request with the given headers"""
+    with app.app_context():
+        routes = importlib.import_module('cmdb.interface.rest_api.media_library_routes.media_file_routes')
+
+    def requested_range(**headers):
+        with app.test_request_context(headers=headers):
+            return routes._requested_range(LENGTH, ETAG, UPLOAD_DATE)
+
+    return requested_range
+
+
+@mark.parametrize('byte_range, expected', [
+    ('bytes=0-99', (0, 100)),
+    ('bytes=900-', (900, LENGTH)),
+    ('bytes=-100', (900, LENGTH)),
+    ('bytes=950-1999', (950, LENGTH)),
+])
+def test_single_range(requested_range, byte_range, expected):
+    """A single range is returned as start and exclusive end within the file"""
+    assert requested_range(Range=byte_range) == expected
+
+
+def test_range_beyond_end_of_file(requested_range):
+    """A range which starts after the last byte can not be satisfied (416)"""
+    assert requested_range(Range='bytes=1000-1099') == 'unsatisfiable'
+
+
+@mark.parametrize('headers', [
+    {},
+    {'Range': 'bytes=0-99,200-299'},
+    {'Range': 'items=0-99'},
+])
+def test_whole_file(requested_range, headers):
+    """Requests without a range, with several ranges or other units get the whole file (200)"""
+    assert requested_range(**headers) is None
+
+
+@mark.parametrize('if_range, expected', [
+    (f'"{ETAG}"', (0, 100)),
+    ('"d41d8cd98f00b204e9800998ecf8427e"', None),
+    (http_date(UPLOAD_DATE), (0, 100)),
+    (http_date(UPLOAD_DATE + timedelta(days=1)), (0, 100)),
+    (http_date(UPLOAD_DATE - timedelta(days=1)), None),
+])
+def test_if_range(requested_range, if_range, expected):
+    """The range only applies if the `If-Range` matches the current version of the file"""
+    assert requested_range(Range='bytes=0-99', **{'If-Range': if_range}) == expected
+
+
+class FakeGridOut:
+    """Seekable file with the interface of a GridOut, records the size of every read"""
+
+    def __init__(self, content: bytes, chunk_size: int):
+        self.content = content
+        self.length = len(content)
+        self.chunk_size = chunk_size
+        self.position = 0
+        self.reads = []
+        self.closed = False
+
+
+    def seek(self, position: int):
+        self.position = position
+
+
+    def tell(self) -> int:
+        return self.position
+
+
+    def read(self, size: int) -> bytes:
+        self.reads.append(size)
+        data = self.content[self.position:self.position + size]
+        self.position += len(data)
+        return data
+
+
+    def close(self):
+        self.closed = True
+
+
+@mark.parametrize('start, end', [
+    (0, None),
+    (5, 17),
+    (6, 7),
+    (3, None),
+    (8, 100),
+])
+def test_stream_file(start, end):
+    """The requested range is streamed without reading more than one chunk at once"""
+    content = bytes(range(26))
+    grid_out = FakeGridOut(content, chunk_size=4)
+
+    chunks = list(MediaFileManagement.stream_file(grid_out, start, end))
+
+    assert b''.join(chunks) == content[start:end]
+    assert all(size <= grid_out.chunk_size for size in grid_out.reads)
+    assert all(len(chunk) <= grid_out.chunk_size for chunk in chunks)
+    assert grid_out.closed
+
+
+def test_stream_file_reads_end_at_chunk_borders():
+    """After an unaligned start every read covers exactly one chunk of the file"""
+    grid_out = FakeGridOut(bytes(range(26)), chunk_size=4)
+
+    list(MediaFileManagement.stream_file(grid_out, 5, 23))
+
+    assert grid_out.reads == [3, 4, 4, 4, 3]
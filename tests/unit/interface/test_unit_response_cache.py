@@ -0,0 +1,226 @@
+# DATAGERRY - OpenSource Enterprise CMDB
+# Copyright (C) 2024 becon GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""Unit tests of the response cache of the REST API"""
+from flask import Flask, jsonify
+from pytest import fixture, mark
+
+from cmdb.errors.system_config import ConfigFileError
+from cmdb.interface import response_cache as response_cache_module
+from cmdb.interface.gunicorn import HTTPServer
+from cmdb.interface.response_cache import MemoryCacheBackend, MongoCacheBackend, ALL_COLLECTIONS, response_cache, \
+    get_response_cache_settings
+from cmdb.manager.count_strategy import count_cache
+# -------------------------------------------------------------------------------------------------------------------- #
+
+TYPES = 'framework.types'
+CATEGORIES = 'framework.categories'
+
+# -------------------------------------------------------------------------------------------------------------------- #
+#                                                  MemoryCacheBackend                                                  #
+# -------------------------------------------------------------------------------------------------------------------- #
+
+def test_memory_backend_get_set():
+    """A stored response is returned while the versions of its collections are unchanged"""
+    backend = MemoryCacheBackend()
+    versions = backend.versions((TYPES, ))
+
+    assert versions == {ALL_COLLECTIONS: 0, TYPES: 0}
+    assert backend.get('key', versions) is None
+
+    backend.set('key', {'body': b'types'}, versions, ttl=60)
+
+    assert backend.get('key', versions) == {'body': b'types'}
+    assert len(backend) == 1
+
+
+def test_memory_backend_expired_response():
+    """Responses are not returned after their ttl"""
+    backend = MemoryCacheBackend()
+    versions = backend.versions((TYPES, ))
+    backend.set('key', {'body': b'types'}, versions, ttl=-1)
+
+    assert backend.get('key', versions) is None
+    assert len(backend) == 0
+
+
+def test_memory_backend_invalidate_collection():
+    """Invalidating a collection only outdates the responses built from it"""
+    backend = MemoryCacheBackend()
+    type_versions = backend.versions((TYPES, ))
+    category_versions = backend.versions((CATEGORIES, ))
+    backend.set('types', {'body': b'types'}, type_versions, ttl=60)
+    backend.set('categories', {'body': b'categories'}, category_versions, ttl=60)
+
+    backend.invalidate(TYPES)
+
+    assert backend.versions((TYPES, )) == {ALL_COLLECTIONS: 0, TYPES: 1}
+    assert backend.get('types', backend.versions((TYPES, ))) is None
+    assert backend.get('categories', backend.versions((CATEGORIES, ))) == {'body': b'categories'}
+
+
+def test_memory_backend_invalidate_all():
+    """Invalidating without a collection removes all responses"""
+    backend = MemoryCacheBackend()
+    versions = backend.versions((TYPES, ))
+    backend.set('types', {'body': b'types'}, versions, ttl=60)
+
+    backend.invalidate()
+
+    assert len(backend) == 0
+    assert backend.versions((TYPES, ))[ALL_COLLECTIONS] == 1
+
+
+def test_memory_backend_lru_eviction():
+    """The least recently used response is removed if the cache is full"""
+    backend = MemoryCacheBackend(max_entries=2)
+    versions = backend.versions((TYPES, ))
+    backend.set('first', {'body': b'1'}, versions, ttl=60)
+    backend.set('second', {'body': b'2'}, versions, ttl=60)
+
+    assert backend.get('first', versions) is not None
+
+    backend.set('third', {'body': b'3'}, versions, ttl=60)
+
+    assert len(backend) == 2
+    assert backend.get('second', versions) is None
+    assert backend.get('first', versions) is not None
+    assert backend.get('third', versions) is not None
+
+# -------------------------------------------------------------------------------------------------------------------- #
+#                                                ResponseCache.cached                                                  #
+# -------------------------------------------------------------------------------------------------------------------- #
+
+@fixture(name="client")
+def fixture_client():
+    """Test client of an app with a cached route, the route counts how often it was executed"""
+    response_cache.configure(enabled=True, backend=MemoryCacheBackend.NAME, ttl=60)
+    app = Flask(__name__)
+    app.calls = 0
+
+    @app.route('/types')
+    @response_cache.cached(TYPES)
+    def get_types():
+        app.calls += 1
+        response = jsonify(calls=app.calls)
+        response.set_etag(f'types-{app.calls}')
+
+        return response
+
+    yield app.test_client()
+
+    response_cache.configure(enabled=True, backend=MemoryCacheBackend.NAME)
+
+
+def test_cached_miss_and_hit(client):
+    """The first request executes the route, the second one is answered from the cache"""
+    first = client.get('/types')
+    second = client.get('/types')
+
+    assert first.headers['X-Cache'] == 'MISS'
+    assert second.headers['X-Cache'] == 'HIT'
+    assert second.json == first.json == {'calls': 1}
+    assert client.application.calls == 1
+
+
+def test_cached_query_parameters(client):
+    """Requests with other query parameters are cached separately"""
+    client.get('/types')
+    response = client.get('/types?sort=name')
+
+    assert response.headers['X-Cache'] == 'MISS'
+    assert client.application.calls == 2
+
+
+def test_cached_invalidation(client):
+    """A write to a collection of the route (invalidation of the `CountCache`) outdates the cached response"""
+    client.get('/types')
+
+    count_cache.invalidate(CATEGORIES)
+    assert client.get('/types').headers['X-Cache'] == 'HIT'
+
+    count_cache.invalidate(TYPES)
+    response = client.get('/types')
+
+    assert response.headers['X-Cache'] == 'MISS'
+    assert response.json == {'calls': 2}
+
+
+def test_cached_not_modified(client):
+    """A conditional request is answered with `304 Not Modified` from the cache"""
+    etag = client.get('/types').headers['ETag']
+    response = client.get('/types', headers={'If-None-Match': etag})
+
+    assert response.status_code == 304
+    assert response.headers['X-Cache'] == 'HIT'
+    assert client.application.calls == 1
+
+
+def test_cached_disabled(client):
+    """A disabled cache passes every request to the route"""
+    response_cache.enabled = False
+
+    client.get('/types')
+    response = client.get('/types')
+
+    assert 'X-Cache' not in response.headers
+    assert client.application.calls == 2
+
+# -------------------------------------------------------------------------------------------------------------------- #
+#                                             get_response_cache_settings                                              #
+# -------------------------------------------------------------------------------------------------------------------- #
+
+class FakeConfigReader:
+    """Configuration with a `[ResponseCache]` section, no section at all if it is None"""
+
+    def __init__(self, section: dict = None):
+        self.section = section
+
+
+    def __call__(self):
+        return self
+
+
+    def get_all_values_from_section(self, section: str) -> dict:
+        if self.section is None:
+            raise ConfigFileError(section)
+        return self.section
+
+
+@mark.parametrize('section, workers, enabled', [
+    (None, 1, True),
+    (None, 4, False),
+    ({'backend': MemoryCacheBackend.NAME}, 4, False),
+    ({'backend': MongoCacheBackend.NAME}, 4, True),
+    ({'enabled': 'True'}, 4, True),
+    ({'enabled': 'False'}, 1, False),
+])
+def test_settings_with_several_workers(monkeypatch, section, workers, enabled):
+    """The memory backend is disabled by default if several web workers are configured"""
+    monkeypatch.setattr(response_cache_module, 'SystemConfigReader', FakeConfigReader(section))
+    monkeypatch.setattr(HTTPServer, 'configured_workers', staticmethod(lambda: workers))
+
+    assert get_response_cache_settings()['enabled'] is enabled
+
+
+def test_settings_defaults(monkeypatch):
+    """Missing values are taken from the defaults, configured values are cast"""
+    monkeypatch.setattr(response_cache_module, 'SystemConfigReader', FakeConfigReader({'ttl': '30', 'other': '1'}))
+    monkeypatch.setattr(HTTPServer, 'configured_workers', staticmethod(lambda: 1))
+
+    settings = get_response_cache_settings()
+
+    assert settings == {'enabled': True, 'backend': MemoryCacheBackend.NAME, 'ttl': 30, 'max_entries': 1024}
+